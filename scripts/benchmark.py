@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Offline pipeline benchmarks using latency-simulating fake agents."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+from clara.benchmarks import BenchmarkScenario, LatencyProfile, run_benchmark_suite
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the CL validation pipeline offline.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("bench_results.json"),
+        help="Machine-readable results file (JSON).",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1000, 10000],
+        help="Dataset sizes (number of cells) to benchmark.",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache_states",
+        nargs="+",
+        choices=["cold", "warm"],
+        default=["cold", "warm"],
+        help="Cache states to benchmark.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Mean fake LLM latency.")
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+        help="Shape of the simulated latency distribution.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Per-attempt transient failure rate (0 <= rate < 1).",
+    )
+    parser.add_argument(
+        "--response-rows", type=int, default=5, help="Assertions per simulated response."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fakes and seeding RNG.")
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip tracemalloc peak-memory tracking (it slows the measured run).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the benchmark suite and print a short summary."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    latency = LatencyProfile(mean_ms=args.latency_ms, distribution=args.latency_distribution)
+    template = BenchmarkScenario(
+        cells=0,
+        cell_latency=latency,
+        paperqa_latency=latency,
+        error_rate=args.error_rate,
+        response_rows=args.response_rows,
+        seed=args.seed,
+    )
+    report = run_benchmark_suite(
+        args.output,
+        sizes=args.sizes,
+        cache_states=args.cache_states,
+        template=template,
+        track_memory=not args.no_memory,
+    )
+    for scenario in report["scenarios"]:
+        print(
+            json.dumps(
+                {
+                    key: scenario[key]
+                    for key in ("name", "wall_seconds", "calls_per_second", "peak_memory_bytes")
+                }
+            )
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Compare JSON backends on dataset- and cache-sized payloads."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Sequence
+
+from clara.benchmarks.json_codec import DEFAULT_JSON_SIZES, benchmark_json_codecs
+from clara.utils.io_utils import JSON_BACKENDS
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the JSON microbenchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON load/dump per backend.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_JSON_SIZES),
+        help="Dataset sizes (number of cells).",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=JSON_BACKENDS,
+        default=list(JSON_BACKENDS),
+        help="JSON backends to compare (default: all).",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement (median).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print one JSON line of timings per backend and size."""
+    args = parse_args(argv)
+    for result in benchmark_json_codecs(args.sizes, backends=args.backends, repeats=args.repeats):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
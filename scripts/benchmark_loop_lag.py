@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Measure event-loop lag while cache I/O and the pipeline run concurrently."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Sequence
+
+from clara.benchmarks.loop_lag import benchmark_loop_lag
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the loop-lag benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark event-loop lag under load.")
+    parser.add_argument("--cells", type=int, default=200, help="Cells in the pipeline scenario.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent tasks.")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mean fake LLM latency.")
+    parser.add_argument(
+        "--cache-cells", type=int, default=2000, help="Records in the cache I/O payload."
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Dump/load rounds per task.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print lag percentiles per scenario as JSON."""
+    args = parse_args(argv)
+    result = benchmark_loop_lag(
+        cells=args.cells,
+        concurrency=args.concurrency,
+        latency_ms=args.latency_ms,
+        cache_cells=args.cache_cells,
+        rounds=args.rounds,
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
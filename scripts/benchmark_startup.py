@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Check import time of the clara entry modules against a budget."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Sequence
+
+from clara.benchmarks.startup import DEFAULT_IMPORT_BUDGET_MS, STARTUP_MODULES, measure_startup
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Measure clara import time in fresh interpreters.")
+    parser.add_argument(
+        "--modules", nargs="+", default=list(STARTUP_MODULES), help="Modules to import together."
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters to sample.")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_IMPORT_BUDGET_MS,
+        help="Maximum median import time in milliseconds.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Print the measurement and return non-zero when the budget is exceeded."""
+    args = parse_args(argv)
+    result = measure_startup(args.modules, repeats=args.repeats, budget_ms=args.budget_ms)
+    print(json.dumps(result.to_dict(), indent=2))
+    if result.deferred_loaded:
+        print(f"Deferred modules imported at startup: {result.deferred_loaded}", file=sys.stderr)
+    if not result.within_budget:
+        print("Startup budget exceeded.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
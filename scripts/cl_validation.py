@@ -5,14 +5,38 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 import logging
 import sys
 from pathlib import Path
 from typing import Optional, Sequence
 
 from clara import bootstrap
-from clara.graphs import run_cl_validation_workflow
-from clara.utils import ValidationPaths, ValidationSettings, load_validation_settings
+from clara.graphs import (
+    ClValidationGraphDependencies,
+    CurationWatcher,
+    QueueWorker,
+    ValidationDaemon,
+    build_cl_validation_graph,
+    enqueue_cl_validation,
+    format_plan,
+    plan_cl_validation,
+    run_cl_validation_graph,
+    run_cl_validation_workflow,
+    submit_validation_job,
+)
+from clara.services import (
+    AsyncAgentRunner,
+    BatchClient,
+    Cassette,
+    LocalBatchClient,
+    OpenAIBatchClient,
+    WorkQueue,
+    cassette_agents,
+)
+from clara.utils import Tracer, ValidationPaths, ValidationSettings, load_validation_settings
+from clara.utils.cl_validation_config import MODEL_CASCADE_STAGES
+from clara.utils.metrics import MetricsTextfileWriter, start_metrics_server
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -41,11 +65,168 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         type=float,
         help="Probability of injecting a synthetic false assertion (default inherited).",
     )
+    parser.add_argument(
+        "--false-assertion-batch-size",
+        type=int,
+        help="Cells packed into one seeding request (default inherited, 1 = per cell).",
+    )
     parser.add_argument(
         "--dotenv",
         type=Path,
         help="Optional path to a .env file that should be loaded before execution.",
     )
+    parser.add_argument(
+        "--columnar-export",
+        choices=["parquet", "arrow"],
+        help="Also export the report as Parquet or an Arrow IPC stream (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Load definitions into the shared work queue instead of running the graph inline.",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Process jobs from the shared work queue until it drains.",
+    )
+    parser.add_argument(
+        "--worker-id",
+        help="Identifier recorded on leased jobs (defaults to host:pid).",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300.0,
+        help="Lease duration for claimed queue jobs before they may be reclaimed.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a resident validation daemon that keeps agents and caches warm.",
+    )
+    parser.add_argument(
+        "--submit",
+        dest="submit_terms",
+        action="append",
+        help="Send a CL ID to a running daemon and print per-cell results (repeatable).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Daemon host for --serve/--submit.")
+    parser.add_argument("--port", type=int, default=8765, help="Daemon port for --serve/--submit.")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Use a Unix socket instead of TCP for --serve/--submit.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch cells_data.json and reference/ and revalidate only the affected terms.",
+    )
+    parser.add_argument(
+        "--debounce-seconds",
+        type=float,
+        default=2.0,
+        help="Quiet period required after a change before --watch revalidates.",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record-cassette",
+        type=Path,
+        help="Record every agent prompt/response (with timing and usage) to this cassette file.",
+    )
+    cassette.add_argument(
+        "--replay-cassette",
+        type=Path,
+        help="Serve agent responses from a recorded cassette instead of calling the LLMs.",
+    )
+    parser.add_argument(
+        "--replay-realtime",
+        action="store_true",
+        help="With --replay-cassette, wait for each call's recorded latency.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help="Write node, cell, LLM-call and cache spans to this Chrome trace JSON file.",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print projected LLM calls, tokens, cost and wall time from cache state, then exit.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Concurrent LLM calls (e.g. queue workers) assumed by --plan's wall-time estimate.",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        help="Stop making LLM calls once this many tokens have been used (CLARA_TOKEN_BUDGET).",
+    )
+    parser.add_argument(
+        "--cost-budget",
+        type=float,
+        help="Stop making LLM calls once this estimated USD cost is reached "
+        "(CLARA_COST_BUDGET_USD).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream agent responses and abandon ones that are not the requested JSON early. "
+            "With --submit, also print each report row as it streams in."
+        ),
+    )
+    parser.add_argument(
+        "--assertion-cache",
+        action="store_true",
+        help=(
+            "Cache PaperQA verdicts per atomic assertion and reference set, and only send "
+            "assertions without a cached verdict (CLARA_ASSERTION_VERDICT_CACHE)."
+        ),
+    )
+    parser.add_argument(
+        "--model-cascade",
+        action="append",
+        type=_cascade_entry,
+        metavar="STAGE=MODEL[,MODEL...]",
+        help=(
+            "Try these cheaper models first for a stage (seed, paperqa or convert), escalating "
+            "to the configured model only when the output fails validation. Repeatable."
+        ),
+    )
+    parser.add_argument(
+        "--batch",
+        choices=["openai", "local"],
+        help=(
+            "Send uncached PaperQA and conversion prompts as one offline batch job per stage "
+            "(openai: OpenAI Batch API; local: answered by the configured agents)."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each graph node (cProfile + tracemalloc) into output/profiles/.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Periodically write Prometheus metrics to this text file (node_exporter textfile).",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        help="Seconds between --metrics-file refreshes.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running.",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -63,36 +244,185 @@ def configure_logging(level: str) -> None:
     )
 
 
+def _cascade_entry(value: str) -> tuple[str, tuple[str, ...]]:
+    """Parse a ``STAGE=MODEL[,MODEL...]`` --model-cascade value."""
+    stage, _, models = value.partition("=")
+    stage = stage.strip()
+    if stage not in MODEL_CASCADE_STAGES:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage {stage!r}; expected one of {', '.join(MODEL_CASCADE_STAGES)}"
+        )
+    return stage, tuple(model.strip() for model in models.split(",") if model.strip())
+
+
 def _apply_overrides(settings: ValidationSettings, args: argparse.Namespace) -> ValidationSettings:
     if args.cell_data_dir:
         base = args.cell_data_dir.expanduser().resolve()
-        output_dir = base / "output"
-        paths = ValidationPaths(
-            cell_data_dir=base,
-            dataset_file=base / "cells_data.json",
-            references_dir=base / "reference",
-            output_dir=output_dir,
-            false_definitions_file=output_dir / "cells_false_data.json",
-            paperqa_markdown_dir=output_dir,
-            paperqa_json_dir=output_dir / "pqa_jsons",
-        )
-        settings.paths = paths
+        settings.paths = ValidationPaths.from_cell_data_dir(base)
     if args.test_mode:
         settings.is_test_mode = True
     if args.test_terms:
         settings.test_terms = tuple(args.test_terms)
     if args.false_assertion_probability is not None:
         settings.false_assertion_probability = float(args.false_assertion_probability)
+    if args.stream:
+        settings.stream_responses = True
+    if args.assertion_cache:
+        settings.assertion_verdict_cache = True
+    for stage, models in args.model_cascade or ():
+        settings.model_cascades = {**settings.model_cascades, stage: models}
+    if args.false_assertion_batch_size is not None:
+        settings.false_assertion_batch_size = max(1, args.false_assertion_batch_size)
+    if args.columnar_export:
+        settings.report_columnar_format = args.columnar_export
+    if args.token_budget is not None:
+        settings.token_budget = args.token_budget
+    if args.cost_budget is not None:
+        settings.cost_budget_usd = args.cost_budget
     return settings
 
 
 async def _async_main(args: argparse.Namespace) -> None:
     """Async entrypoint wiring CLI args into the workflow."""
+    if args.submit_terms:
+        await _submit_to_daemon(args)
+        return
     bootstrap(str(args.dotenv) if args.dotenv else None)
     settings = load_validation_settings()
     settings = _apply_overrides(settings, args)
-    report_path = await run_cl_validation_workflow(settings=settings)
-    logging.getLogger("clara.validation").info("Report generated at %s", report_path)
+    cell_agent, paperqa_agent, cassette = _build_agents(args, settings)
+    tracer = Tracer()
+    metrics_writer = None
+    metrics_server = None
+    if args.metrics_file:
+        metrics_writer = MetricsTextfileWriter(args.metrics_file, interval=args.metrics_interval)
+        metrics_writer.start()
+    if args.metrics_port is not None:
+        metrics_server = start_metrics_server(port=args.metrics_port)
+    try:
+        if args.trace:
+            with tracer.activate():
+                await _dispatch(settings, args, cell_agent, paperqa_agent)
+        else:
+            await _dispatch(settings, args, cell_agent, paperqa_agent)
+    finally:
+        if cassette:
+            cassette.close()
+        if metrics_writer:
+            metrics_writer.stop()
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+            logging.getLogger("clara.validation").info(
+                "Trace with %s spans written to %s", len(tracer.spans), args.trace
+            )
+
+
+def _build_agents(
+    args: argparse.Namespace, settings: ValidationSettings
+) -> tuple[AsyncAgentRunner | None, AsyncAgentRunner | None, Cassette | None]:
+    """Return cassette-backed agents when recording or replaying, otherwise the defaults."""
+    if args.record_cassette:
+        return cassette_agents(args.record_cassette, mode="record", settings=settings)
+    if args.replay_cassette:
+        return cassette_agents(
+            args.replay_cassette, mode="replay", realtime=args.replay_realtime, settings=settings
+        )
+    return None, None, None
+
+
+async def _dispatch(
+    settings: ValidationSettings,
+    args: argparse.Namespace,
+    cell_agent: AsyncAgentRunner | None,
+    paperqa_agent: AsyncAgentRunner | None,
+) -> None:
+    """Run the workflow in the mode selected on the command line."""
+
+    def make_deps() -> ClValidationGraphDependencies:
+        return ClValidationGraphDependencies(
+            graph=build_cl_validation_graph(),
+            settings=settings,
+            cell_agent=cell_agent,
+            paperqa_agent=paperqa_agent,
+        )
+
+    if args.plan:
+        print(format_plan(plan_cl_validation(make_deps(), concurrency=args.concurrency)))
+        return
+    if args.serve:
+        await _serve_daemon(make_deps(), args)
+        return
+    if args.watch:
+        await CurationWatcher(make_deps(), debounce_seconds=args.debounce_seconds).run()
+        return
+    if args.enqueue or args.worker:
+        await _run_queue_mode(make_deps(), args)
+        return
+    if args.batch:
+        deps = make_deps()
+        deps.batch_client = _build_batch_client(args.batch, deps)
+        report_path = await run_cl_validation_graph(deps=deps, profile=args.profile)
+    else:
+        report_path = await run_cl_validation_workflow(
+            settings=settings,
+            cell_agent=cell_agent,
+            paperqa_agent=paperqa_agent,
+            profile=args.profile,
+        )
+    logger = logging.getLogger("clara.validation")
+    logger.info("Report generated at %s", report_path)
+    logger.info("Token usage and cost summary at %s", settings.paths.usage_summary_file)
+
+
+def _build_batch_client(kind: str, deps: ClValidationGraphDependencies) -> BatchClient:
+    """Return the batch client selected with ``--batch``."""
+    if kind == "openai":
+        return OpenAIBatchClient()
+    if not deps.cell_agent or not deps.paperqa_agent:
+        raise RuntimeError("CL validation agents not configured.")
+    agents = {"paperqa": deps.paperqa_agent, "convert": deps.cell_agent}
+    return LocalBatchClient(deps.settings.paths.batch_dir / "local", agents)
+
+
+async def _run_queue_mode(deps: ClValidationGraphDependencies, args: argparse.Namespace) -> None:
+    """Enqueue definitions and/or run a queue worker against the shared SQLite queue."""
+    settings = deps.settings
+    queue = WorkQueue(settings.paths.work_queue_file)
+    try:
+        if args.enqueue:
+            enqueue_cl_validation(deps, queue)
+        if args.worker:
+            worker = QueueWorker(
+                deps, queue, worker_id=args.worker_id, lease_seconds=args.lease_seconds
+            )
+            processed = await worker.run()
+            logging.getLogger("clara.validation").info(
+                "Worker %s processed %s jobs (%s)", worker.worker_id, processed, queue.counts()
+            )
+    finally:
+        queue.close()
+
+
+async def _serve_daemon(deps: ClValidationGraphDependencies, args: argparse.Namespace) -> None:
+    """Run the resident daemon until interrupted."""
+    daemon = ValidationDaemon(deps)
+    server = await daemon.start(host=args.host, port=args.port, socket_path=args.socket)
+    async with server:
+        await server.serve_forever()
+
+
+async def _submit_to_daemon(args: argparse.Namespace) -> None:
+    """Stream per-cell events for the requested CL IDs from a running daemon."""
+    async for event in submit_validation_job(
+        args.submit_terms,
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        stream_rows=args.stream,
+    ):
+        print(json.dumps(event), flush=True)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> None:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Run a local OpenAI-compatible mock LLM server for load testing."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+from clara.benchmarks import Fault, LatencyProfile, MockLLMServer
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments for the mock server."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8900, help="Port to bind.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Median response latency.")
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+        help="Shape of the response latency distribution.",
+    )
+    parser.add_argument(
+        "--fault",
+        dest="faults",
+        action="append",
+        default=[],
+        help="Fault schedule, e.g. '429:every=10', '5xx:probability=0.02,status=502', "
+        "'latency:every=5,ms=3000' or 'truncate:every=7,start=3' (repeatable).",
+    )
+    parser.add_argument("--response-rows", type=int, default=5, help="Assertions per response.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and faults.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Serve until interrupted."""
+    args = parse_args(argv)
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        faults=[Fault.parse(spec) for spec in args.faults],
+        latency=LatencyProfile(mean_ms=args.latency_ms, distribution=args.latency_distribution),
+        response_rows=args.response_rows,
+        seed=args.seed,
+    )
+    print(f"Mock LLM server listening; export OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Stopped after {server.stats.requests} requests; faults={server.stats.faults}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from dotenv import load_dotenv
+
+def load_dotenv(dotenv_path: str | None = None) -> bool:
+    """Load a ``.env`` file, importing python-dotenv only when it is needed."""
+    from dotenv import load_dotenv as _load_dotenv
+
+    return _load_dotenv(dotenv_path)
 
 
 def bootstrap(dotenv_path: str | None = None) -> None:
@@ -3,20 +3,15 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncGenerator
 from dataclasses import dataclass, field
 from typing import Any
 
+from ...utils.usage import usage_from_result
 from .cell_agent_config import CellValidationDependencies, get_cell_validation_config
-from .cell_agent_tools import read_json, read_text
+from .cell_agent_tools import bind_run_context, read_json, read_text
 
 cell_logger = logging.getLogger(__name__)
-cell_logger.setLevel(logging.INFO)
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-console.setFormatter(formatter)
-cell_logger.addHandler(console)
-cell_logger.propagate = False
 
 SYSTEM_PROMPT = """
 You are a CL validation assistant. Your role is to inspect curated cell definitions,
@@ -30,17 +25,18 @@ Constraints:
 """
 
 
-def _build_agent() -> Any:
+def _build_agent(model: str | None = None) -> Any:
     from pydantic_ai import Agent
 
     config = get_cell_validation_config()
     agent = Agent(
-        model=config.llm,
+        model=model or config.llm,
         deps_type=CellValidationDependencies,
         output_type=str,
         system_prompt=SYSTEM_PROMPT,
         defer_model_check=True,
     )
+    bind_run_context()
     agent.tool(read_text)
     agent.tool(read_json)
     return agent
@@ -48,21 +44,46 @@ def _build_agent() -> Any:
 
 @dataclass
 class CellValidationAgent:
-    """Wrapper that lazily instantiates the underlying Pydantic AI agent."""
+    """Wrapper that lazily instantiates the underlying Pydantic AI agent.
 
+    ``model`` overrides the configured LLM, e.g. for a cheaper cascade tier.
+    """
+
+    model: str | None = None
     agent: Any | None = field(default=None, init=False)
+    last_usage: dict[str, int] = field(default_factory=dict, init=False)
+
+    @property
+    def model_name(self) -> str:
+        """Identifier of the configured LLM."""
+        return self.model or get_cell_validation_config().llm
 
     async def run(self, prompt: str) -> str:
         """Execute the prompt and coerce the agent output to a string."""
         if self.agent is None:
-            self.agent = _build_agent()
+            self.agent = _build_agent(self.model)
         result = await self.agent.run(prompt)
+        self.last_usage = usage_from_result(result)
         return str(result.output)
 
+    async def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Yield the output text in deltas as the model produces it.
 
-def build_cell_validation_agent() -> CellValidationAgent:
-    """Construct the default cell validation agent wrapper."""
-    return CellValidationAgent()
+        Closing the generator early abandons the model stream.
+        """
+        if self.agent is None:
+            self.agent = _build_agent(self.model)
+        async with self.agent.run_stream(prompt) as result:
+            try:
+                async for delta in result.stream_text(delta=True):
+                    yield delta
+            finally:
+                self.last_usage = usage_from_result(result)
+
+
+def build_cell_validation_agent(model: str | None = None) -> CellValidationAgent:
+    """Construct the cell validation agent wrapper, optionally for a specific ``model``."""
+    return CellValidationAgent(model=model)
 
 
 __all__ = ["CellValidationAgent", "build_cell_validation_agent"]
@@ -5,22 +5,26 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any
 
 from .cell_agent_config import CellValidationDependencies
 
-try:  # pragma: no cover - optional dependency
+if TYPE_CHECKING:  # pragma: no cover - type checking only
     from pydantic_ai import RunContext
-except ImportError:  # pragma: no cover - define placeholder for type checking
-    T = TypeVar("T")
 
-    class RunContext(Generic[T]):  # type: ignore[no-redef]
-        """Fallback RunContext used when pydantic_ai is unavailable."""
+logger = logging.getLogger(__name__)
 
-        ...
 
+def bind_run_context() -> None:
+    """Make the tools' ``RunContext`` annotation resolvable for pydantic-ai.
 
-logger = logging.getLogger(__name__)
+    Annotations are postponed strings, so importing this module does not import
+    pydantic-ai; the agent builder calls this just before registering the tools,
+    when pydantic-ai inspects their signatures.
+    """
+    from pydantic_ai import RunContext
+
+    globals()["RunContext"] = RunContext
 
 
 def read_text(ctx: RunContext[CellValidationDependencies], path: str) -> str:
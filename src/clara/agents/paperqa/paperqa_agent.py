@@ -3,19 +3,14 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncGenerator
 from dataclasses import dataclass, field
 from typing import Any
 
+from ...utils.usage import usage_from_result
 from .paperqa_config import PaperQADependencies, get_paperqa_config
 
 paperqa_logger = logging.getLogger(__name__)
-paperqa_logger.setLevel(logging.INFO)
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-console.setFormatter(formatter)
-paperqa_logger.addHandler(console)
-paperqa_logger.propagate = False
 
 SYSTEM_PROMPT = """
 You are a PaperQA summarization assistant. Extract atomic assertions from the
@@ -25,12 +20,12 @@ and reference citations. Never include narrative text outside the JSON payload.
 """
 
 
-def _build_agent() -> Any:
+def _build_agent(model: str | None = None) -> Any:
     from pydantic_ai import Agent
 
     config = get_paperqa_config()
     agent = Agent(
-        model=config.llm,
+        model=model or config.llm,
         deps_type=PaperQADependencies,
         output_type=str,
         system_prompt=SYSTEM_PROMPT,
@@ -41,21 +36,46 @@ def _build_agent() -> Any:
 
 @dataclass
 class PaperQAAgent:
-    """Wrapper exposing a stable async interface to the PaperQA agent."""
+    """Wrapper exposing a stable async interface to the PaperQA agent.
 
+    ``model`` overrides the configured LLM, e.g. for a cheaper cascade tier.
+    """
+
+    model: str | None = None
     agent: Any | None = field(default=None, init=False)
+    last_usage: dict[str, int] = field(default_factory=dict, init=False)
+
+    @property
+    def model_name(self) -> str:
+        """Identifier of the configured LLM."""
+        return self.model or get_paperqa_config().llm
 
     async def run(self, prompt: str) -> str:
         """Execute the prompt and coerce the agent output to a string."""
         if self.agent is None:
-            self.agent = _build_agent()
+            self.agent = _build_agent(self.model)
         result = await self.agent.run(prompt)
+        self.last_usage = usage_from_result(result)
         return str(result.output)
 
+    async def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Yield the output text in deltas as the model produces it.
 
-def build_paperqa_agent() -> PaperQAAgent:
-    """Construct the default PaperQA agent wrapper."""
-    return PaperQAAgent()
+        Closing the generator early abandons the model stream.
+        """
+        if self.agent is None:
+            self.agent = _build_agent(self.model)
+        async with self.agent.run_stream(prompt) as result:
+            try:
+                async for delta in result.stream_text(delta=True):
+                    yield delta
+            finally:
+                self.last_usage = usage_from_result(result)
+
+
+def build_paperqa_agent(model: str | None = None) -> PaperQAAgent:
+    """Construct the PaperQA agent wrapper, optionally for a specific ``model``."""
+    return PaperQAAgent(model=model)
 
 
 __all__ = ["PaperQAAgent", "build_paperqa_agent"]
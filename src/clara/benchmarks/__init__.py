@@ -0,0 +1,35 @@
+"""Offline benchmarking helpers: latency-simulating fakes and scenario runners."""
+
+from __future__ import annotations
+
+from .fakes import (
+    FakeAgentError,
+    FakeCellAgent,
+    FakePaperQAAgent,
+    LatencyProfile,
+    canned_response,
+)
+from .mock_llm_server import Fault, MockLLMServer, MockServerStats
+from .runner import BenchmarkScenario, run_benchmark_scenario, run_benchmark_suite
+from .synthetic import (
+    SyntheticDatasetConfig,
+    SyntheticDatasetSummary,
+    generate_synthetic_dataset,
+)
+
+__all__ = [
+    "BenchmarkScenario",
+    "FakeAgentError",
+    "FakeCellAgent",
+    "FakePaperQAAgent",
+    "LatencyProfile",
+    "canned_response",
+    "Fault",
+    "MockLLMServer",
+    "MockServerStats",
+    "run_benchmark_scenario",
+    "run_benchmark_suite",
+    "SyntheticDatasetConfig",
+    "SyntheticDatasetSummary",
+    "generate_synthetic_dataset",
+]
@@ -0,0 +1,210 @@
+"""Fake agents that mimic LLM latency, transient failures and response sizes."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+
+_CELL_ID_PATTERN = re.compile(r'Cell Type: "([^"]*)"')
+_BATCH_ID_PATTERN = re.compile(r'cell_id: "([^"]*)"')
+_ASSERTION_PATTERN = re.compile(r'^- "(.*)"$', re.MULTILINE)
+
+
+@dataclass
+class LatencyProfile:
+    """Distribution of simulated request latency, in milliseconds.
+
+    ``distribution`` is one of ``fixed`` (always ``mean_ms``), ``uniform``
+    (``mean_ms ± jitter_ms``) or ``lognormal`` (median ``mean_ms`` with shape
+    ``sigma``, which produces the long tail typical of hosted LLM APIs).
+    """
+
+    mean_ms: float = 0.0
+    distribution: str = "fixed"
+    jitter_ms: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """Return one latency sample in seconds."""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed":
+            millis = self.mean_ms
+        elif self.distribution == "uniform":
+            millis = rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        elif self.distribution == "lognormal":
+            millis = self.mean_ms * rng.lognormvariate(0.0, self.sigma)
+        else:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}'.")
+        return max(millis, 0.0) / 1000.0
+
+
+class FakeAgentError(RuntimeError):
+    """A simulated provider failure that outlasted the client's retries."""
+
+
+@dataclass
+class _FakeAgentBase:
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    error_rate: float = 0.0
+    max_retries: int = 2
+    response_rows: int = 5
+    seed: int = 0
+    stream_chunk_chars: int = 24
+    calls: int = field(default=0, init=False)
+    errors: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+    busy_seconds: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.error_rate < 1:
+            raise ValueError(f"error_rate must be in [0, 1), got {self.error_rate}.")
+        if self.max_retries < 0:
+            raise ValueError(f"max_retries must not be negative, got {self.max_retries}.")
+        self._rng = random.Random(self.seed)
+
+    async def _wait(self) -> None:
+        """Sleep for one simulated request, re-paying latency for each transient failure.
+
+        Failures model the retries that provider clients perform internally:
+        each costs another latency sample and is counted. A call that fails
+        more than ``max_retries`` times in a row raises :class:`FakeAgentError`.
+        """
+        delay, failed = self._sample_attempts()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise self._error()
+
+    def _sample_attempts(self) -> tuple[float, bool]:
+        """Return the simulated latency of one call and whether it ultimately failed."""
+        self.calls += 1
+        delay = self.latency.sample(self._rng)
+        failed = False
+        for attempt in range(self.max_retries + 1):
+            if not self.error_rate or self._rng.random() >= self.error_rate:
+                break
+            self.errors += 1
+            if attempt == self.max_retries:
+                self.failures += 1
+                failed = True
+                break
+            delay += self.latency.sample(self._rng)
+        self.busy_seconds += delay
+        return delay, failed
+
+    def _error(self) -> FakeAgentError:
+        return FakeAgentError(f"Simulated provider error after {self.max_retries} retries.")
+
+    async def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Yield the canned response in chunks, spreading the simulated latency over them."""
+        response = canned_response(prompt, self.response_rows)
+        size = max(1, self.stream_chunk_chars)
+        chunks = [response[start : start + size] for start in range(0, len(response), size)]
+        delay, failed = self._sample_attempts()
+        if failed:
+            await asyncio.sleep(delay)
+            raise self._error()
+        delay /= max(1, len(chunks))
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+def canned_response(prompt: str, rows: int = 5) -> str:
+    """Return a schema-appropriate response for any of the workflow's prompt types.
+
+    Seeding prompts get a JSON object (a JSON array with one object per
+    requested ``cell_id`` for batched prompts), table-conversion prompts a
+    JSON array and PaperQA prompts a markdown assertion table with ``rows``
+    entries (one per listed assertion for assertion-level prompts).
+    """
+    if "Insert a biologically plausible" in prompt and _BATCH_ID_PATTERN.search(prompt):
+        return json.dumps(
+            [
+                {
+                    "cell_id": cell_id,
+                    "updated_definition": f"A {name} that also expresses a fabricated marker.",
+                    "false_assertion": "Expresses a fabricated marker.",
+                }
+                for cell_id, name in zip(
+                    _BATCH_ID_PATTERN.findall(prompt), _CELL_ID_PATTERN.findall(prompt), strict=True
+                )
+            ]
+        )
+    if "Insert a biologically plausible" in prompt:
+        match = _CELL_ID_PATTERN.search(prompt)
+        name = match.group(1) if match else "cell"
+        return json.dumps(
+            {
+                "updated_definition": f"A {name} that also expresses a fabricated marker.",
+                "false_assertion": "Expresses a fabricated marker.",
+            }
+        )
+    if "extract only the markdown table" in prompt:
+        return json.dumps(
+            [
+                {
+                    "assertion": f"Assertion {index}",
+                    "validated": index % 2 == 0,
+                    "summary_text": f"Evidence summary {index}.",
+                    "references": "PMID:1",
+                }
+                for index in range(rows)
+            ]
+        )
+    if "For each of the following assertions" in prompt:
+        lines = [
+            "| Assertion | Validated | Evidence | References |",
+            "| --- | --- | --- | --- |",
+        ]
+        lines.extend(
+            f"| {assertion} | {index % 2 == 0} | Evidence summary {index}. | PMID:1 |"
+            for index, assertion in enumerate(_ASSERTION_PATTERN.findall(prompt))
+        )
+        return "\n".join(lines) + "\n"
+    if "For the following text" in prompt:
+        lines = [
+            "| Assertion | Validated | Evidence | References |",
+            "| --- | --- | --- | --- |",
+        ]
+        lines.extend(
+            f"| Assertion {index} | {index % 2 == 0} | Evidence summary {index}. | PMID:1 |"
+            for index in range(rows)
+        )
+        return "\n".join(lines) + "\n"
+    raise ValueError("Unrecognised workflow prompt.")
+
+
+@dataclass
+class FakeCellAgent(_FakeAgentBase):
+    """Stand-in for the cell validation agent (seeding and table conversion prompts)."""
+
+    async def run(self, prompt: str) -> str:
+        """Return a schema-appropriate canned response after the simulated latency."""
+        await self._wait()
+        return canned_response(prompt, self.response_rows)
+
+
+@dataclass
+class FakePaperQAAgent(_FakeAgentBase):
+    """Stand-in for the PaperQA agent returning markdown assertion tables."""
+
+    async def run(self, prompt: str) -> str:
+        """Return a markdown table with ``response_rows`` assertions."""
+        await self._wait()
+        return canned_response(prompt, self.response_rows)
+
+
+__all__ = [
+    "FakeAgentError",
+    "FakeCellAgent",
+    "FakePaperQAAgent",
+    "LatencyProfile",
+    "canned_response",
+]
@@ -0,0 +1,105 @@
+"""Microbenchmark of JSON load/dump for dataset- and cache-sized payloads."""
+
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from ..utils.io_utils import JSON_BACKENDS, json_codec, read_json, set_json_codec, write_json
+from ..utils.validation_models import CellTypeInfo
+from .synthetic import SyntheticDatasetConfig, generate_synthetic_dataset
+
+DEFAULT_JSON_SIZES = (1_000, 10_000)
+
+
+def benchmark_json_codecs(
+    sizes: Sequence[int] = DEFAULT_JSON_SIZES,
+    *,
+    backends: Iterable[str] = JSON_BACKENDS,
+    repeats: int = 5,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Time load and dump of a synthetic dataset and false-assertion cache per backend.
+
+    For each size, ``cells_data.json`` is generated with the synthetic
+    dataset distributions and a matching false-assertion cache is derived
+    from it. Each operation reports the median of ``repeats`` runs. Backends
+    that are not installed are skipped.
+    """
+    results: list[dict[str, Any]] = []
+    previous = json_codec().name
+    try:
+        with tempfile.TemporaryDirectory(prefix="clara-json-bench-") as tmp:
+            workdir = Path(tmp)
+            for size in sizes:
+                data_dir = workdir / f"cells-{size}"
+                config = SyntheticDatasetConfig(cells=size, seed=seed, write_references=False)
+                generate_synthetic_dataset(data_dir, config)
+                dataset = read_json(data_dir / "cells_data.json")
+                cache = [_false_record(entry) for entry in dataset.values()]
+                for backend in backends:
+                    try:
+                        set_json_codec(backend)
+                    except ImportError:
+                        continue
+                    results.append(
+                        {
+                            "backend": backend,
+                            "cells": size,
+                            **_time_payload("dataset", dataset, data_dir, repeats),
+                            **_time_payload("cache", cache, data_dir, repeats),
+                            "dataset_typed_load_ms": _median_ms(
+                                partial(read_json, data_dir / "dataset.json", into=_to_cells),
+                                repeats,
+                            ),
+                        }
+                    )
+    finally:
+        set_json_codec(previous)
+    return results
+
+
+def _time_payload(label: str, payload: Any, workdir: Path, repeats: int) -> dict[str, Any]:
+    compact = workdir / f"{label}.json"
+    pretty = workdir / f"{label}.pretty.json"
+    write_json(compact, payload)
+    write_json(pretty, payload, pretty=True)
+    return {
+        f"{label}_bytes": compact.stat().st_size,
+        f"{label}_pretty_bytes": pretty.stat().st_size,
+        f"{label}_dump_ms": _median_ms(lambda: write_json(compact, payload), repeats),
+        f"{label}_dump_pretty_ms": _median_ms(
+            lambda: write_json(pretty, payload, pretty=True), repeats
+        ),
+        f"{label}_load_ms": _median_ms(lambda: read_json(compact), repeats),
+    }
+
+
+def _median_ms(operation: Callable[[], object], repeats: int) -> float:
+    samples = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _to_cells(payload: dict[str, Any]) -> list[CellTypeInfo]:
+    return [CellTypeInfo.from_payload(entry) for entry in payload.values()]
+
+
+def _false_record(entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "cell_id": entry["cell_id"],
+        "label": entry["name"],
+        "false_assertion": "The cell is also located in the spleen.",
+        "updated_definition": f"{entry['definition']} The cell is also located in the spleen.",
+    }
+
+
+__all__ = ["DEFAULT_JSON_SIZES", "benchmark_json_codecs"]
@@ -0,0 +1,166 @@
+"""Event-loop lag under concurrent pipeline load, with blocking vs. offloaded disk I/O."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from ..services import PaperQAService, ReportBuilder
+from ..utils import load_validation_settings
+from ..utils.async_io import read_json_async, write_json_async
+from ..utils.io_utils import read_json, write_json
+from ..utils.validation_models import CellTypeInfo
+from .fakes import FakeCellAgent, FakePaperQAAgent, LatencyProfile
+from .synthetic import SyntheticDatasetConfig, generate_synthetic_dataset
+
+
+class LoopLagMonitor:
+    """Record how late a periodic timer fires while other work runs on the loop."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> LoopLagMonitor:
+        self._task = asyncio.create_task(self._tick())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def summary(self) -> dict[str, float]:
+        """Lag percentiles in milliseconds."""
+        ordered = sorted(self.samples) or [0.0]
+        return {
+            "lag_p50_ms": statistics.median(ordered) * 1000,
+            "lag_p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+            "lag_max_ms": ordered[-1] * 1000,
+            "ticks": len(self.samples),
+        }
+
+
+async def _measure(
+    tasks: Sequence[Callable[[], Awaitable[object]]], interval: float
+) -> dict[str, Any]:
+    async with LoopLagMonitor(interval) as monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(task() for task in tasks))
+        wall_seconds = time.perf_counter() - started
+    return {**monitor.summary(), "wall_seconds": wall_seconds}
+
+
+async def _cache_io_scenario(
+    workdir: Path, payload: Any, *, offload: bool, concurrency: int, rounds: int, interval: float
+) -> dict[str, Any]:
+    async def worker(index: int) -> None:
+        path = workdir / f"cache-{index}.json"
+        for _ in range(rounds):
+            if offload:
+                await write_json_async(path, payload)
+                await read_json_async(path)
+            else:
+                write_json(path, payload)
+                read_json(path)
+            await asyncio.sleep(0)
+
+    tasks = [lambda index=index: worker(index) for index in range(concurrency)]
+    return await _measure(tasks, interval)
+
+
+async def _pipeline_scenario(
+    cell_data_dir: Path, *, concurrency: int, latency_ms: float, interval: float
+) -> dict[str, Any]:
+    settings = load_validation_settings({"CLARA_CELL_DATA_DIR": str(cell_data_dir)})
+    settings.paths.ensure_directories()
+    latency = LatencyProfile(mean_ms=latency_ms, distribution="lognormal")
+    paperqa = PaperQAService(settings, agent=FakePaperQAAgent(latency=latency, response_rows=20))
+    builder = ReportBuilder(settings, FakeCellAgent(latency=latency, response_rows=20))
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+    for entry in read_json(settings.paths.dataset_file).values():
+        queue.put_nowait(entry)
+
+    async def worker() -> None:
+        while not queue.empty():
+            cell = CellTypeInfo.from_payload(queue.get_nowait())
+            await builder.build_rows(await paperqa.validate_cell(cell))
+
+    return await _measure([worker] * concurrency, interval)
+
+
+def benchmark_loop_lag(
+    *,
+    cells: int = 200,
+    concurrency: int = 16,
+    latency_ms: float = 5.0,
+    cache_cells: int = 2_000,
+    rounds: int = 5,
+    interval: float = 0.001,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Measure event-loop lag for cache I/O (blocking vs. offloaded) and the cold pipeline.
+
+    The cache scenarios have ``concurrency`` tasks repeatedly dump and load a
+    false-assertion-cache-sized payload (``cache_cells`` records) either
+    directly on the loop or through :mod:`clara.utils.async_io`. The pipeline
+    scenario runs PaperQA and table conversion for ``cells`` synthetic cells
+    with ``concurrency`` workers and fake agents of ``latency_ms`` latency.
+    """
+    with tempfile.TemporaryDirectory(prefix="clara-lag-") as tmp:
+        workdir = Path(tmp)
+        cell_data_dir = workdir / "data"
+        config = SyntheticDatasetConfig(
+            cells=max(cells, cache_cells), seed=seed, write_references=False
+        )
+        generate_synthetic_dataset(cell_data_dir, config)
+        dataset = read_json(cell_data_dir / "cells_data.json")
+        payload = list(dataset.values())[:cache_cells]
+        write_json(cell_data_dir / "cells_data.json", dict(list(dataset.items())[:cells]))
+
+        def cache_io(offload: bool) -> dict[str, Any]:
+            return asyncio.run(
+                _cache_io_scenario(
+                    workdir,
+                    payload,
+                    offload=offload,
+                    concurrency=concurrency,
+                    rounds=rounds,
+                    interval=interval,
+                )
+            )
+
+        return {
+            "config": {
+                "cells": cells,
+                "concurrency": concurrency,
+                "latency_ms": latency_ms,
+                "cache_cells": cache_cells,
+                "rounds": rounds,
+                "interval_ms": interval * 1000,
+            },
+            "cache_io_blocking": cache_io(False),
+            "cache_io_offloaded": cache_io(True),
+            "pipeline": asyncio.run(
+                _pipeline_scenario(
+                    cell_data_dir, concurrency=concurrency, latency_ms=latency_ms, interval=interval
+                )
+            ),
+        }
+
+
+__all__ = ["LoopLagMonitor", "benchmark_loop_lag"]
@@ -0,0 +1,268 @@
+"""Local OpenAI-compatible chat-completions server for offline load testing.
+
+Point the real agents at it with ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1``
+and any non-empty ``OPENAI_API_KEY``; model names are accepted verbatim.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from .fakes import LatencyProfile, canned_response
+
+FAULT_KINDS = ("latency", "429", "5xx", "truncate")
+
+
+@dataclass
+class Fault:
+    """A scheduled failure mode applied to matching requests.
+
+    A fault fires on request numbers ``start``, ``start + every``, ... when
+    ``every`` is set, otherwise with ``probability`` on each request from
+    ``start`` onwards. ``latency`` faults add ``latency_ms``; ``5xx`` faults
+    answer with ``status``.
+    """
+
+    kind: str
+    every: int | None = None
+    probability: float = 0.0
+    start: int = 0
+    latency_ms: float = 1_000.0
+    status: int = 503
+
+    def __post_init__(self) -> None:
+        if self.kind not in FAULT_KINDS:
+            raise ValueError(f"Unknown fault kind '{self.kind}'; expected one of {FAULT_KINDS}.")
+
+    @classmethod
+    def parse(cls, spec: str) -> Fault:
+        """Parse ``kind[:key=value,...]``, e.g. ``429:every=10`` or ``latency:probability=0.1``."""
+        kind, _, options = spec.partition(":")
+        values: dict[str, Any] = {}
+        for option in filter(None, options.split(",")):
+            key, _, raw = option.partition("=")
+            key = {"ms": "latency_ms"}.get(key.strip(), key.strip())
+            if key in {"every", "start", "status"}:
+                values[key] = int(raw)
+            elif key in {"probability", "latency_ms"}:
+                values[key] = float(raw)
+            else:
+                raise ValueError(f"Unknown fault option '{key}' in '{spec}'.")
+        return cls(kind=kind.strip(), **values)
+
+    def fires(self, request_number: int, rng: random.Random) -> bool:
+        if request_number < self.start:
+            return False
+        if self.every:
+            return (request_number - self.start) % self.every == 0
+        return rng.random() < self.probability
+
+
+@dataclass
+class MockServerStats:
+    """Counters describing what the mock server has served so far."""
+
+    requests: int = 0
+    responses: int = 0
+    faults: dict[str, int] = field(default_factory=dict)
+
+
+class MockLLMServer:
+    """Threaded HTTP server answering ``/v1/chat/completions`` with canned workflow responses."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: list[Fault] | None = None,
+        latency: LatencyProfile | None = None,
+        response_rows: int = 5,
+        seed: int = 0,
+    ) -> None:
+        self.faults = list(faults or [])
+        self.latency = latency or LatencyProfile()
+        self.response_rows = response_rows
+        self.stats = MockServerStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        host = host.decode() if isinstance(host, bytes) else host
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> MockLLMServer:
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Shut the server down and wait for the background thread."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> MockLLMServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def plan_request(self) -> tuple[float, list[Fault]]:
+        """Assign the next request number and decide its delay and faults."""
+        with self._lock:
+            number = self.stats.requests
+            self.stats.requests += 1
+            delay = self.latency.sample(self._rng)
+            fired = [fault for fault in self.faults if fault.fires(number, self._rng)]
+            for fault in fired:
+                self.stats.faults[fault.kind] = self.stats.faults.get(fault.kind, 0) + 1
+                if fault.kind == "latency":
+                    delay += fault.latency_ms / 1000.0
+        return delay, fired
+
+    def record_response(self) -> None:
+        with self._lock:
+            self.stats.responses += 1
+
+
+def _make_handler(server: MockLLMServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.rstrip("/") not in {"/v1/chat/completions", "/chat/completions"}:
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            delay, faults = server.plan_request()
+            if delay:
+                time.sleep(delay)
+            kinds = {fault.kind for fault in faults}
+            if "429" in kinds:
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                    headers={"retry-after": "1"},
+                )
+                return
+            if "5xx" in kinds:
+                status = next(fault.status for fault in faults if fault.kind == "5xx")
+                self._send_json(status, {"error": {"message": "Upstream error", "type": "server"}})
+                return
+            prompt = _last_user_message(body.get("messages", []))
+            try:
+                content = canned_response(prompt, server.response_rows)
+            except ValueError:
+                content = "Mock server received an unrecognised prompt."
+            finish_reason = "stop"
+            if "truncate" in kinds:
+                content = content[: max(1, len(content) // 2)]
+                finish_reason = "length"
+            model = str(body.get("model", "mock"))
+            usage = {
+                "prompt_tokens": max(1, len(prompt) // 4),
+                "completion_tokens": max(1, len(content) // 4),
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            if body.get("stream"):
+                self._send_stream(model, content, finish_reason, usage)
+            else:
+                self._send_json(
+                    200,
+                    {
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": finish_reason,
+                            }
+                        ],
+                        "usage": usage,
+                    },
+                )
+            server.record_response()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+        def _send_json(
+            self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None
+        ) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(
+            self, model: str, content: str, finish_reason: str, usage: dict[str, int]
+        ) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            pieces = [content[i : i + 32] for i in range(0, len(content), 32)]
+            for index, piece in enumerate(pieces + [""]):
+                last = index == len(pieces)
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": piece} if piece else {},
+                            "finish_reason": finish_reason if last else None,
+                        }
+                    ],
+                }
+                if last:
+                    chunk["usage"] = usage
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+    return Handler
+
+
+def _last_user_message(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content", "")
+        if isinstance(content, list):
+            return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return str(content)
+    return ""
+
+
+__all__ = ["Fault", "MockLLMServer", "MockServerStats"]
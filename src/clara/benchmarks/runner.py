@@ -0,0 +1,177 @@
+"""End-to-end pipeline benchmarks driven by fake agents."""
+
+from __future__ import annotations
+
+import asyncio
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field, replace
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from ..graphs import (
+    ClValidationGraphDependencies,
+    build_cl_validation_graph,
+    run_cl_validation_graph,
+)
+from ..services import FalseAssertionService
+from ..utils import load_validation_settings
+from ..utils.io_utils import write_json
+from .fakes import FakeCellAgent, FakePaperQAAgent, LatencyProfile
+from .synthetic import SyntheticDatasetConfig, generate_synthetic_dataset
+
+DEFAULT_SIZES = (10, 1_000, 10_000)
+DEFAULT_CACHE_STATES = ("cold", "warm")
+
+
+@dataclass
+class BenchmarkScenario:
+    """One benchmark configuration: dataset size, cache state and fake-agent behaviour."""
+
+    cells: int
+    cache: str = "cold"
+    cell_latency: LatencyProfile = field(default_factory=LatencyProfile)
+    paperqa_latency: LatencyProfile = field(default_factory=LatencyProfile)
+    error_rate: float = 0.0
+    response_rows: int = 5
+    false_assertion_probability: float = 0.6
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        return f"cells={self.cells} cache={self.cache}"
+
+
+def run_benchmark_scenario(
+    scenario: BenchmarkScenario,
+    workdir: Path,
+    *,
+    track_memory: bool = True,
+) -> dict[str, Any]:
+    """Run the full graph once for ``scenario`` inside ``workdir`` and return its metrics.
+
+    Warm scenarios run the pipeline once beforehand so every stage is served
+    from cache during the measured run.
+    """
+    if scenario.cache not in DEFAULT_CACHE_STATES:
+        raise ValueError(f"Unknown cache state '{scenario.cache}'.")
+    cell_data_dir = workdir / "data"
+    # The pipeline never reads the packets itself, so only the dataset file is generated.
+    generate_synthetic_dataset(
+        cell_data_dir,
+        SyntheticDatasetConfig(cells=scenario.cells, seed=scenario.seed, write_references=False),
+    )
+    if scenario.cache == "warm":
+        _run_pipeline(scenario, cell_data_dir)
+
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    deps, cell_agent, paperqa_agent = _run_pipeline(scenario, cell_data_dir)
+    wall_seconds = time.perf_counter() - started
+    peak_memory = None
+    if track_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    calls = cell_agent.calls + paperqa_agent.calls
+    return {
+        "name": scenario.name,
+        "cells": scenario.cells,
+        "cache": scenario.cache,
+        "loaded_cells": len(deps.state.cl_definitions),
+        "wall_seconds": wall_seconds,
+        "calls": {"cell_agent": cell_agent.calls, "paperqa_agent": paperqa_agent.calls},
+        "calls_per_second": calls / wall_seconds if wall_seconds else 0.0,
+        "cells_per_second": scenario.cells / wall_seconds if wall_seconds else 0.0,
+        "simulated_errors": cell_agent.errors + paperqa_agent.errors,
+        "simulated_latency_seconds": cell_agent.busy_seconds + paperqa_agent.busy_seconds,
+        "peak_memory_bytes": peak_memory,
+        "stages": dict(deps.node_timings),
+    }
+
+
+def run_benchmark_suite(
+    output_path: Path,
+    *,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    cache_states: Iterable[str] = DEFAULT_CACHE_STATES,
+    template: BenchmarkScenario | None = None,
+    track_memory: bool = True,
+) -> dict[str, Any]:
+    """Run every size/cache combination and write a JSON results file to ``output_path``."""
+    template = template or BenchmarkScenario(cells=0)
+    results: list[dict[str, Any]] = []
+    for cells in sizes:
+        for cache in cache_states:
+            scenario = replace(template, cells=cells, cache=cache)
+            with tempfile.TemporaryDirectory(prefix="clara-bench-") as tmp:
+                results.append(
+                    run_benchmark_scenario(scenario, Path(tmp), track_memory=track_memory)
+                )
+    report = {
+        "clara_version": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(UTC).isoformat(),
+        "config": {
+            "cell_latency": asdict(template.cell_latency),
+            "paperqa_latency": asdict(template.paperqa_latency),
+            "error_rate": template.error_rate,
+            "response_rows": template.response_rows,
+            "false_assertion_probability": template.false_assertion_probability,
+            "seed": template.seed,
+            "track_memory": track_memory,
+        },
+        "scenarios": results,
+    }
+    write_json(output_path, report, pretty=True)
+    return report
+
+
+def _run_pipeline(
+    scenario: BenchmarkScenario, cell_data_dir: Path
+) -> tuple[ClValidationGraphDependencies, FakeCellAgent, FakePaperQAAgent]:
+    settings = load_validation_settings(
+        {
+            "CLARA_CELL_DATA_DIR": str(cell_data_dir),
+            "CLARA_FALSE_ASSERTION_PROBABILITY": str(scenario.false_assertion_probability),
+        }
+    )
+    cell_agent = FakeCellAgent(
+        latency=scenario.cell_latency,
+        error_rate=scenario.error_rate,
+        response_rows=scenario.response_rows,
+        seed=scenario.seed,
+    )
+    paperqa_agent = FakePaperQAAgent(
+        latency=scenario.paperqa_latency,
+        error_rate=scenario.error_rate,
+        response_rows=scenario.response_rows,
+        seed=scenario.seed + 1,
+    )
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=settings,
+        cell_agent=cell_agent,
+        paperqa_agent=paperqa_agent,
+        false_service=FalseAssertionService(settings, cell_agent, rng=random.Random(scenario.seed)),
+    )
+    asyncio.run(run_cl_validation_graph(deps=deps))
+    return deps, cell_agent, paperqa_agent
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("clara")
+    except metadata.PackageNotFoundError:  # pragma: no cover - source checkout
+        return "unknown"
+
+
+__all__ = ["BenchmarkScenario", "run_benchmark_scenario", "run_benchmark_suite"]
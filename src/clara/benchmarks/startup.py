@@ -0,0 +1,103 @@
+"""Import-time (startup) benchmark for the public entry modules."""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+STARTUP_MODULES = ("clara", "clara.graphs", "clara.validation")
+# Heavy dependencies that must only be imported when a run actually needs them.
+DEFERRED_MODULES = ("pydantic_ai", "jsonschema", "dotenv", "http.server", "tiktoken", "pyarrow")
+DEFAULT_IMPORT_BUDGET_MS = 400.0
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@dataclass
+class StartupResult:
+    """Import timings for a set of modules imported together in a fresh interpreter."""
+
+    modules: list[str]
+    samples_ms: list[float]
+    budget_ms: float
+    deferred_loaded: list[str] = field(default_factory=list)
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.median_ms <= self.budget_ms and not self.deferred_loaded
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "modules": self.modules,
+            "samples_ms": self.samples_ms,
+            "median_ms": self.median_ms,
+            "budget_ms": self.budget_ms,
+            "deferred_loaded": self.deferred_loaded,
+            "within_budget": self.within_budget,
+        }
+
+
+def measure_startup(
+    modules: Sequence[str] = STARTUP_MODULES,
+    *,
+    repeats: int = 5,
+    budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+    deferred: Iterable[str] = DEFERRED_MODULES,
+) -> StartupResult:
+    """Import ``modules`` in ``repeats`` fresh interpreters and time the imports.
+
+    Each sample runs in its own subprocess so nothing is served from an
+    already-populated ``sys.modules``. Any of ``deferred`` found loaded
+    afterwards is reported, since it means a lazy import regressed.
+    """
+    if repeats < 1:
+        raise ValueError("Repeats must be at least 1.")
+    env = dict(os.environ)
+    src_dir = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    samples: list[float] = []
+    loaded: set[str] = set()
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE, *modules],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        payload = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(payload["seconds"] * 1000)
+        loaded.update(payload["modules"])
+    return StartupResult(
+        modules=list(modules),
+        samples_ms=samples,
+        budget_ms=budget_ms,
+        deferred_loaded=sorted(set(deferred) & loaded),
+    )
+
+
+__all__ = [
+    "DEFAULT_IMPORT_BUDGET_MS",
+    "DEFERRED_MODULES",
+    "STARTUP_MODULES",
+    "StartupResult",
+    "measure_startup",
+]
@@ -0,0 +1,208 @@
+"""Deterministic synthetic ``cells_data.json`` and reference packets for scale testing."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+_QUALIFIERS = (
+    "multiciliated", "fenestrated", "quiescent", "activated", "tuft", "granular", "stellate",
+    "bipolar", "intercalated", "basal", "apical", "migratory", "secretory", "resident",
+)  # fmt: skip
+_TISSUES = (
+    "ependymal", "hepatic", "renal", "cortical", "retinal", "pulmonary", "intestinal",
+    "cardiac", "splenic", "thymic", "pancreatic", "dermal", "osteal", "vascular",
+)  # fmt: skip
+_CELL_NOUNS = (
+    "cell", "neuron", "epithelial cell", "fibroblast", "macrophage", "endothelial cell",
+    "progenitor cell", "interneuron", "myocyte", "astrocyte", "lymphocyte",
+)  # fmt: skip
+_VOCABULARY = (
+    "expresses", "marker", "located", "ventricle", "surface", "cilia", "motile", "cerebrospinal",
+    "fluid", "homeostasis", "lineage", "derived", "progenitor", "transcription", "factor",
+    "secretes", "protein", "adjacent", "basal", "lamina", "junction", "membrane", "signalling",
+    "pathway", "differentiates", "response", "injury", "tissue", "layer", "population",
+    "characterized", "morphology", "dendrite", "axon", "receptor", "cytokine", "antigen",
+)  # fmt: skip
+_RELATIONS = ("is a", "part of", "has part", "capable of", "has soma location", "develops from")
+_SOURCES = (("editor", 0.7), ("import", 0.2), ("curation-sprint", 0.1))
+
+
+@dataclass
+class SyntheticDatasetConfig:
+    """Distributions used to synthesise a curated dataset.
+
+    Lengths and counts are drawn from skewed distributions (lognormal word
+    counts, geometric relation/reference counts) and PMIDs from a shared pool
+    with skewed popularity, so some papers are cited by many cells.
+    """
+
+    cells: int
+    seed: int = 0
+    definition_words_median: float = 45.0
+    definition_words_sigma: float = 0.4
+    relations_mean: float = 2.0
+    references_mean: float = 3.0
+    references_max: int = 12
+    pmid_overlap: float = 0.35
+    popularity_skew: float = 2.0
+    complete_reference_fraction: float = 0.92
+    paper_bytes_median: int = 56_000
+    paper_bytes_sigma: float = 0.25
+    write_references: bool = True
+
+
+@dataclass
+class SyntheticDatasetSummary:
+    """Counts describing a generated dataset."""
+
+    cells: int
+    unique_pmids: int
+    reference_files: int
+    reference_bytes: int
+
+
+def generate_synthetic_dataset(
+    cell_data_dir: Path, config: SyntheticDatasetConfig
+) -> SyntheticDatasetSummary:
+    """Write ``cells_data.json`` and matching ``reference/`` packets under ``cell_data_dir``.
+
+    Output is fully determined by ``config`` (including its seed). Papers cited
+    by several cells are written once and hard-linked into the other packets
+    where the filesystem allows it.
+    """
+    rng = random.Random(config.seed)
+    pool_size = max(1, math.ceil(config.cells * config.references_mean * (1 - config.pmid_overlap)))
+    first_pmid = 10_000_000 + rng.randrange(10_000_000)
+    entries: dict[str, dict[str, Any]] = {}
+    for index in range(config.cells):
+        cell_id = f"CL_{9_000_000 + index:07d}"
+        pmids = _draw_pmids(rng, config, pool_size, first_pmid)
+        complete = bool(pmids) and rng.random() < config.complete_reference_fraction
+        entries[cell_id] = {
+            "name": _draw_name(rng, index),
+            "cell_id": cell_id,
+            "definition": _draw_definition(rng, config),
+            "relations": ". ".join(_draw_relations(rng, config)),
+            "references": ",".join(f"PMID:{pmid}" for pmid in pmids),
+            "has_all_references": complete,
+            "source": _draw_source(rng),
+        }
+
+    cell_data_dir.mkdir(parents=True, exist_ok=True)
+    with (cell_data_dir / "cells_data.json").open("w", encoding="utf-8") as handle:
+        json.dump(entries, handle, indent=2)
+
+    summary = SyntheticDatasetSummary(
+        cells=config.cells,
+        unique_pmids=len(
+            {ref for entry in entries.values() for ref in entry["references"].split(",") if ref}
+        ),
+        reference_files=0,
+        reference_bytes=0,
+    )
+    if config.write_references:
+        _write_reference_packets(cell_data_dir / "reference", entries, config, summary)
+    return summary
+
+
+def _draw_pmids(
+    rng: random.Random, config: SyntheticDatasetConfig, pool_size: int, first_pmid: int
+) -> list[int]:
+    count = min(1 + _geometric(rng, config.references_mean - 1), config.references_max)
+    pmids: set[int] = set()
+    for _ in range(count):
+        rank = int(pool_size * rng.random() ** config.popularity_skew)
+        pmids.add(first_pmid + rank)
+    return sorted(pmids)
+
+
+def _draw_name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(_QUALIFIERS)} {rng.choice(_TISSUES)} {rng.choice(_CELL_NOUNS)} {index}"
+
+
+def _draw_definition(rng: random.Random, config: SyntheticDatasetConfig) -> str:
+    words = max(
+        8,
+        int(
+            rng.lognormvariate(
+                math.log(config.definition_words_median), config.definition_words_sigma
+            )
+        ),
+    )
+    body = " ".join(rng.choice(_VOCABULARY) for _ in range(words - 4))
+    return f"A {rng.choice(_TISSUES)} {rng.choice(_CELL_NOUNS)} that {body}."
+
+
+def _draw_relations(rng: random.Random, config: SyntheticDatasetConfig) -> list[str]:
+    count = 1 + _geometric(rng, config.relations_mean - 1)
+    return [
+        f"{rng.choice(_RELATIONS)} {rng.choice(_TISSUES)} {rng.choice(_CELL_NOUNS)}"
+        for _ in range(count)
+    ]
+
+
+def _draw_source(rng: random.Random) -> str:
+    draw = rng.random()
+    for source, weight in _SOURCES:
+        if draw < weight:
+            return source
+        draw -= weight
+    return _SOURCES[0][0]
+
+
+def _geometric(rng: random.Random, mean: float) -> int:
+    """Sample a count >= 0 with the given mean from a geometric distribution."""
+    if mean <= 0:
+        return 0
+    success = 1.0 / (mean + 1.0)
+    return int(math.log(1.0 - rng.random()) / math.log(1.0 - success))
+
+
+def _write_reference_packets(
+    references_dir: Path,
+    entries: dict[str, dict[str, Any]],
+    config: SyntheticDatasetConfig,
+    summary: SyntheticDatasetSummary,
+) -> None:
+    rng = random.Random(config.seed + 1)
+    corpus = " ".join(rng.choice(_VOCABULARY) for _ in range(4096))
+    written: dict[str, Path] = {}
+    for cell_id, entry in entries.items():
+        packet = references_dir / cell_id
+        packet.mkdir(parents=True, exist_ok=True)
+        for reference in filter(None, entry["references"].split(",")):
+            pmid = reference.split(":", 1)[1]
+            target = packet / f"PMID_{pmid}.txt"
+            source = written.get(pmid)
+            if source is None:
+                size = int(
+                    rng.lognormvariate(
+                        math.log(config.paper_bytes_median), config.paper_bytes_sigma
+                    )
+                )
+                target.write_text(_paper_text(corpus, int(pmid), size), encoding="utf-8")
+                written[pmid] = target
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copyfile(source, target)
+            summary.reference_files += 1
+            summary.reference_bytes += target.stat().st_size
+
+
+def _paper_text(corpus: str, pmid: int, size: int) -> str:
+    start = pmid % len(corpus)
+    repeats = size // len(corpus) + 2
+    body = (corpus[start:] + " " + corpus * repeats)[:size]
+    return f"Synthetic paper PMID {pmid}\n{body}\n"
+
+
+__all__ = ["SyntheticDatasetConfig", "SyntheticDatasetSummary", "generate_synthetic_dataset"]
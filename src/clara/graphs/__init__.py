@@ -5,9 +5,14 @@ from __future__ import annotations
 from .cl_validation import (
     ClValidationGraphDependencies,
     build_cl_validation_graph,
+    iter_cell_validations,
     run_cl_validation_graph,
     run_cl_validation_workflow,
 )
+from .cl_validation_daemon import ValidationDaemon, submit_validation_job
+from .cl_validation_plan import RunPlan, StagePlan, format_plan, plan_cl_validation
+from .cl_validation_queue import QueueWorker, enqueue_cl_validation, publish_queue_report
+from .cl_validation_watch import AffectedCells, CurationWatcher
 from .definitions import GraphNode, WorkflowGraph
 from .graph_agent import GraphDependencies, build_graph_agent
 
@@ -20,4 +25,16 @@ __all__ = [
     "ClValidationGraphDependencies",
     "run_cl_validation_graph",
     "run_cl_validation_workflow",
+    "QueueWorker",
+    "enqueue_cl_validation",
+    "publish_queue_report",
+    "iter_cell_validations",
+    "ValidationDaemon",
+    "submit_validation_job",
+    "RunPlan",
+    "StagePlan",
+    "format_plan",
+    "plan_cl_validation",
+    "AffectedCells",
+    "CurationWatcher",
 ]
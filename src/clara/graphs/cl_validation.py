@@ -2,21 +2,34 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+import functools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, MutableSequence
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
-from ..agents import PaperQAAgent, build_paperqa_agent
+from ..agents import build_cell_validation_agent, build_paperqa_agent, get_cell_validation_config
+from ..agents.paperqa import get_paperqa_config
 from ..services import (
+    BatchClient,
+    BulkBatchRunner,
     CellAgentAdapter,
     CellDatasetLoader,
     FalseAssertionService,
+    LazyAgent,
     PaperQAService,
     ReportBuilder,
 )
-from ..services.agent_adapters import AsyncAgentRunner
+from ..services.agent_adapters import AsyncAgentRunner, cascade
 from ..utils import ValidationSettings, load_validation_settings
-from ..utils.validation_models import ValidationState
+from ..utils.async_io import run_io
+from ..utils.metrics import NODE_SECONDS
+from ..utils.profiling import NodeProfiler
+from ..utils.tracing import trace_span
+from ..utils.usage import PriceTable, UsageBudget, UsageLedger
+from ..utils.validation_models import CellTypeInfo, ValidationState
 from .definitions import GraphNode, WorkflowGraph
 from .graph_agent import GraphDependencies
 
@@ -69,19 +82,45 @@ class ClValidationGraphDependencies(GraphDependencies):
     paperqa_service: PaperQAService | None = None
     report_builder: ReportBuilder | None = None
     cell_agent: AsyncAgentRunner | None = None
-    paperqa_agent: PaperQAAgent | None = None
+    paperqa_agent: AsyncAgentRunner | None = None
     report_path: Path | None = None
+    node_timings: dict[str, float] = field(default_factory=dict)
+    usage: UsageLedger | None = None
+    profiler: NodeProfiler | None = None
+    batch_client: BatchClient | None = None
 
     def __post_init__(self) -> None:
+        # Default agents are built on their first call, so fully cached runs construct none.
         self.settings.paths.ensure_directories()
-        agent = self.cell_agent or CellAgentAdapter()
+        self.cell_agent = agent = self.cell_agent or LazyAgent(
+            CellAgentAdapter, model_name=lambda: get_cell_validation_config().llm
+        )
+        self.paperqa_agent = self.paperqa_agent or LazyAgent(
+            build_paperqa_agent, model_name=lambda: get_paperqa_config().llm
+        )
         self.dataset_loader = self.dataset_loader or CellDatasetLoader(self.settings)
-        self.false_service = self.false_service or FalseAssertionService(self.settings, agent)
+        # Stages with a model cascade try cheaper models before the agents above.
+        cascades = self.settings.model_cascades
+        self.false_service = self.false_service or FalseAssertionService(
+            self.settings, cascade(agent, cascades.get("seed", ()), _cell_agent_for)
+        )
         self.paperqa_service = self.paperqa_service or PaperQAService(
-            self.settings, agent=self.paperqa_agent or build_paperqa_agent()
+            self.settings,
+            agent=cascade(self.paperqa_agent, cascades.get("paperqa", ()), build_paperqa_agent),
+        )
+        self.report_builder = self.report_builder or ReportBuilder(
+            self.settings, cascade(agent, cascades.get("convert", ()), _cell_agent_for)
         )
-        self.report_builder = self.report_builder or ReportBuilder(self.settings, agent)
         self.state.is_test_mode = self.settings.is_test_mode
+        if self.usage is None:
+            self.usage = UsageLedger(
+                PriceTable.load(self.settings.price_table_file),
+                UsageBudget(self.settings.token_budget, self.settings.cost_budget_usd),
+            )
+
+
+def _cell_agent_for(model: str) -> AsyncAgentRunner:
+    return CellAgentAdapter(build_cell_validation_agent(model))
 
 
 NodeHandler = Callable[[ClValidationGraphDependencies], Awaitable[str | None]]
@@ -92,9 +131,14 @@ async def run_cl_validation_graph(
     settings: ValidationSettings | None = None,
     deps: ClValidationGraphDependencies | None = None,
     cell_agent: AsyncAgentRunner | None = None,
-    paperqa_agent: PaperQAAgent | None = None,
+    paperqa_agent: AsyncAgentRunner | None = None,
+    profile: bool = False,
 ) -> Path:
-    """Execute the CL validation workflow graph using the registered handlers."""
+    """Execute the CL validation workflow graph using the registered handlers.
+
+    With ``profile`` (or a ``deps.profiler``), every node runs under cProfile
+    and tracemalloc and per-node reports are written to ``paths.profiles_dir``.
+    """
 
     graph = build_cl_validation_graph()
     if deps is None:
@@ -111,26 +155,78 @@ async def run_cl_validation_graph(
             )
         deps.graph = graph
 
+    if profile and deps.profiler is None:
+        deps.profiler = NodeProfiler(deps.settings.paths.profiles_dir)
+    profiler = deps.profiler
+    ledger = deps.usage or UsageLedger()
     node_id: str | None = graph.entrypoint
-    while node_id:
-        node = deps.graph.route(node_id)
-        handler = _SERVICE_HANDLERS.get(node.service)
-        if not handler:
-            raise ValueError(f"No service handler registered for '{node.service}'")
-        node_id = await handler(deps)
+    paths = deps.settings.paths
+    try:
+        with ledger.activate():
+            while node_id:
+                node = deps.graph.route(node_id)
+                handler = _SERVICE_HANDLERS.get(node.service)
+                if not handler:
+                    raise ValueError(f"No service handler registered for '{node.service}'")
+                started = time.perf_counter()
+                node_profile = profiler.profile_node(node.id) if profiler else nullcontext()
+                with trace_span(node.id, "node", service=node.service), node_profile:
+                    next_node_id = await handler(deps)
+                deps.node_timings[node.id] = time.perf_counter() - started
+                NODE_SECONDS.set(deps.node_timings[node.id], node=node.id)
+                node_id = next_node_id
+    finally:
+        # Usage is written even when a run stops early, e.g. on an exhausted budget.
+        ledger.write(paths.usage_summary_file, paths.usage_by_cell_file)
+        if profiler:
+            profiler.write_summary()
 
     if not deps.report_path:
         raise RuntimeError("CL validation workflow completed without generating a report.")
     return deps.report_path
 
 
+async def iter_cell_validations(
+    deps: ClValidationGraphDependencies,
+    cells: Iterable[CellTypeInfo],
+    *,
+    false_cache: MutableSequence[dict[str, Any]] | None = None,
+    on_row: Callable[[CellTypeInfo, dict[str, str]], object] | None = None,
+) -> AsyncIterator[tuple[CellTypeInfo, list[dict[str, str]]]]:
+    """Push individual cells through seeding, PaperQA and conversion, yielding report rows.
+
+    ``false_cache`` lets long-lived callers keep the false-assertion records in
+    memory; new records are merged back to disk as they are generated.
+    ``on_row`` receives each report row as soon as it has streamed in, before
+    its cell is yielded.
+    """
+    false_service = deps.false_service
+    paperqa_service = deps.paperqa_service
+    builder = deps.report_builder
+    if not false_service or not paperqa_service or not builder:
+        raise RuntimeError("CL validation services not configured.")
+    cache = false_cache if false_cache is not None else await run_io(false_service.load_cache)
+    for cell in cells:
+        with trace_span("cell", "cell", cell_id=cell.cl_id):
+            known = len(cache)
+            mutated = await false_service.seed_cell(cell, cache)
+            if len(cache) > known:
+                await run_io(false_service.merge_cache, cache[known:])
+            result = await paperqa_service.validate_cell(mutated)
+            row_callback = functools.partial(on_row, cell) if on_row else None
+            rows = await builder.build_rows(result, on_row=row_callback)
+        yield cell, rows
+
+
 async def _handle_load_definitions(deps: ClValidationGraphDependencies) -> str:
     loader = deps.dataset_loader
     if not loader:
         raise RuntimeError("Dataset loader not configured.")
-    definitions = loader.load_definitions()
     deps.state.cl_definitions.clear()
-    deps.state.extend_definitions(definitions)
+    # Definitions are parsed and appended on a worker thread without a temporary
+    # copy, but the state keeps every definition for the later stages, so memory
+    # still grows with the dataset.
+    await run_io(deps.state.extend_definitions, loader.iter_definitions())
     return "seed_false_assertions"
 
 
@@ -140,7 +236,7 @@ async def _handle_seed_false_assertions(deps: ClValidationGraphDependencies) ->
         raise RuntimeError("False assertion service not configured.")
     definitions = deps.state.cl_definitions
     mutated = await service.seed_definitions(definitions)
-    deps.state.cl_updated_definitions.clear()
+    deps.state.definition_overrides.clear()
     deps.state.extend_updated_definitions(mutated)
     return "run_paperqa"
 
@@ -149,13 +245,33 @@ async def _handle_run_paperqa(deps: ClValidationGraphDependencies) -> str:
     service = deps.paperqa_service
     if not service:
         raise RuntimeError("PaperQA service not configured.")
-    results = await service.validate_cells(deps.state.cl_updated_definitions)
+    if deps.batch_client:
+        await _prefill_caches_with_batch(deps, deps.batch_client)
+    results = await service.validate_cells(deps.state.updated_definitions())
     deps.state.paperqa_results.clear()
     for result in results:
         deps.state.append_paperqa_result(result)
     return "generate_report"
 
 
+async def _prefill_caches_with_batch(
+    deps: ClValidationGraphDependencies, client: BatchClient
+) -> None:
+    paperqa_service = deps.paperqa_service
+    builder = deps.report_builder
+    if not paperqa_service or not builder:
+        raise RuntimeError("CL validation services not configured.")
+    runner = BulkBatchRunner(
+        deps.settings,
+        client,
+        paperqa_service,
+        builder,
+        paperqa_model=getattr(deps.paperqa_agent, "model_name", None),
+        cell_model=getattr(deps.cell_agent, "model_name", None),
+    )
+    await runner.run(deps.state.updated_definitions())
+
+
 async def _handle_generate_report(deps: ClValidationGraphDependencies) -> None:
     builder = deps.report_builder
     if not builder:
@@ -176,7 +292,8 @@ _SERVICE_HANDLERS: dict[str, NodeHandler] = {
 async def run_cl_validation_workflow(
     settings: ValidationSettings | None = None,
     cell_agent: AsyncAgentRunner | None = None,
-    paperqa_agent: PaperQAAgent | None = None,
+    paperqa_agent: AsyncAgentRunner | None = None,
+    profile: bool = False,
 ) -> Path:
     """Compatibility wrapper that executes the CL validation graph."""
 
@@ -184,6 +301,7 @@ async def run_cl_validation_workflow(
         settings=settings,
         cell_agent=cell_agent,
         paperqa_agent=paperqa_agent,
+        profile=profile,
     )
 
 
@@ -192,4 +310,5 @@ __all__ = [
     "ClValidationGraphDependencies",
     "run_cl_validation_graph",
     "run_cl_validation_workflow",
+    "iter_cell_validations",
 ]
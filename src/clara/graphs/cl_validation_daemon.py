@@ -0,0 +1,194 @@
+"""Resident validation service that keeps agents and caches warm between jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from ..utils.async_io import run_io
+from ..utils.usage import UsageLedger
+from ..utils.validation_models import CellTypeInfo
+from .cl_validation import (
+    ClValidationGraphDependencies,
+    build_cl_validation_graph,
+    iter_cell_validations,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAEMON_HOST = "127.0.0.1"
+DEFAULT_DAEMON_PORT = 8765
+
+
+class ValidationDaemon:
+    """Serve validation jobs for explicit CL IDs over a newline-delimited JSON socket.
+
+    Clients send one JSON object per line, ``{"cell_ids": ["CL_..."]}``, and
+    receive one JSON event per validated cell followed by a ``done`` event.
+    With ``"stream_rows": true`` each report row is also sent as a ``row``
+    event as soon as it has streamed in, ahead of its cell's event. The
+    dependencies (agents, HTTP clients inside them, the dataset index and the
+    false-assertion records) are built once and reused by every job, and the
+    index and records are reloaded when their files change on disk; jobs run
+    one at a time because they share the on-disk caches. Usage accumulates in
+    ``deps.usage`` across jobs, so the token/cost budget covers the daemon's
+    lifetime; a job that would exceed it ends with an ``error`` event.
+    """
+
+    def __init__(self, deps: ClValidationGraphDependencies | None = None) -> None:
+        self.deps = deps or ClValidationGraphDependencies(graph=build_cl_validation_graph())
+        self._lock = asyncio.Lock()
+        self._false_cache: list[dict[str, Any]] | None = None
+        self._false_cache_stamp: tuple[int, int] | None = None
+
+    async def validate(
+        self, cell_ids: Sequence[str], *, stream_rows: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Validate ``cell_ids`` and yield one event per cell, then a summary event.
+
+        With ``stream_rows``, every report row is also yielded as a ``row``
+        event while its cell is still being converted.
+        """
+        loader = self.deps.dataset_loader
+        false_service = self.deps.false_service
+        if not loader or not false_service:
+            raise RuntimeError("CL validation services not configured.")
+        async with self._lock:
+            index = await run_io(loader.load_index)
+            false_cache = await run_io(self._load_false_cache)
+            cells = []
+            for cell_id in cell_ids:
+                if cell_id in index:
+                    cells.append(index[cell_id])
+                else:
+                    yield {"event": "error", "cell_id": cell_id, "error": "unknown CL ID"}
+            # Rows arrive through a synchronous callback, so the cells run in a
+            # task and every event is handed over through a queue.
+            events: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+            producer = asyncio.create_task(self._run_cells(cells, false_cache, events, stream_rows))
+            producer.add_done_callback(lambda _: events.put_nowait(None))
+            try:
+                while (event := await events.get()) is not None:
+                    yield event
+                completed = await producer
+            finally:
+                producer.cancel()
+            yield {"event": "done", "cells": completed}
+
+    def _load_false_cache(self) -> list[dict[str, Any]]:
+        """Return the false-assertion records, reloading them when the file has changed."""
+        false_service = self.deps.false_service
+        if not false_service:
+            raise RuntimeError("False assertion service not configured.")
+        try:
+            stat = self.deps.settings.paths.false_definitions_file.stat()
+            stamp: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if self._false_cache is None or stamp != self._false_cache_stamp:
+            self._false_cache = false_service.load_cache()
+            self._false_cache_stamp = stamp
+        return self._false_cache
+
+    async def _run_cells(
+        self,
+        cells: Sequence[CellTypeInfo],
+        false_cache: list[dict[str, Any]],
+        events: asyncio.Queue[dict[str, Any] | None],
+        stream_rows: bool,
+    ) -> int:
+        def on_row(cell: CellTypeInfo, row: dict[str, str]) -> None:
+            events.put_nowait({"event": "row", "cell_id": cell.cl_id, "row": row})
+
+        completed = 0
+        ledger = self.deps.usage or UsageLedger()
+        paths = self.deps.settings.paths
+        try:
+            with ledger.activate():
+                async for cell, rows in iter_cell_validations(
+                    self.deps,
+                    cells,
+                    false_cache=false_cache,
+                    on_row=on_row if stream_rows else None,
+                ):
+                    completed += 1
+                    events.put_nowait({"event": "cell", "cell_id": cell.cl_id, "rows": rows})
+        finally:
+            await run_io(ledger.write, paths.usage_summary_file, paths.usage_by_cell_file)
+        return completed
+
+    async def start(
+        self,
+        *,
+        host: str = DEFAULT_DAEMON_HOST,
+        port: int = DEFAULT_DAEMON_PORT,
+        socket_path: Path | None = None,
+    ) -> asyncio.Server:
+        """Start listening on a Unix socket (when given) or a local TCP port."""
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(self._handle_client, path=str(socket_path))
+            logger.info("Validation daemon listening on %s", socket_path)
+        else:
+            server = await asyncio.start_server(self._handle_client, host=host, port=port)
+            logger.info("Validation daemon listening on %s:%s", host, port)
+        return server
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    cell_ids = [str(cell_id) for cell_id in request["cell_ids"]]
+                    stream_rows = bool(request.get("stream_rows", False))
+                except (ValueError, KeyError, TypeError) as exc:
+                    await _send(writer, {"event": "error", "error": f"invalid request: {exc}"})
+                    continue
+                try:
+                    async for event in self.validate(cell_ids, stream_rows=stream_rows):
+                        await _send(writer, event)
+                except Exception as exc:
+                    logger.exception("Validation job failed")
+                    await _send(writer, {"event": "error", "error": f"{type(exc).__name__}: {exc}"})
+        except ConnectionError:  # pragma: no cover - client went away
+            pass
+        finally:
+            writer.close()
+
+
+async def submit_validation_job(
+    cell_ids: Sequence[str],
+    *,
+    host: str = DEFAULT_DAEMON_HOST,
+    port: int = DEFAULT_DAEMON_PORT,
+    socket_path: Path | None = None,
+    stream_rows: bool = False,
+) -> AsyncIterator[dict[str, Any]]:
+    """Send a job to a running daemon and yield its events until the job completes."""
+    if socket_path is not None:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await _send(writer, {"cell_ids": list(cell_ids), "stream_rows": stream_rows})
+        while line := await reader.readline():
+            event = json.loads(line)
+            yield event
+            if event["event"] == "done" or (event["event"] == "error" and "cell_id" not in event):
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _send(writer: asyncio.StreamWriter, event: dict[str, Any]) -> None:
+    writer.write(json.dumps(event).encode("utf-8") + b"\n")
+    await writer.drain()
+
+
+__all__ = ["ValidationDaemon", "submit_validation_job"]
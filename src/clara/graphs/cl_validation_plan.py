@@ -0,0 +1,236 @@
+"""Estimate LLM calls, tokens, cost and wall time of a run from the current cache state."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from ..agents.cell_validation.cell_agent import SYSTEM_PROMPT as CELL_SYSTEM_PROMPT
+from ..agents.paperqa.paperqa_agent import SYSTEM_PROMPT as PAPERQA_SYSTEM_PROMPT
+from ..services import FalseAssertionService, ReportBuilder
+from ..utils.usage import (
+    UNKNOWN_MODEL,
+    PriceTable,
+    UsageTotals,
+    estimate_tokens,
+    token_counter_name,
+)
+from .cl_validation import ClValidationGraphDependencies
+
+# Typical response sizes and latencies; override per run when better numbers are known.
+DEFAULT_OUTPUT_TOKENS = {"seed": 120, "paperqa": 700, "convert": 600}
+DEFAULT_SECONDS_PER_CALL = {"seed": 4.0, "paperqa": 45.0, "convert": 12.0}
+
+
+@dataclass
+class StagePlan:
+    """Projected work for one LLM-backed stage.
+
+    ``calls`` is the number of uncached cells; ``expected_calls`` accounts for
+    stages that only call the LLM for a fraction of them (false-assertion
+    seeding). Token, cost and time projections use ``expected_calls``.
+    """
+
+    stage: str
+    model: str
+    cells: int
+    cached: int
+    calls: int
+    expected_calls: float
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float | None
+    wall_seconds: float
+
+
+@dataclass
+class RunPlan:
+    """Projection for a whole run at a given concurrency."""
+
+    cells: int
+    concurrency: int
+    token_counter: str
+    stages: list[StagePlan]
+    token_budget: int | None = None
+    cost_budget_usd: float | None = None
+
+    @property
+    def calls(self) -> int:
+        return sum(stage.calls for stage in self.stages)
+
+    @property
+    def tokens(self) -> int:
+        return sum(stage.input_tokens + stage.output_tokens for stage in self.stages)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(stage.cost_usd or 0.0 for stage in self.stages)
+
+    @property
+    def wall_seconds(self) -> float:
+        return sum(stage.wall_seconds for stage in self.stages)
+
+    @property
+    def within_budget(self) -> bool:
+        if self.token_budget is not None and self.tokens > self.token_budget:
+            return False
+        return self.cost_budget_usd is None or self.cost_usd <= self.cost_budget_usd
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "calls": self.calls,
+            "tokens": self.tokens,
+            "cost_usd": self.cost_usd,
+            "wall_seconds": self.wall_seconds,
+            "within_budget": self.within_budget,
+        }
+
+
+def plan_cl_validation(
+    deps: ClValidationGraphDependencies,
+    *,
+    concurrency: int = 1,
+    output_tokens: Mapping[str, int] | None = None,
+    seconds_per_call: Mapping[str, float] | None = None,
+) -> RunPlan:
+    """Build a :class:`RunPlan` without calling any LLM.
+
+    Prompts are rendered exactly as the services would send them and counted
+    locally. Where a prompt depends on an output that is not cached yet (the
+    PaperQA markdown fed to conversion), its size is estimated from
+    ``output_tokens``.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
+    loader = deps.dataset_loader
+    false_service = deps.false_service
+    paperqa_service = deps.paperqa_service
+    builder = deps.report_builder
+    if not loader or not false_service or not paperqa_service or not builder:
+        raise RuntimeError("CL validation services not configured.")
+    outputs = {**DEFAULT_OUTPUT_TOKENS, **(output_tokens or {})}
+    latencies = {**DEFAULT_SECONDS_PER_CALL, **(seconds_per_call or {})}
+    cell_model = getattr(deps.cell_agent, "model_name", None) or UNKNOWN_MODEL
+    paperqa_model = getattr(deps.paperqa_agent, "model_name", None) or UNKNOWN_MODEL
+    cell_system = estimate_tokens(CELL_SYSTEM_PROMPT, cell_model)
+    paperqa_system = estimate_tokens(PAPERQA_SYSTEM_PROMPT, paperqa_model)
+
+    definitions = loader.load_definitions()
+    false_cache = false_service.load_cache()
+    probability = deps.settings.false_assertion_probability
+    counts = {stage: {"cached": 0, "calls": 0, "tokens": 0} for stage in outputs}
+    for cell in definitions:
+        record = false_service.cached_record(false_cache, cell.cl_id)
+        if record:
+            counts["seed"]["cached"] += 1
+            definition = record.get("updated_definition") or record.get("false_assertion")
+            if definition:
+                cell = replace(cell, definition=str(definition))
+        else:
+            counts["seed"]["calls"] += 1
+            counts["seed"]["tokens"] += estimate_tokens(
+                FalseAssertionService.build_prompt(cell), cell_model
+            )
+
+        markdown = paperqa_service.cached_markdown(cell.cl_id)
+        paperqa_prompt = None if markdown is not None else paperqa_service.pending_prompt(cell)
+        if paperqa_prompt is None:
+            counts["paperqa"]["cached"] += 1
+        else:
+            counts["paperqa"]["calls"] += 1
+            counts["paperqa"]["tokens"] += paperqa_system + estimate_tokens(
+                paperqa_prompt, paperqa_model
+            )
+
+        # Tables assembled from cached assertion verdicts are converted locally.
+        if builder.has_cached_table(cell.cl_id) or paperqa_service.verdict_cache is not None:
+            counts["convert"]["cached"] += 1
+        else:
+            prompt_tokens = estimate_tokens(
+                ReportBuilder.build_conversion_prompt(markdown or ""), cell_model
+            )
+            if markdown is None:
+                prompt_tokens += outputs["paperqa"]
+            counts["convert"]["calls"] += 1
+            counts["convert"]["tokens"] += cell_system + prompt_tokens
+
+    prices = PriceTable.load(deps.settings.price_table_file)
+    models = {"seed": cell_model, "paperqa": paperqa_model, "convert": cell_model}
+    stages: list[StagePlan] = []
+    batch_size = deps.settings.false_assertion_batch_size
+    for stage, count in counts.items():
+        share = probability if stage == "seed" else 1.0
+        expected_calls = count["calls"] * share
+        input_tokens = count["tokens"] * share
+        if stage == "seed":
+            # Batched seeding sends the system prompt once per request of up to batch_size cells.
+            count["calls"] = math.ceil(count["calls"] / batch_size)
+            expected_calls /= batch_size
+            input_tokens += expected_calls * cell_system
+        totals = UsageTotals(
+            input_tokens=round(input_tokens),
+            output_tokens=round(expected_calls * outputs[stage]),
+        )
+        stages.append(
+            StagePlan(
+                stage=stage,
+                model=models[stage],
+                cells=len(definitions),
+                cached=count["cached"],
+                calls=count["calls"],
+                expected_calls=expected_calls,
+                input_tokens=totals.input_tokens,
+                output_tokens=totals.output_tokens,
+                cost_usd=prices.cost(models[stage], totals),
+                wall_seconds=expected_calls * latencies[stage] / concurrency,
+            )
+        )
+    return RunPlan(
+        cells=len(definitions),
+        concurrency=concurrency,
+        token_counter=token_counter_name(),
+        stages=stages,
+        token_budget=deps.settings.token_budget,
+        cost_budget_usd=deps.settings.cost_budget_usd,
+    )
+
+
+def format_plan(plan: RunPlan) -> str:
+    """Render ``plan`` as a fixed-width table for terminals."""
+    lines = [
+        f"{plan.cells} cells, concurrency {plan.concurrency}, tokens counted with "
+        f"{plan.token_counter}",
+        "",
+        f"{'stage':<9}{'model':<22}{'cached':>8}{'calls':>8}{'expected':>10}"
+        f"{'in tok':>11}{'out tok':>10}{'cost $':>10}{'wall':>10}",
+    ]
+    for stage in plan.stages:
+        cost = "n/a" if stage.cost_usd is None else f"{stage.cost_usd:.2f}"
+        lines.append(
+            f"{stage.stage:<9}{stage.model[:21]:<22}{stage.cached:>8}{stage.calls:>8}"
+            f"{stage.expected_calls:>10.1f}{stage.input_tokens:>11}{stage.output_tokens:>10}"
+            f"{cost:>10}{_duration(stage.wall_seconds):>10}"
+        )
+    lines.append("")
+    lines.append(
+        f"Total: {plan.calls} calls at most, ~{plan.tokens} tokens, ~${plan.cost_usd:.2f}, "
+        f"~{_duration(plan.wall_seconds)}"
+    )
+    if plan.token_budget is not None or plan.cost_budget_usd is not None:
+        verdict = "within" if plan.within_budget else "EXCEEDS"
+        lines.append(
+            f"Projection {verdict} budget (tokens {plan.token_budget}, cost {plan.cost_budget_usd})"
+        )
+    return "\n".join(lines)
+
+
+def _duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+__all__ = ["RunPlan", "StagePlan", "format_plan", "plan_cl_validation"]
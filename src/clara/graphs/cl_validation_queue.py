@@ -0,0 +1,248 @@
+"""Run the CL validation graph as per-cell jobs on a shared SQLite work queue."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import socket
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from ..services.false_assertion_service import FalseAssertionService
+from ..services.work_queue import QueueJob, WorkQueue
+from ..utils.async_io import run_io
+from ..utils.metrics import QUEUE_JOBS
+from ..utils.usage import BudgetExceededError, UsageLedger
+from ..utils.validation_models import CellTypeInfo
+from .cl_validation import ClValidationGraphDependencies
+
+logger = logging.getLogger(__name__)
+
+CellHandler = Callable[
+    [ClValidationGraphDependencies, WorkQueue, CellTypeInfo], Awaitable[CellTypeInfo]
+]
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_POLL_INTERVAL = 2.0
+QUEUE_SAMPLE_INTERVAL = 5.0
+
+
+def enqueue_cl_validation(deps: ClValidationGraphDependencies, queue: WorkQueue) -> int:
+    """Load curated definitions and enqueue them for the stages after the entrypoint."""
+    loader = deps.dataset_loader
+    if not loader:
+        raise RuntimeError("Dataset loader not configured.")
+    entry = deps.graph.route(deps.graph.entrypoint)
+    inserted = 0
+    for stage in entry.next_nodes:
+        # Definitions are streamed straight into the queue; nothing holds the full list.
+        jobs = ((cell.cl_id, cell.to_payload()) for cell in loader.iter_definitions())
+        inserted += queue.enqueue(stage, jobs)
+    logger.info("Enqueued %s jobs", inserted)
+    return inserted
+
+
+class QueueWorker:
+    """Claim per-cell jobs from the queue and run the matching workflow service.
+
+    Workers coordinate only through the queue, so any number of them can be
+    started or stopped while a run is in progress.
+    """
+
+    def __init__(
+        self,
+        deps: ClValidationGraphDependencies,
+        queue: WorkQueue,
+        *,
+        worker_id: str | None = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        stages: Iterable[str] | None = None,
+    ) -> None:
+        self.deps = deps
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        handled = [node.id for node in deps.graph.nodes if node.service in _CELL_HANDLERS]
+        self.stages = list(stages) if stages is not None else handled
+        self._sampled_at = 0.0
+
+    async def run(self, *, exit_when_idle: bool = True) -> int:
+        """Process jobs until the queue drains (or forever), returning the number handled.
+
+        Agent usage is recorded in ``deps.usage`` and the token/cost budget is
+        enforced per worker: once it is spent the job in hand goes back to the
+        queue and :class:`~clara.utils.usage.BudgetExceededError` propagates.
+        The worker's usage is written next to the run's usage files, suffixed
+        with its ID.
+        """
+        processed = 0
+        ledger = self.deps.usage or UsageLedger()
+        paths = self.deps.settings.paths
+        try:
+            with ledger.activate():
+                while True:
+                    await self._sample_queue_depth()
+                    if await self.run_once():
+                        processed += 1
+                        continue
+                    if exit_when_idle and not await run_io(self.queue.has_open_jobs):
+                        break
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            await run_io(
+                ledger.write,
+                _worker_path(paths.usage_summary_file, self.worker_id),
+                _worker_path(paths.usage_by_cell_file, self.worker_id),
+            )
+        await self._sample_queue_depth(force=True)
+        # Only the first worker to find the queue drained publishes the report.
+        if processed and await run_io(self.queue.claim_publication, self.worker_id):
+            await publish_queue_report(self.deps, self.queue)
+        return processed
+
+    async def run_once(self) -> bool:
+        """Claim and process a single job; returns False when nothing was claimable."""
+        job = await run_io(self.queue.claim, self.stages, self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        node = self.deps.graph.route(job.stage)
+        work = asyncio.create_task(self._handle(_CELL_HANDLERS[node.service], job))
+        heartbeat = asyncio.create_task(self._keep_lease(job, work))
+        try:
+            updated = await work
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise
+            # The heartbeat stopped the job: another worker owns it now.
+            return True
+        except BudgetExceededError:
+            await run_io(self.queue.release, job)
+            raise
+        except Exception as exc:
+            await run_io(self.queue.fail, job, f"{type(exc).__name__}: {exc}")
+            return True
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+        await run_io(self.queue.complete, job, node.next_nodes, updated.to_payload())
+        return True
+
+    async def _handle(self, handler: CellHandler, job: QueueJob) -> CellTypeInfo:
+        return await handler(self.deps, self.queue, CellTypeInfo.from_payload(job.payload))
+
+    async def _sample_queue_depth(self, *, force: bool = False) -> None:
+        """Refresh the queue-depth gauge, at most every ``QUEUE_SAMPLE_INTERVAL`` seconds."""
+        now = time.monotonic()
+        if not force and now - self._sampled_at < QUEUE_SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+        counts = await run_io(self.queue.counts)
+        QUEUE_JOBS.replace(
+            {
+                (stage, status): count
+                for stage, statuses in counts.items()
+                for status, count in statuses.items()
+            }
+        )
+
+    async def _keep_lease(self, job: QueueJob, work: asyncio.Task[CellTypeInfo]) -> None:
+        """Renew ``job``'s lease while ``work`` runs, cancelling ``work`` if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await run_io(self.queue.renew, job, self.lease_seconds):
+                logger.warning("Lost lease on %s/%s; stopping the job", job.cell_id, job.stage)
+                work.cancel()
+                return
+
+
+async def publish_queue_report(
+    deps: ClValidationGraphDependencies, queue: WorkQueue
+) -> Path | None:
+    """Write the TSV report once every job has settled; returns None while work remains.
+
+    Queue workers call this once per drained queue (see
+    :meth:`WorkQueue.claim_publication`), so the report is built by one
+    publisher at a time.
+    """
+    if await run_io(queue.has_open_jobs):
+        return None
+    paperqa_service = deps.paperqa_service
+    builder = deps.report_builder
+    if not paperqa_service or not builder:
+        raise RuntimeError("PaperQA service or report builder not configured.")
+    final_stages = [node.id for node in deps.graph.nodes if not node.next_nodes]
+    cells = [
+        CellTypeInfo.from_payload(payload)
+        for stage in final_stages
+        for payload in await run_io(queue.completed_payloads, stage)
+    ]
+    results = await paperqa_service.validate_cells(cells)
+    deps.report_path = await builder.build_report(results)
+    return deps.report_path
+
+
+async def _seed_cell(
+    deps: ClValidationGraphDependencies, queue: WorkQueue, cell: CellTypeInfo
+) -> CellTypeInfo:
+    service = deps.false_service
+    if not service:
+        raise RuntimeError("False assertion service not configured.")
+    cache = await run_io(service.load_cache)
+    known = len(cache)
+    updated = await service.seed_cell(cell, cache)
+    if len(cache) > known:
+        await run_io(_merge_locked, queue, service, cache[known:])
+    return updated
+
+
+async def _run_paperqa_cell(
+    deps: ClValidationGraphDependencies, queue: WorkQueue, cell: CellTypeInfo
+) -> CellTypeInfo:
+    service = deps.paperqa_service
+    if not service:
+        raise RuntimeError("PaperQA service not configured.")
+    await service.validate_cell(cell)
+    return cell
+
+
+async def _convert_report_cell(
+    deps: ClValidationGraphDependencies, queue: WorkQueue, cell: CellTypeInfo
+) -> CellTypeInfo:
+    paperqa_service = deps.paperqa_service
+    builder = deps.report_builder
+    if not paperqa_service or not builder:
+        raise RuntimeError("PaperQA service or report builder not configured.")
+    result = await paperqa_service.validate_cell(cell)
+    await builder.build_rows(result)
+    return cell
+
+
+def _merge_locked(
+    queue: WorkQueue, service: FalseAssertionService, records: list[dict[str, Any]]
+) -> None:
+    """Merge new false-assertion cache records while holding the queue's write lock."""
+    with queue.exclusive():
+        service.merge_cache(records)
+
+
+def _worker_path(path: Path, worker_id: str) -> Path:
+    suffix = re.sub(r"[^\w.-]", "-", worker_id)
+    return path.with_name(f"{path.stem}.{suffix}{path.suffix}")
+
+
+_CELL_HANDLERS: dict[str, CellHandler] = {
+    "cl.validation.seed_false_assertions": _seed_cell,
+    "cl.validation.run_paperqa": _run_paperqa_cell,
+    "cl.validation.generate_report": _convert_report_cell,
+}
+
+
+__all__ = ["QueueWorker", "enqueue_cl_validation", "publish_queue_report"]
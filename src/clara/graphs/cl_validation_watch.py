@@ -0,0 +1,202 @@
+"""Watch curated inputs and revalidate only the CL terms affected by each edit."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..services.dataset_loader import iter_dataset_entries
+from ..utils.async_io import run_io
+from ..utils.usage import BudgetExceededError, UsageLedger
+from .cl_validation import (
+    ClValidationGraphDependencies,
+    build_cl_validation_graph,
+    iter_cell_validations,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+
+FileStamp = tuple[int, int]
+
+
+@dataclass
+class AffectedCells:
+    """CL IDs touched by a batch of file changes, grouped by what changed."""
+
+    definitions: set[str] = field(default_factory=set)
+    references: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    # Dataset fingerprints to adopt once the batch has been applied.
+    fingerprints: dict[str, str] | None = field(default=None, repr=False)
+
+    def __bool__(self) -> bool:
+        return bool(self.definitions or self.references or self.removed)
+
+
+class CurationWatcher:
+    """Poll ``cells_data.json`` and ``reference/`` and push affected terms through the pipeline.
+
+    Changes are debounced: a batch is processed only once the watched files
+    have been quiet for ``debounce_seconds``. Dataset edits are diffed entry by
+    entry, and reference files map to the CL ID of their packet directory, so
+    only the terms that actually changed are revalidated and rewritten in the
+    report.
+    """
+
+    def __init__(
+        self,
+        deps: ClValidationGraphDependencies | None = None,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ) -> None:
+        self.deps = deps or ClValidationGraphDependencies(graph=build_cl_validation_graph())
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self._stamps: dict[Path, FileStamp] = {}
+        self._fingerprints: dict[str, str] = {}
+
+    def prime(self) -> None:
+        """Record the current state of the watched paths as the baseline."""
+        self._stamps = self._scan()
+        self._fingerprints = self._dataset_fingerprints()
+
+    def detect(self) -> set[Path]:
+        """Return paths created, modified or deleted since the last scan."""
+        current = self._scan()
+        changed = {
+            path
+            for path in current.keys() | self._stamps.keys()
+            if current.get(path) != self._stamps.get(path)
+        }
+        self._stamps = current
+        return changed
+
+    def affected_cells(self, paths: set[Path]) -> AffectedCells:
+        """Map changed paths to the CL IDs whose inputs changed.
+
+        The dataset baseline only moves on once :meth:`apply` succeeds, so a
+        failed batch is detected again when it is retried.
+        """
+        paths_cfg = self.deps.settings.paths
+        affected = AffectedCells()
+        if paths_cfg.dataset_file in paths:
+            fingerprints = self._dataset_fingerprints()
+            for cell_id, digest in fingerprints.items():
+                if self._fingerprints.get(cell_id) != digest:
+                    affected.definitions.add(cell_id)
+            affected.removed = set(self._fingerprints) - set(fingerprints)
+            affected.fingerprints = fingerprints
+        for path in paths:
+            try:
+                relative = path.relative_to(paths_cfg.references_dir)
+            except ValueError:
+                continue
+            if len(relative.parts) > 1:
+                affected.references.add(relative.parts[0])
+        return affected
+
+    async def apply(self, affected: AffectedCells) -> set[str]:
+        """Invalidate stale caches, revalidate affected cells and update the report."""
+        deps = self.deps
+        loader = deps.dataset_loader
+        false_service = deps.false_service
+        paperqa_service = deps.paperqa_service
+        builder = deps.report_builder
+        if not loader or not false_service or not paperqa_service or not builder:
+            raise RuntimeError("CL validation services not configured.")
+        await run_io(false_service.invalidate, affected.definitions | affected.removed)
+        stale = affected.definitions | affected.references | affected.removed
+        for cell_id in stale:
+            await run_io(paperqa_service.invalidate, cell_id)
+            await run_io(builder.invalidate, cell_id)
+        index = await run_io(loader.load_index)
+        selected = stale & index.keys()
+        if deps.settings.is_test_mode:
+            selected &= set(deps.settings.test_terms)
+        rows_by_cell: dict[str, list[dict[str, str]]] = {}
+        cells = [index[cell_id] for cell_id in sorted(selected)]
+        ledger = deps.usage or UsageLedger()
+        paths = deps.settings.paths
+        try:
+            with ledger.activate():
+                async for cell, rows in iter_cell_validations(deps, cells):
+                    rows_by_cell[cell.cl_id] = rows
+        finally:
+            await run_io(ledger.write, paths.usage_summary_file, paths.usage_by_cell_file)
+        # Cells that vanished or lost their references drop out of the report.
+        await run_io(builder.update_report, rows_by_cell, removed=stale - selected)
+        if affected.fingerprints is not None:
+            self._fingerprints = affected.fingerprints
+        logger.info("Revalidated %s cells after curation changes", len(rows_by_cell))
+        return set(rows_by_cell)
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Watch until ``stop`` is set, processing each debounced batch of changes.
+
+        Usage accumulates in ``deps.usage`` across batches; once the token/cost
+        budget is spent, :class:`~clara.utils.usage.BudgetExceededError` stops
+        the watch.
+        """
+        stop = stop or asyncio.Event()
+        self.prime()
+        pending: set[Path] = set()
+        quiet_since: float | None = None
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            changed = self.detect()
+            now = loop.time()
+            if changed:
+                pending |= changed
+                quiet_since = now
+            elif pending and quiet_since is not None and now - quiet_since >= self.debounce_seconds:
+                try:
+                    affected = self.affected_cells(pending)
+                    if affected:
+                        await self.apply(affected)
+                except BudgetExceededError:
+                    raise
+                except Exception:
+                    # Keep the batch; it is retried after another quiet period.
+                    logger.exception("Revalidation failed; retrying the batch")
+                    quiet_since = loop.time()
+                else:
+                    pending, quiet_since = set(), None
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+
+    def _scan(self) -> dict[Path, FileStamp]:
+        paths_cfg = self.deps.settings.paths
+        candidates = [paths_cfg.dataset_file]
+        if paths_cfg.references_dir.exists():
+            candidates.extend(p for p in paths_cfg.references_dir.rglob("*") if p.is_file())
+        stamps: dict[Path, FileStamp] = {}
+        for path in candidates:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _dataset_fingerprints(self) -> dict[str, str]:
+        dataset_file = self.deps.settings.paths.dataset_file
+        if not dataset_file.exists():
+            return {}
+        return {
+            str(entry["cell_id"]): hashlib.sha256(
+                json.dumps(entry, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            for entry in iter_dataset_entries(dataset_file)
+        }
+
+
+__all__ = ["AffectedCells", "CurationWatcher"]
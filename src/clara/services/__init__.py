@@ -2,17 +2,46 @@
 
 from __future__ import annotations
 
-from .agent_adapters import AsyncAgentRunner, CellAgentAdapter
+from .agent_adapters import AsyncAgentRunner, CellAgentAdapter, LazyAgent, ModelCascade
+from .assertion_cache import AssertionVerdictCache, split_assertions
+from .batch_jobs import (
+    BatchClient,
+    BatchJobError,
+    BulkBatchRunner,
+    LocalBatchClient,
+    OpenAIBatchClient,
+)
+from .cassette import Cassette, CassetteMissError, RecordingAgent, ReplayAgent, cassette_agents
 from .dataset_loader import CellDatasetLoader
 from .false_assertion_service import FalseAssertionService
 from .paperqa_service import PaperQAService
+from .prompt_templates import PROMPT_TEMPLATES, PromptTemplate
 from .report_service import ReportBuilder
+from .work_queue import QueueJob, WorkQueue
 
 __all__ = [
     "AsyncAgentRunner",
     "CellAgentAdapter",
+    "LazyAgent",
+    "ModelCascade",
+    "AssertionVerdictCache",
+    "split_assertions",
+    "BatchClient",
+    "BatchJobError",
+    "BulkBatchRunner",
+    "LocalBatchClient",
+    "OpenAIBatchClient",
+    "Cassette",
+    "CassetteMissError",
+    "RecordingAgent",
+    "ReplayAgent",
+    "cassette_agents",
     "CellDatasetLoader",
     "FalseAssertionService",
     "PaperQAService",
+    "PROMPT_TEMPLATES",
+    "PromptTemplate",
     "ReportBuilder",
+    "QueueJob",
+    "WorkQueue",
 ]
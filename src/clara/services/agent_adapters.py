@@ -2,9 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Protocol
+import contextlib
+import logging
+import time
+from collections.abc import AsyncGenerator, Callable, Sequence
+from typing import Any, Protocol
 
 from ..agents import CellValidationAgent, build_cell_validation_agent
+from ..utils.metrics import (
+    AGENT_CALL_ERRORS,
+    AGENT_CALL_SECONDS,
+    AGENT_CALLS_IN_FLIGHT,
+    AGENT_INPUT_TOKENS,
+    AGENT_STREAM_ABORTS,
+    MODEL_ROUTING,
+)
+from ..utils.streaming import MalformedResponseError
+from ..utils.tracing import trace_span
+from ..utils.usage import (
+    BudgetExceededError,
+    check_budget,
+    record_route,
+    record_usage,
+    split_usage,
+)
+from .prompt_templates import PromptTemplate
+
+logger = logging.getLogger(__name__)
 
 
 class AsyncAgentRunner(Protocol):
@@ -14,15 +38,292 @@ class AsyncAgentRunner(Protocol):
         """Execute the given prompt and return the textual output."""
 
 
+class StreamingAgentRunner(AsyncAgentRunner, Protocol):
+    """Agent that can also yield its output incrementally."""
+
+    def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Yield the output text in deltas as it is produced."""
+
+
 class CellAgentAdapter:
     """Adapter around the configured cell validation agent."""
 
     def __init__(self, agent: CellValidationAgent | None = None) -> None:
         self._agent = agent or build_cell_validation_agent()
 
+    @property
+    def model_name(self) -> str | None:
+        """Identifier of the wrapped agent's LLM, if it exposes one."""
+        return getattr(self._agent, "model_name", None)
+
+    @property
+    def last_usage(self) -> dict[str, int]:
+        """Token usage reported by the most recent call, if the agent exposes it."""
+        return dict(getattr(self._agent, "last_usage", None) or {})
+
     async def run(self, prompt: str) -> str:
         """Execute the prompt with the cell validation agent."""
         return await self._agent.run(prompt)
 
+    def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream the prompt's output from the cell validation agent."""
+        return stream_text(self._agent, prompt)
+
+
+class LazyAgent:
+    """Proxy that constructs its agent on the first call.
+
+    Fully cached runs never call an agent, so they never pay for building one.
+    ``model_name`` may be given as a callable so cost planning can name the
+    model without constructing the agent.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], AsyncAgentRunner],
+        *,
+        model_name: Callable[[], str | None] | None = None,
+    ) -> None:
+        self._factory = factory
+        self._model_name = model_name
+        self._agent: AsyncAgentRunner | None = None
+
+    @property
+    def built(self) -> bool:
+        """Whether the underlying agent has been constructed."""
+        return self._agent is not None
+
+    @property
+    def agent(self) -> AsyncAgentRunner:
+        """The underlying agent, constructed on first access."""
+        if self._agent is None:
+            self._agent = self._factory()
+        return self._agent
+
+    @property
+    def model_name(self) -> str | None:
+        if self._agent is not None:
+            return getattr(self._agent, "model_name", None)
+        return self._model_name() if self._model_name else None
+
+    @property
+    def last_usage(self) -> dict[str, int]:
+        return dict(getattr(self._agent, "last_usage", None) or {})
+
+    async def run(self, prompt: str) -> str:
+        """Build the agent if needed and execute the prompt."""
+        return await self.agent.run(prompt)
+
+    def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Build the agent if needed and stream the prompt's output."""
+        return stream_text(self.agent, prompt)
+
+
+class ModelCascade:
+    """Agents tried cheapest first; :func:`run_agent` escalates on a rejected response.
+
+    ``tiers`` are ordered from the cheapest model to the strongest, which is
+    the stage's normally configured agent. Routing needs the caller's output
+    check, so calling :meth:`run` directly uses the final tier only.
+    """
+
+    def __init__(self, tiers: Sequence[AsyncAgentRunner]) -> None:
+        if not tiers:
+            raise ValueError("A model cascade needs at least one agent.")
+        self.tiers = list(tiers)
+
+    @property
+    def final(self) -> AsyncAgentRunner:
+        """The strongest tier, whose response is used without a check."""
+        return self.tiers[-1]
+
+    @property
+    def model_name(self) -> str | None:
+        return getattr(self.final, "model_name", None)
+
+    @property
+    def last_usage(self) -> dict[str, int]:
+        return dict(getattr(self.final, "last_usage", None) or {})
+
+    async def run(self, prompt: str) -> str:
+        """Execute the prompt with the final tier."""
+        return await self.final.run(prompt)
+
+
+def cascade(
+    agent: AsyncAgentRunner, models: Sequence[str], factory: Callable[[str], AsyncAgentRunner]
+) -> AsyncAgentRunner:
+    """Put agents for the cheaper ``models`` (built by ``factory``) in front of ``agent``."""
+    if not models:
+        return agent
+    return ModelCascade([*(factory(model) for model in models), agent])
+
+
+async def stream_text(agent: AsyncAgentRunner, prompt: str) -> AsyncGenerator[str, None]:
+    """Yield ``agent``'s output in deltas, or in one piece if it cannot stream."""
+    run_stream = getattr(agent, "run_stream", None)
+    if run_stream is None:
+        yield await agent.run(prompt)
+        return
+    async with contextlib.aclosing(run_stream(prompt)) as deltas:
+        async for delta in deltas:
+            yield delta
+
+
+async def run_agent(
+    agent: AsyncAgentRunner,
+    prompt: str,
+    *,
+    stage: str,
+    cell_id: str | Sequence[str],
+    template: PromptTemplate | None = None,
+    on_text: Callable[[str], Any] | None = None,
+    validate: Callable[[str], object] | None = None,
+) -> str:
+    """Run ``prompt`` on ``agent``, tracing the call and attributing its token usage.
+
+    For a prompt covering several cells, pass their IDs as ``cell_id``; the
+    usage is then split evenly between them. ``template`` names the prompt
+    template (and version) the prompt was rendered from; it is recorded with
+    the call, and cached input tokens are counted per stage.
+
+    With ``on_text``, the response is streamed and every delta is passed to
+    it as it arrives (agents that cannot stream deliver one delta). If
+    ``on_text`` raises :class:`~clara.utils.streaming.MalformedResponseError`,
+    the stream is abandoned and the error propagates; the partial usage is
+    still recorded.
+
+    When ``agent`` is a :class:`ModelCascade`, each cheaper tier's response
+    is passed to ``validate``; if the tier fails or ``validate`` raises
+    ``ValueError`` the call escalates to the next tier. Cheaper tiers are not
+    streamed: an accepted response reaches ``on_text`` as a single delta,
+    and only the final tier streams. Every tier is traced and billed as its
+    own call, and its outcome is recorded for the run's routing summary.
+
+    Raises :class:`~clara.utils.usage.BudgetExceededError` instead of starting
+    the call when the run's token or cost budget is already spent.
+    """
+    cell_ids = [cell_id] if isinstance(cell_id, str) else list(cell_id)
+    template_id = template.id if template else None
+    if not isinstance(agent, ModelCascade):
+        return await _run_tier(agent, prompt, stage, cell_ids, template_id, on_text)
+    final_model = agent.model_name
+    for tier in agent.tiers[:-1]:
+        model = getattr(tier, "model_name", None)
+        try:
+            response = await _run_tier(tier, prompt, stage, cell_ids, template_id, None)
+            if validate is not None:
+                validate(response)
+        except BudgetExceededError:
+            raise
+        except Exception as exc:
+            logger.info("Escalating %s call past %s: %s", stage, model, exc)
+            _record_route(tier, stage, final_model, accepted=False)
+            continue
+        _record_route(tier, stage, final_model, accepted=True)
+        if on_text is not None:
+            on_text(response)
+        return response
+    response = await _run_tier(agent.final, prompt, stage, cell_ids, template_id, on_text)
+    _record_route(agent.final, stage, final_model, accepted=True)
+    return response
+
+
+async def _run_tier(
+    agent: AsyncAgentRunner,
+    prompt: str,
+    stage: str,
+    cell_ids: Sequence[str],
+    template_id: str | None,
+    on_text: Callable[[str], Any] | None,
+) -> str:
+    check_budget()
+    attributes = {"prompt_template": template_id} if template_id else {}
+    label = ",".join(cell_ids)
+    with trace_span(
+        f"llm.{stage}", "llm", cell_id=label, prompt_chars=len(prompt), **attributes
+    ) as span:
+        AGENT_CALLS_IN_FLIGHT.inc(stage=stage)
+        started = time.perf_counter()
+        try:
+            if on_text is None:
+                response = await agent.run(prompt)
+            else:
+                response = await _consume_stream(agent, prompt, on_text, span, started)
+        except MalformedResponseError:
+            AGENT_STREAM_ABORTS.inc(stage=stage)
+            span.set(aborted=True)
+            _record_call(agent, stage, cell_ids, template_id, span, started)
+            raise
+        except Exception:
+            AGENT_CALL_ERRORS.inc(stage=stage)
+            raise
+        finally:
+            AGENT_CALLS_IN_FLIGHT.dec(stage=stage)
+        span.set(response_chars=len(response))
+        _record_call(agent, stage, cell_ids, template_id, span, started)
+    return response
+
+
+async def _consume_stream(
+    agent: AsyncAgentRunner,
+    prompt: str,
+    on_text: Callable[[str], Any],
+    span: Any,
+    started: float,
+) -> str:
+    parts: list[str] = []
+    async with contextlib.aclosing(stream_text(agent, prompt)) as deltas:
+        async for delta in deltas:
+            if not parts:
+                span.set(streamed=True, first_token_ms=(time.perf_counter() - started) * 1000)
+            parts.append(delta)
+            on_text(delta)
+    return "".join(parts)
+
+
+def _record_route(
+    agent: AsyncAgentRunner, stage: str, final_model: str | None, *, accepted: bool
+) -> None:
+    model = getattr(agent, "model_name", None)
+    MODEL_ROUTING.inc(
+        stage=stage, model=model or "unknown", outcome="accepted" if accepted else "escalated"
+    )
+    record_route(
+        stage=stage,
+        model=model,
+        final_model=final_model,
+        usage=getattr(agent, "last_usage", None) or {},
+        accepted=accepted,
+    )
+
+
+def _record_call(
+    agent: AsyncAgentRunner,
+    stage: str,
+    cell_ids: Sequence[str],
+    template_id: str | None,
+    span: Any,
+    started: float,
+) -> None:
+    usage = getattr(agent, "last_usage", None) or {}
+    model = getattr(agent, "model_name", None)
+    span.set(model=model, **usage)
+    AGENT_CALL_SECONDS.observe(time.perf_counter() - started, stage=stage, model=model or "unknown")
+    cached = usage.get("cache_read_tokens", 0)
+    AGENT_INPUT_TOKENS.inc(cached, stage=stage, cache="hit")
+    AGENT_INPUT_TOKENS.inc(max(0, usage.get("input_tokens", 0) - cached), stage=stage, cache="miss")
+    for owner, share in zip(cell_ids, split_usage(usage, len(cell_ids)), strict=True):
+        record_usage(cell_id=owner, stage=stage, model=model, usage=share, template=template_id)
+
 
-__all__ = ["AsyncAgentRunner", "CellAgentAdapter"]
+__all__ = [
+    "AsyncAgentRunner",
+    "CellAgentAdapter",
+    "LazyAgent",
+    "ModelCascade",
+    "StreamingAgentRunner",
+    "cascade",
+    "run_agent",
+    "stream_text",
+]
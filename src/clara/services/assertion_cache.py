@@ -0,0 +1,224 @@
+"""Assertion-level PaperQA verdict cache keyed on normalised assertion text."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..utils.io_utils import dumps_json, iter_jsonl
+from ..utils.streaming import MarkdownTableParser
+from ..utils.tracing import trace_span
+from ..utils.validation_models import CellTypeInfo
+
+VERDICT_TABLE_HEADER = ("Assertion", "Validated", "Evidence", "References")
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.;!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(slots=True)
+class AssertionVerdict:
+    """PaperQA's verdict on one atomic assertion, judged against one reference set."""
+
+    assertion: str
+    validated: bool
+    evidence: str = ""
+    references: str = ""
+
+    def to_entry(self) -> dict[str, Any]:
+        """Return the verdict as a converted-table entry, as table conversion would."""
+        return {
+            "assertion": self.assertion,
+            "validated": self.validated,
+            "summary_text": self.evidence,
+            "references": self.references,
+        }
+
+    def to_row(self) -> dict[str, str]:
+        """Return the verdict as a markdown table row keyed by :data:`VERDICT_TABLE_HEADER`."""
+        values = (self.assertion, str(self.validated), self.evidence, self.references)
+        return dict(zip(VERDICT_TABLE_HEADER, values, strict=True))
+
+
+class AssertionVerdictCache:
+    """Verdicts keyed on ``(reference-set hash, normalised assertion)``.
+
+    The reference-set hash covers the reference IDs and the packet's file
+    contents (see :func:`reference_set_hash`).
+
+    Records are appended to a JSON-lines file, so concurrent cells only ever
+    add lines; when a key repeats, the last record wins. The file is read on
+    first use.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._verdicts: dict[tuple[str, str], AssertionVerdict] | None = None
+        self._pending: list[dict[str, Any]] = []
+
+    def load(self) -> dict[tuple[str, str], AssertionVerdict]:
+        """Return the cached verdicts, reading the cache file on first use."""
+        if self._verdicts is None:
+            self._verdicts = self._read()
+        return self._verdicts
+
+    def _read(self) -> dict[tuple[str, str], AssertionVerdict]:
+        verdicts: dict[tuple[str, str], AssertionVerdict] = {}
+        if self.path.exists():
+            with trace_span("cache.read", "cache", cache="assertion_verdicts"):
+                for record in iter_jsonl(self.path):
+                    verdicts[(record["references_hash"], record["key"])] = AssertionVerdict(
+                        assertion=str(record["assertion"]),
+                        validated=bool(record["validated"]),
+                        evidence=str(record.get("evidence", "")),
+                        references=str(record.get("references", "")),
+                    )
+        return verdicts
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def get(self, assertion: str, references_hash: str) -> AssertionVerdict | None:
+        """Return the cached verdict for ``assertion`` against the hashed reference set."""
+        return self.load().get((references_hash, normalize_assertion(assertion)))
+
+    def put(self, verdict: AssertionVerdict, references_hash: str) -> None:
+        """Cache ``verdict``; it is written to disk by the next :meth:`flush`."""
+        key = normalize_assertion(verdict.assertion)
+        self.load()[(references_hash, key)] = verdict
+        self._pending.append(
+            {
+                "key": key,
+                "references_hash": references_hash,
+                "assertion": verdict.assertion,
+                "validated": verdict.validated,
+                "evidence": verdict.evidence,
+                "references": verdict.references,
+            }
+        )
+
+    def flush(self) -> None:
+        """Append the verdicts added since the last flush to the cache file."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with trace_span("cache.write", "cache", cache="assertion_verdicts", records=len(pending)):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as handle:
+                handle.write(b"".join(dumps_json(record) + b"\n" for record in pending))
+
+
+def split_assertions(cell: CellTypeInfo) -> list[str]:
+    """Split ``cell``'s definition and logical axioms into atomic assertions, locally.
+
+    Each definition sentence or ``;``-separated clause and each ``.``-separated
+    logical axiom becomes one assertion; repeats (after normalisation) are dropped.
+    """
+    parts = [*_SENTENCE_BREAK.split(cell.definition), *cell.logical_axioms.split(".")]
+    assertions: dict[str, str] = {}
+    for part in parts:
+        text = part.strip().rstrip(".;").strip()
+        if text:
+            assertions.setdefault(normalize_assertion(text), text)
+    return list(assertions.values())
+
+
+def normalize_assertion(text: str) -> str:
+    """Return the cache key form of ``text``: case-folded, single-spaced, unpunctuated ends."""
+    return _WHITESPACE.sub(" ", text).strip(" .;:!?\"'").casefold()
+
+
+def reference_set_hash(references: str, packet_dir: Path | None = None) -> str:
+    """Hash a comma-separated reference list, ignoring order, repeats and whitespace.
+
+    With ``packet_dir``, the name and contents of every file in the reference
+    packet are hashed too, so editing a reference file changes the key and
+    verdicts judged against the old text are no longer used.
+    """
+    refs = sorted({ref.strip() for ref in references.split(",") if ref.strip()})
+    digest = hashlib.sha256("\n".join(refs).encode())
+    if packet_dir is not None and packet_dir.is_dir():
+        for path in sorted(p for p in packet_dir.rglob("*") if p.is_file()):
+            digest.update(b"\0" + path.relative_to(packet_dir).as_posix().encode() + b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()[:16]
+
+
+def parse_verdict_table(markdown: str) -> list[AssertionVerdict]:
+    """Parse a markdown assertion table, raising ``ValueError`` unless every row has a verdict."""
+    parser = MarkdownTableParser()
+    rows = parser.feed(markdown) + parser.close()
+    if not rows:
+        raise ValueError("Response has no assertion table.")
+    verdicts: list[AssertionVerdict] = []
+    for row in rows:
+        assertion = row.get("Assertion", "")
+        if not assertion:
+            raise ValueError("Assertion table row has no assertion.")
+        verdict = row.get("Validated", "").strip("*` ").lower()
+        if verdict not in {"true", "false"}:
+            raise ValueError(f"Assertion {assertion!r} has no True/False verdict.")
+        verdicts.append(
+            AssertionVerdict(
+                assertion=assertion,
+                validated=verdict == "true",
+                evidence=row.get("Evidence", ""),
+                references=row.get("References", ""),
+            )
+        )
+    return verdicts
+
+
+def match_verdicts(
+    requested: Sequence[str], verdicts: Sequence[AssertionVerdict]
+) -> dict[str, AssertionVerdict]:
+    """Map each ``requested`` assertion to its verdict, keeping the requested wording.
+
+    Rows are matched on normalised text; if the model reworded them but
+    answered every assertion, they are matched by position instead.
+    """
+    by_key = {normalize_assertion(verdict.assertion): verdict for verdict in verdicts}
+    matched = {
+        text: by_key[key] for text in requested if (key := normalize_assertion(text)) in by_key
+    }
+    if len(matched) < len(requested) and len(verdicts) == len(requested):
+        matched = dict(zip(requested, verdicts, strict=True))
+    missing = [text for text in requested if text not in matched]
+    if missing:
+        raise ValueError(f"No verdict returned for {len(missing)} assertions: {missing[:3]}")
+    return {
+        text: AssertionVerdict(text, verdict.validated, verdict.evidence, verdict.references)
+        for text, verdict in matched.items()
+    }
+
+
+def render_verdict_table(verdicts: Iterable[AssertionVerdict]) -> str:
+    """Render ``verdicts`` as a markdown table that :func:`parse_verdict_table` reads back."""
+    lines = [
+        "| " + " | ".join(VERDICT_TABLE_HEADER) + " |",
+        "| " + " | ".join("---" for _ in VERDICT_TABLE_HEADER) + " |",
+    ]
+    for verdict in verdicts:
+        cells = (_table_cell(value) for value in verdict.to_row().values())
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def _table_cell(value: str) -> str:
+    return " ".join(value.replace("|", "/").split())
+
+
+__all__ = [
+    "AssertionVerdict",
+    "AssertionVerdictCache",
+    "match_verdicts",
+    "normalize_assertion",
+    "parse_verdict_table",
+    "reference_set_hash",
+    "render_verdict_table",
+    "split_assertions",
+]
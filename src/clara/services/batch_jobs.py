@@ -0,0 +1,405 @@
+"""Offline bulk-batch submission of PaperQA and conversion prompts.
+
+Uncached prompts are written to a provider batch file (OpenAI Batch API JSONL),
+submitted through a :class:`BatchClient`, polled until the job finishes and the
+responses are ingested into the same per-cell caches the live agents fill.
+Graph stages then run from cache as usual; any cell whose batch request failed
+simply falls back to a live agent call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from ..utils import ValidationSettings
+from ..utils.async_io import run_io
+from ..utils.io_utils import dumps_json, iter_jsonl
+from ..utils.tracing import trace_span
+from ..utils.usage import UNKNOWN_MODEL, batch_model, check_budget, record_usage
+from ..utils.validation_models import CellTypeInfo
+from .agent_adapters import AsyncAgentRunner
+from .paperqa_service import PaperQAService
+from .prompt_templates import CONVERT_TEMPLATE
+from .report_service import ReportBuilder
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_STAGES = ("paperqa", "convert")
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchJobError(RuntimeError):
+    """Raised when a batch job ends without a usable output file."""
+
+
+class BatchClient(Protocol):
+    """Provider-neutral interface for submitting and collecting batch jobs."""
+
+    async def submit(self, input_path: Path) -> str:
+        """Upload ``input_path`` and start a batch job; return its identifier."""
+
+    async def status(self, job_id: str) -> str:
+        """Return the job status (``completed``, ``failed``, ``in_progress``, ...)."""
+
+    async def download(self, job_id: str, destination: Path) -> Path:
+        """Write the job's output JSONL to ``destination`` and return it."""
+
+
+@dataclass(slots=True)
+class BatchRequest:
+    """One chat-completion request in a batch file."""
+
+    stage: str
+    cell_id: str
+    model: str
+    system_prompt: str
+    prompt: str
+
+    @property
+    def custom_id(self) -> str:
+        return f"{self.stage}:{self.cell_id}"
+
+    def to_line(self) -> dict[str, Any]:
+        return {
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": self.prompt},
+                ],
+            },
+        }
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """The response (or error) recorded for one request of a finished job."""
+
+    custom_id: str
+    content: str | None = None
+    error: str | None = None
+    usage: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_line(cls, payload: Mapping[str, Any]) -> BatchResult:
+        custom_id = str(payload["custom_id"])
+        response = payload.get("response") or {}
+        error = payload.get("error")
+        if error or response.get("status_code", 200) != 200:
+            message = (error or {}).get("message") or f"HTTP {response.get('status_code')}"
+            return cls(custom_id, error=str(message))
+        body = response.get("body") or {}
+        try:
+            content = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            return cls(custom_id, error="Response has no message content.")
+        return cls(custom_id, content=str(content), usage=_usage_from_body(body))
+
+
+def write_batch_file(path: Path, requests: Iterable[BatchRequest]) -> int:
+    """Write ``requests`` as batch JSONL to ``path`` and return how many were written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("wb") as handle:
+        for request in requests:
+            handle.write(dumps_json(request.to_line()) + b"\n")
+            count += 1
+    return count
+
+
+def read_batch_results(path: Path) -> dict[str, BatchResult]:
+    """Parse a batch output JSONL file into results keyed by ``custom_id``."""
+    return {result.custom_id: result for result in iter_jsonl(path, into=BatchResult.from_line)}
+
+
+class LocalBatchClient:
+    """File-based stand-in for a provider batch API.
+
+    Submitted files are copied into ``directory`` and answered in the
+    background by the agent registered for each request's stage, producing
+    an output file in the provider's format.
+    """
+
+    def __init__(self, directory: Path, agents: Mapping[str, AsyncAgentRunner]) -> None:
+        self.directory = directory
+        self.agents = dict(agents)
+        self._jobs: dict[str, asyncio.Task[None]] = {}
+
+    async def submit(self, input_path: Path) -> str:
+        job_id = f"batch_{uuid.uuid4().hex[:12]}"
+        job_input = self._path(job_id, "input")
+        await run_io(job_input.parent.mkdir, parents=True, exist_ok=True)
+        await run_io(shutil.copyfile, input_path, job_input)
+        self._jobs[job_id] = asyncio.create_task(self._process(job_id))
+        return job_id
+
+    async def status(self, job_id: str) -> str:
+        task = self._jobs.get(job_id)
+        if task is None:
+            raise KeyError(f"Unknown batch job '{job_id}'.")
+        if not task.done():
+            return "in_progress"
+        return "failed" if task.exception() else "completed"
+
+    async def download(self, job_id: str, destination: Path) -> Path:
+        await run_io(shutil.copyfile, self._path(job_id, "output"), destination)
+        return destination
+
+    async def _process(self, job_id: str) -> None:
+        lines: list[bytes] = []
+        for payload in await run_io(lambda: list(iter_jsonl(self._path(job_id, "input")))):
+            lines.append(dumps_json(await self._answer(payload)) + b"\n")
+        await run_io(self._path(job_id, "output").write_bytes, b"".join(lines))
+
+    async def _answer(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        custom_id = payload["custom_id"]
+        agent = self.agents.get(custom_id.split(":", 1)[0])
+        if agent is None:
+            return _error_line(custom_id, "No agent registered for this stage.")
+        try:
+            content = await agent.run(payload["body"]["messages"][-1]["content"])
+        except Exception as exc:  # reported per request, as a provider would
+            return _error_line(custom_id, str(exc))
+        usage = dict(getattr(agent, "last_usage", None) or {})
+        return {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [{"message": {"role": "assistant", "content": content}}],
+                    "usage": {
+                        "prompt_tokens": usage.get("input_tokens", 0),
+                        "completion_tokens": usage.get("output_tokens", 0),
+                        "prompt_tokens_details": {
+                            "cached_tokens": usage.get("cache_read_tokens", 0)
+                        },
+                    },
+                },
+            },
+            "error": None,
+        }
+
+    def _path(self, job_id: str, kind: str) -> Path:
+        return self.directory / job_id / f"{kind}.jsonl"
+
+
+class OpenAIBatchClient:
+    """Submit batch files to the OpenAI Batch API (requires the ``openai`` package)."""
+
+    def __init__(self, client: Any | None = None, *, completion_window: str = "24h") -> None:
+        if client is None:
+            try:
+                import openai  # type: ignore[import-not-found]
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError("Batch mode requires openai; install clara[batch].") from exc
+            client = openai.AsyncOpenAI()
+        self.client = client
+        self.completion_window = completion_window
+
+    async def submit(self, input_path: Path) -> str:
+        with input_path.open("rb") as handle:
+            uploaded = await self.client.files.create(file=handle, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return str(batch.id)
+
+    async def status(self, job_id: str) -> str:
+        batch = await self.client.batches.retrieve(job_id)
+        return str(batch.status)
+
+    async def download(self, job_id: str, destination: Path) -> Path:
+        batch = await self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            raise BatchJobError(f"Batch job {job_id} has no output file.")
+        content = await self.client.files.content(batch.output_file_id)
+        await run_io(destination.write_bytes, content.read())
+        return destination
+
+
+async def run_batch_job(
+    client: BatchClient,
+    requests: Sequence[BatchRequest],
+    workdir: Path,
+    *,
+    poll_seconds: float,
+) -> dict[str, BatchResult]:
+    """Submit ``requests`` as one job, wait for it to finish and return its results."""
+    input_path = workdir / f"{requests[0].stage}.input.jsonl"
+    await run_io(write_batch_file, input_path, requests)
+    job_id = await client.submit(input_path)
+    logger.info("Submitted batch job %s with %s requests", job_id, len(requests))
+    while (status := await client.status(job_id)) not in BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(poll_seconds)
+    if status != "completed":
+        raise BatchJobError(f"Batch job {job_id} ended with status '{status}'.")
+    output_path = await client.download(job_id, workdir / f"{requests[0].stage}.output.jsonl")
+    return await run_io(read_batch_results, output_path)
+
+
+class BulkBatchRunner:
+    """Fill the PaperQA markdown and converted-table caches through batch jobs."""
+
+    def __init__(
+        self,
+        settings: ValidationSettings,
+        client: BatchClient,
+        paperqa_service: PaperQAService,
+        report_builder: ReportBuilder,
+        *,
+        paperqa_model: str | None = None,
+        cell_model: str | None = None,
+    ) -> None:
+        self.settings = settings
+        self.client = client
+        self.paperqa_service = paperqa_service
+        self.report_builder = report_builder
+        self.paperqa_model = paperqa_model or UNKNOWN_MODEL
+        self.cell_model = cell_model or UNKNOWN_MODEL
+
+    async def run(self, cells: Iterable[CellTypeInfo]) -> dict[str, int]:
+        """Batch every uncached prompt for ``cells``; return cells ingested per stage.
+
+        With the assertion verdict cache, PaperQA requests carry only the
+        assertions without a cached verdict, cells with none are skipped, and
+        the assembled tables convert locally instead of through a batch.
+        """
+        from ..agents.cell_validation.cell_agent import SYSTEM_PROMPT as CELL_SYSTEM_PROMPT
+        from ..agents.paperqa.paperqa_agent import SYSTEM_PROMPT as PAPERQA_SYSTEM_PROMPT
+
+        by_id = {cell.cl_id: cell for cell in cells}
+        ingested = {stage: 0 for stage in BATCH_STAGES}
+        paperqa_requests = []
+        for cell in by_id.values():
+            if self.paperqa_service.cached_markdown(cell.cl_id) is not None:
+                continue
+            prompt = self.paperqa_service.pending_prompt(cell)
+            if prompt is not None:
+                paperqa_requests.append(
+                    BatchRequest(
+                        "paperqa",
+                        cell.cl_id,
+                        _provider_model(self.paperqa_model),
+                        PAPERQA_SYSTEM_PROMPT,
+                        prompt,
+                    )
+                )
+        paperqa_results = await self._run_stage(
+            paperqa_requests, self.paperqa_model, self.paperqa_service.prompt_template.id
+        )
+        for cell_id, content in paperqa_results:
+            try:
+                await self.paperqa_service.store_response(by_id[cell_id], content)
+            except ValueError as exc:
+                logger.warning("Discarding batched PaperQA response for %s: %s", cell_id, exc)
+                continue
+            ingested["paperqa"] += 1
+
+        if self.paperqa_service.verdict_cache is not None:
+            return ingested
+        convert_requests = []
+        for cell in by_id.values():
+            markdown = self.paperqa_service.cached_markdown(cell.cl_id)
+            if markdown is not None and not self.report_builder.has_cached_table(cell.cl_id):
+                convert_requests.append(
+                    BatchRequest(
+                        "convert",
+                        cell.cl_id,
+                        _provider_model(self.cell_model),
+                        CELL_SYSTEM_PROMPT,
+                        ReportBuilder.build_conversion_prompt(markdown),
+                    )
+                )
+        convert_results = await self._run_stage(
+            convert_requests, self.cell_model, CONVERT_TEMPLATE.id
+        )
+        for cell_id, content in convert_results:
+            try:
+                await self.report_builder.store_table(cell_id, content)
+            except ValueError as exc:
+                logger.warning("Discarding batched conversion for %s: %s", cell_id, exc)
+                continue
+            ingested["convert"] += 1
+        return ingested
+
+    async def _run_stage(
+        self, requests: Sequence[BatchRequest], model: str, template: str
+    ) -> list[tuple[str, str]]:
+        """Run one batch job; usage is recorded under the discounted batch model name."""
+        if not requests:
+            return []
+        stage = requests[0].stage
+        workdir = self.settings.paths.batch_dir
+        check_budget()
+        with trace_span(f"batch.{stage}", "llm", stage=stage, requests=len(requests)) as span:
+            results = await run_batch_job(
+                self.client, requests, workdir, poll_seconds=self.settings.batch_poll_seconds
+            )
+            answered: list[tuple[str, str]] = []
+            for request in requests:
+                result = results.get(request.custom_id)
+                if result is None or result.content is None:
+                    reason = result.error if result else "missing from output"
+                    logger.warning(
+                        "Batch %s request for %s failed: %s", stage, request.cell_id, reason
+                    )
+                    continue
+                record_usage(
+                    cell_id=request.cell_id,
+                    stage=stage,
+                    model=batch_model(model),
+                    usage=result.usage,
+                    template=template,
+                )
+                answered.append((request.cell_id, result.content))
+            span.set(answered=len(answered))
+        logger.info("Batch %s answered %s of %s requests", stage, len(answered), len(requests))
+        return answered
+
+
+def _provider_model(model: str) -> str:
+    """Strip the ``provider:`` prefix used in agent model names."""
+    return model.split(":", 1)[-1]
+
+
+def _usage_from_body(body: Mapping[str, Any]) -> dict[str, int]:
+    usage = body.get("usage") or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "input_tokens": int(usage.get("prompt_tokens", 0)),
+        "output_tokens": int(usage.get("completion_tokens", 0)),
+        "cache_read_tokens": int(details.get("cached_tokens", 0)),
+        "requests": 1,
+    }
+
+
+def _error_line(custom_id: str, message: str) -> dict[str, Any]:
+    return {"custom_id": custom_id, "response": None, "error": {"message": message}}
+
+
+__all__ = [
+    "BATCH_ENDPOINT",
+    "BatchClient",
+    "BatchJobError",
+    "BatchRequest",
+    "BatchResult",
+    "BulkBatchRunner",
+    "LocalBatchClient",
+    "OpenAIBatchClient",
+    "read_batch_results",
+    "run_batch_job",
+    "write_batch_file",
+]
@@ -0,0 +1,206 @@
+"""Record and replay agent interactions for offline, token-free pipeline runs."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from ..agents import build_paperqa_agent
+from ..utils import ValidationSettings
+from .agent_adapters import AsyncAgentRunner, CellAgentAdapter
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed prompt has no recorded response."""
+
+
+@dataclass
+class CassetteEntry:
+    """One recorded prompt/response pair."""
+
+    kind: str
+    key: str
+    response: str
+    latency_seconds: float
+    prompt_chars: int
+    usage: dict[str, int] = field(default_factory=dict)
+    model: str | None = None
+
+
+def cassette_key(kind: str, prompt: str) -> str:
+    """Return the lookup key for ``prompt`` sent to the agent identified by ``kind``."""
+    return hashlib.sha256(f"{kind}\0{prompt}".encode()).hexdigest()
+
+
+class Cassette:
+    """JSON-lines file of recorded agent interactions.
+
+    Prompts are stored only as hashes so cassettes stay compact; repeated
+    prompts (retries, re-runs after invalidation) replay their recorded
+    responses in order and then keep serving the last one. The header holds
+    the run's ``seed`` for seeding decisions, so a replay seeds the same cells.
+    """
+
+    def __init__(self, path: Path, seed: int | None = None) -> None:
+        self.path = path
+        self.seed = seed
+        self._entries: dict[str, deque[CassetteEntry]] = defaultdict(deque)
+        self._handle: TextIO | None = None
+
+    @classmethod
+    def load(cls, path: Path) -> Cassette:
+        """Read a recorded cassette for replay."""
+        cassette = cls(path)
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                payload = json.loads(line)
+                if "version" in payload:
+                    if payload["version"] != CASSETTE_VERSION:
+                        raise ValueError(f"Unsupported cassette version in {path}.")
+                    cassette.seed = payload.get("seed")
+                    continue
+                entry = CassetteEntry(**payload)
+                cassette._entries[entry.key].append(entry)
+        return cassette
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, entry: CassetteEntry) -> None:
+        """Append ``entry`` to the cassette file, creating it on first use."""
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("w", encoding="utf-8")
+            header = {"version": CASSETTE_VERSION, "seed": self.seed}
+            self._handle.write(json.dumps(header) + "\n")
+        self._handle.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+        self._handle.flush()
+        self._entries[entry.key].append(entry)
+
+    def lookup(self, key: str) -> CassetteEntry:
+        """Return the next recorded entry for ``key``."""
+        entries = self._entries.get(key)
+        if not entries:
+            raise CassetteMissError(f"No recorded response for cassette key {key[:12]}.")
+        return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class RecordingAgent:
+    """Wrap an agent and record every prompt/response pair it handles."""
+
+    def __init__(self, agent: AsyncAgentRunner, cassette: Cassette, kind: str) -> None:
+        self._agent = agent
+        self.cassette = cassette
+        self.kind = kind
+        self.last_usage: dict[str, int] = {}
+
+    @property
+    def model_name(self) -> str | None:
+        return getattr(self._agent, "model_name", None)
+
+    async def run(self, prompt: str) -> str:
+        """Run the wrapped agent and append the interaction to the cassette."""
+        started = time.perf_counter()
+        response = await self._agent.run(prompt)
+        latency = time.perf_counter() - started
+        self.last_usage = dict(getattr(self._agent, "last_usage", None) or {})
+        self.cassette.record(
+            CassetteEntry(
+                kind=self.kind,
+                key=cassette_key(self.kind, prompt),
+                response=response,
+                latency_seconds=round(latency, 6),
+                prompt_chars=len(prompt),
+                usage=self.last_usage,
+                model=self.model_name,
+            )
+        )
+        return response
+
+
+class ReplayAgent:
+    """Serve recorded responses, instantly or at the recorded latency."""
+
+    def __init__(self, cassette: Cassette, kind: str, *, realtime: bool = False) -> None:
+        self.cassette = cassette
+        self.kind = kind
+        self.realtime = realtime
+        self.last_usage: dict[str, int] = {}
+        self.model_name: str | None = None
+        self.calls = 0
+
+    async def run(self, prompt: str) -> str:
+        """Return the recorded response for ``prompt``."""
+        entry = self.cassette.lookup(cassette_key(self.kind, prompt))
+        self.calls += 1
+        if self.realtime and entry.latency_seconds:
+            await asyncio.sleep(entry.latency_seconds)
+        self.last_usage = dict(entry.usage)
+        self.model_name = entry.model
+        return entry.response
+
+
+def cassette_agents(
+    path: Path,
+    *,
+    mode: str,
+    cell_agent: AsyncAgentRunner | None = None,
+    paperqa_agent: AsyncAgentRunner | None = None,
+    realtime: bool = False,
+    settings: ValidationSettings | None = None,
+) -> tuple[AsyncAgentRunner, AsyncAgentRunner, Cassette]:
+    """Build the cell and PaperQA agents for ``record`` or ``replay`` ``mode``.
+
+    Both agents share one cassette; recording wraps the given (or default)
+    agents, replay never constructs a real agent. With ``settings``, their
+    ``seeding_seed`` is recorded in the cassette (one is drawn if unset) or
+    restored from it on replay, so the replay seeds the recorded cells.
+    """
+    if mode == "replay":
+        cassette = Cassette.load(path)
+        if settings is not None:
+            settings.seeding_seed = cassette.seed
+        logger.info("Replaying %s recorded interactions from %s", len(cassette), path)
+        return (
+            ReplayAgent(cassette, "cell", realtime=realtime),
+            ReplayAgent(cassette, "paperqa", realtime=realtime),
+            cassette,
+        )
+    if mode != "record":
+        raise ValueError(f"Unknown cassette mode '{mode}'.")
+    if settings is not None and settings.seeding_seed is None:
+        settings.seeding_seed = random.randrange(2**32)
+    cassette = Cassette(path, seed=settings.seeding_seed if settings else None)
+    return (
+        RecordingAgent(cell_agent or CellAgentAdapter(), cassette, "cell"),
+        RecordingAgent(paperqa_agent or build_paperqa_agent(), cassette, "paperqa"),
+        cassette,
+    )
+
+
+__all__ = [
+    "Cassette",
+    "CassetteEntry",
+    "CassetteMissError",
+    "RecordingAgent",
+    "ReplayAgent",
+    "cassette_agents",
+    "cassette_key",
+]
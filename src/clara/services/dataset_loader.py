@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
 
 from ..utils import ValidationSettings
-from ..utils.io_utils import read_json
+from ..utils.io_utils import iter_json_object, iter_jsonl
 from ..utils.validation_models import CellTypeInfo
 
 logger = logging.getLogger(__name__)
@@ -16,28 +19,77 @@ class CellDatasetLoader:
 
     def __init__(self, settings: ValidationSettings) -> None:
         self.settings = settings
+        self._index: dict[str, CellTypeInfo] = {}
+        self._index_stamp: tuple[int, int] | None = None
 
     def load_definitions(self) -> list[CellTypeInfo]:
         """Load curated definitions from disk, applying reference/test filters."""
-        payload = read_json(self.settings.paths.dataset_file)
-        definitions: list[CellTypeInfo] = []
-        total = 0
-        selected_test_ids = set(self.settings.test_terms)
-        for entry in payload.values():
+        return list(self.iter_definitions())
+
+    def iter_definitions(self) -> Iterator[CellTypeInfo]:
+        """Stream curated definitions, applying reference/test filters as entries are read.
+
+        Entries are parsed one at a time, so memory does not grow with the
+        dataset. In test mode only the selected terms are turned into cells and
+        reading stops as soon as all of them have been seen.
+        """
+        test_mode = self.settings.is_test_mode
+        remaining = set(self.settings.test_terms)
+        loaded = total = 0
+        for entry in iter_dataset_entries(self.settings.paths.dataset_file):
             total += 1
+            cl_id = str(entry["cell_id"])
+            if test_mode:
+                if cl_id not in remaining:
+                    continue
+                remaining.discard(cl_id)
             cell = CellTypeInfo.from_payload(entry)
-            if self.settings.is_test_mode and cell.cl_id not in selected_test_ids:
-                continue
-            if not cell.has_all_references or not cell.references:
-                continue
-            definitions.append(cell)
+            if cell.has_all_references and cell.references:
+                loaded += 1
+                yield cell
+            if test_mode and not remaining:
+                break
         logger.info(
-            "Loaded %s curated CL definitions (raw=%s test_mode=%s)",
-            len(definitions),
+            "Loaded %s curated CL definitions (read=%s test_mode=%s)",
+            loaded,
             total,
-            self.settings.is_test_mode,
+            test_mode,
         )
-        return definitions
+
+    def load_index(self) -> dict[str, CellTypeInfo]:
+        """Return referenced definitions keyed by CL ID, reparsing only when the file changes.
+
+        The test-term filter is not applied; callers select IDs explicitly.
+        """
+        stat = self.settings.paths.dataset_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._index_stamp:
+            index: dict[str, CellTypeInfo] = {}
+            for cell in iter_dataset_cells(self.settings.paths.dataset_file):
+                if cell.has_all_references and cell.references:
+                    index[cell.cl_id] = cell
+            self._index = index
+            self._index_stamp = stamp
+            logger.info("Indexed %s curated CL definitions", len(index))
+        return self._index
+
+
+def iter_dataset_entries(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream raw dataset entries from a dict-of-entries ``.json`` or a ``.jsonl`` file."""
+    if path.suffix == ".jsonl":
+        yield from iter_jsonl(path)
+    else:
+        for _, entry in iter_json_object(path):
+            yield entry
+
+
+def iter_dataset_cells(path: Path) -> Iterator[CellTypeInfo]:
+    """Stream dataset entries decoded straight into :class:`CellTypeInfo`."""
+    if path.suffix == ".jsonl":
+        yield from iter_jsonl(path, into=CellTypeInfo.from_payload)
+    else:
+        for _, entry in iter_json_object(path):
+            yield CellTypeInfo.from_payload(entry)
 
 
-__all__ = ["CellDatasetLoader"]
+__all__ = ["CellDatasetLoader", "iter_dataset_cells", "iter_dataset_entries"]
@@ -5,17 +5,27 @@ from __future__ import annotations
 import json
 import logging
 import random
-from collections.abc import MutableSequence, Sequence
+from collections.abc import Callable, Iterable, MutableSequence, Sequence
 from dataclasses import replace
 from typing import Any
 
 from ..utils import ValidationSettings
+from ..utils.async_io import run_io
 from ..utils.io_utils import read_json, write_json
+from ..utils.metrics import CELLS_COMPLETED, record_cache_lookup
+from ..utils.streaming import JsonArrayStreamParser, JsonObjectStreamGuard, MalformedResponseError
+from ..utils.tracing import trace_span
+from ..utils.usage import BudgetExceededError
 from ..utils.validation_models import CellTypeInfo
-from .agent_adapters import AsyncAgentRunner
+from .agent_adapters import AsyncAgentRunner, run_agent
+from .prompt_templates import SEED_BATCH_TEMPLATE, SEED_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
+# Batched requests per chunk (the first plus one re-issue of missing IDs);
+# cells still missing after that are seeded one request each.
+MAX_BATCH_ATTEMPTS = 2
+
 
 class FalseAssertionService:
     """Apply cached or newly generated false assertions to curated definitions."""
@@ -31,68 +41,211 @@ class FalseAssertionService:
         self.rng = rng or random.Random()
 
     async def seed_definitions(self, definitions: Sequence[CellTypeInfo]) -> list[CellTypeInfo]:
-        """Return definitions with synthetic negatives injected."""
-        cache = self._load_false_cache()
+        """Return definitions with synthetic negatives injected.
+
+        With ``false_assertion_batch_size`` above 1, uncached cells selected
+        for seeding are sent to the agent in batches of that size.
+        """
+        cache = await run_io(self.load_cache)
+        batch_size = self.settings.false_assertion_batch_size
         mutated: list[CellTypeInfo] = []
-        for cell in definitions:
-            cached = _lookup_false_assertion(cache, cell.cl_id)
-            if cached:
-                updated_definition = cached.get("updated_definition") or cached.get(
-                    "false_assertion"
-                )
-                if updated_definition:
-                    mutated.append(replace(cell, definition=str(updated_definition)))
-                else:
-                    mutated.append(cell)
-                continue
-            if self.rng.random() >= self.settings.false_assertion_probability:
-                mutated.append(cell)
-                continue
-            new_cell = await self._generate_false_definition(cell, cache)
-            mutated.append(new_cell)
-        self._write_false_cache(cache)
+        try:
+            if batch_size > 1:
+                mutated = await self._seed_batched(definitions, cache, batch_size)
+            else:
+                for cell in definitions:
+                    mutated.append(await self.seed_cell(cell, cache))
+        finally:
+            # Keep records generated before a failure (e.g. an exhausted budget).
+            await run_io(self._write_false_cache, cache)
         logger.info("Seeded %s definitions with synthetic negatives", len(mutated))
         return mutated
 
+    async def seed_cell(
+        self, cell: CellTypeInfo, cache: MutableSequence[dict[str, Any]]
+    ) -> CellTypeInfo:
+        """Seed a single definition, appending any newly generated record to ``cache``."""
+        mutated = await self._seed_cell(cell, cache)
+        CELLS_COMPLETED.inc(stage="seed")
+        return mutated
+
+    async def _seed_cell(
+        self, cell: CellTypeInfo, cache: MutableSequence[dict[str, Any]]
+    ) -> CellTypeInfo:
+        with trace_span("seed_cell", "cell", cell_id=cell.cl_id) as span:
+            resolved, cache_hit = self._resolve_cell(cell, cache)
+            span.set(cache_hit=cache_hit)
+            if resolved is not None:
+                return resolved
+            return await self._generate_false_definition(cell, cache)
+
+    async def _seed_batched(
+        self,
+        definitions: Sequence[CellTypeInfo],
+        cache: MutableSequence[dict[str, Any]],
+        batch_size: int,
+    ) -> list[CellTypeInfo]:
+        seeded: list[CellTypeInfo] = []
+        pending: list[tuple[int, CellTypeInfo]] = []
+        for cell in definitions:
+            resolved, _ = self._resolve_cell(cell, cache)
+            if resolved is None:
+                pending.append((len(seeded), cell))
+            seeded.append(resolved or cell)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+            generated = await self._generate_false_definitions([cell for _, cell in chunk], cache)
+            for index, cell in chunk:
+                seeded[index] = generated[cell.cl_id]
+        CELLS_COMPLETED.inc(len(seeded), stage="seed")
+        return seeded
+
+    def _resolve_cell(
+        self, cell: CellTypeInfo, cache: Sequence[dict[str, Any]]
+    ) -> tuple[CellTypeInfo | None, bool]:
+        """Apply a cached negative or skip the cell; ``None`` means one must be generated."""
+        cached = _lookup_false_assertion(cache, cell.cl_id)
+        record_cache_lookup("false_definitions", cached is not None)
+        if cached:
+            updated = cached.get("updated_definition") or cached.get("false_assertion")
+            return (replace(cell, definition=str(updated)) if updated else cell), True
+        if not self._should_seed(cell):
+            return cell, False
+        return None, False
+
+    def _should_seed(self, cell: CellTypeInfo) -> bool:
+        """Draw whether ``cell`` gets a false assertion.
+
+        With ``settings.seeding_seed`` the draw depends only on the seed and the
+        CL ID, so a replayed run seeds the same cells whatever their order.
+        """
+        seed = self.settings.seeding_seed
+        rng = self.rng if seed is None else random.Random(f"{seed}:{cell.cl_id}")
+        return rng.random() < self.settings.false_assertion_probability
+
+    def load_cache(self) -> list[dict[str, Any]]:
+        """Load the cached false-assertion records, tolerating a missing or corrupt file."""
+        path = self.settings.paths.false_definitions_file
+        with trace_span("cache.read", "cache", cache="false_definitions") as span:
+            if not path.exists():
+                span.set(cache_hit=False)
+                return []
+            try:
+                payload = read_json(path)
+                if isinstance(payload, list):
+                    span.set(cache_hit=True, records=len(payload))
+                    return payload
+            except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+                logger.warning("Failed to read false-definition cache: %s", exc)
+            span.set(cache_hit=False)
+            return []
+
+    def merge_cache(self, records: Sequence[dict[str, Any]]) -> None:
+        """Re-read the on-disk cache and append ``records`` for cells not yet present.
+
+        Callers sharing the cache across processes should hold an external lock.
+        """
+        cache = self.load_cache()
+        known = {record.get("cell_id") for record in cache}
+        cache.extend(record for record in records if record.get("cell_id") not in known)
+        self._write_false_cache(cache)
+
+    def invalidate(self, cell_ids: Iterable[str]) -> None:
+        """Remove cached false-assertion records for ``cell_ids``."""
+        stale = set(cell_ids)
+        cache = self.load_cache()
+        kept = [record for record in cache if record.get("cell_id") not in stale]
+        if len(kept) != len(cache):
+            self._write_false_cache(kept)
+
+    def cached_record(self, cache: Sequence[dict[str, Any]], cell_id: str) -> dict[str, Any] | None:
+        """Return the cached false-assertion record for ``cell_id``, if any."""
+        return _lookup_false_assertion(cache, cell_id)
+
+    @staticmethod
+    def build_prompt(cell: CellTypeInfo) -> str:
+        """Return the seeding prompt for ``cell``; the cell text follows the fixed instructions."""
+        return SEED_TEMPLATE.render(f'Cell Type: "{cell.name}"\nDefinition: "{cell.definition}"')
+
+    @staticmethod
+    def build_batch_prompt(cells: Sequence[CellTypeInfo]) -> str:
+        """Return one seeding prompt covering every cell in ``cells``."""
+        entries = "\n".join(
+            f'- cell_id: "{cell.cl_id}" Cell Type: "{cell.name}" Definition: "{cell.definition}"'
+            for cell in cells
+        )
+        return SEED_BATCH_TEMPLATE.render(entries)
+
     async def _generate_false_definition(
         self, cell: CellTypeInfo, cache: MutableSequence[dict[str, Any]]
     ) -> CellTypeInfo:
-        prompt = (
-            "Insert a biologically plausible but false assertion into the following cell type "
-            "definition in a natural and convincing way. "
-            "Return only a JSON object with keys updated_definition and false_assertion. "
-            "Do not include any additional text or explanation. "
-            f'Cell Type: "{cell.name}" '
-            f'Definition: "{cell.definition}"'
+        prompt = self.build_prompt(cell)
+        guard = JsonObjectStreamGuard() if self.settings.stream_responses else None
+        response = await run_agent(
+            self.cell_agent,
+            prompt,
+            stage="seed",
+            cell_id=cell.cl_id,
+            template=SEED_TEMPLATE,
+            on_text=guard.feed if guard else None,
+            validate=_parse_agent_json,
         )
-        response = await self.cell_agent.run(prompt)
         logger.info("Generated false assertion for %s", cell.cl_id)
-        data = _parse_agent_json(response)
-        updated_definition = str(data["updated_definition"])
-        cache.append(
-            {
-                "cell_id": cell.cl_id,
-                "label": cell.name,
-                "false_assertion": data["false_assertion"],
-                "updated_definition": updated_definition,
-            }
-        )
-        return replace(cell, definition=updated_definition)
+        return _apply_record(cell, _parse_agent_json(response), cache)
 
-    def _load_false_cache(self) -> list[dict[str, Any]]:
-        path = self.settings.paths.false_definitions_file
-        if not path.exists():
-            return []
-        try:
-            payload = read_json(path)
-            if isinstance(payload, list):
-                return payload
-        except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-            logger.warning("Failed to read false-definition cache: %s", exc)
-        return []
+    async def _generate_false_definitions(
+        self, cells: Sequence[CellTypeInfo], cache: MutableSequence[dict[str, Any]]
+    ) -> dict[str, CellTypeInfo]:
+        """Seed ``cells`` with batched prompts, re-issuing only IDs missing from a response.
+
+        A batch that fails outright counts as missing every cell. Cells still
+        missing after ``MAX_BATCH_ATTEMPTS`` batches fall back to per-cell
+        requests.
+        """
+        remaining = {cell.cl_id: cell for cell in cells}
+        generated: dict[str, CellTypeInfo] = {}
+        for attempt in range(1, MAX_BATCH_ATTEMPTS + 1):
+            prompt = self.build_batch_prompt(list(remaining.values()))
+            parser = JsonArrayStreamParser() if self.settings.stream_responses else None
+            with trace_span("seed_batch", "cell", cells=len(remaining), attempt=attempt):
+                try:
+                    response = await run_agent(
+                        self.cell_agent,
+                        prompt,
+                        stage="seed",
+                        cell_id=list(remaining),
+                        template=SEED_BATCH_TEMPLATE,
+                        on_text=parser.feed if parser else None,
+                        validate=_batch_check(remaining),
+                    )
+                except BudgetExceededError:
+                    raise
+                except MalformedResponseError as exc:
+                    logger.warning("Abandoned malformed batched seeding response: %s", exc)
+                    response = None
+                except Exception as exc:
+                    logger.warning("Batched seeding request failed: %s", exc)
+                    response = None
+            for data in _parse_agent_batch(response) if response is not None else []:
+                cell = remaining.pop(data["cell_id"], None)
+                if cell is not None:
+                    generated[cell.cl_id] = _apply_record(cell, data, cache)
+            if not remaining:
+                logger.info("Generated false assertions for %s cells in one batch", len(cells))
+                return generated
+            logger.warning(
+                "Batch response missed %s of %s cells (attempt %s); re-issuing them",
+                len(remaining),
+                len(cells),
+                attempt,
+            )
+        for cell in remaining.values():
+            generated[cell.cl_id] = await self._generate_false_definition(cell, cache)
+        return generated
 
     def _write_false_cache(self, payload: Sequence[dict[str, Any]]) -> None:
-        write_json(self.settings.paths.false_definitions_file, list(payload))
+        with trace_span("cache.write", "cache", cache="false_definitions", records=len(payload)):
+            write_json(self.settings.paths.false_definitions_file, list(payload))
 
 
 def _lookup_false_assertion(
@@ -104,6 +257,55 @@ def _lookup_false_assertion(
     return None
 
 
+def _apply_record(
+    cell: CellTypeInfo, data: dict[str, Any], cache: MutableSequence[dict[str, Any]]
+) -> CellTypeInfo:
+    updated_definition = str(data["updated_definition"])
+    cache.append(
+        {
+            "cell_id": cell.cl_id,
+            "label": cell.name,
+            "false_assertion": data["false_assertion"],
+            "updated_definition": updated_definition,
+        }
+    )
+    return replace(cell, definition=updated_definition)
+
+
+def _parse_agent_batch(output: str) -> list[dict[str, Any]]:
+    """Return the well-formed entries of a batched response; anything else counts as missing."""
+    candidate = output.replace("```json", "").replace("```", "").strip()
+    try:
+        data = json.loads(candidate)
+    except json.JSONDecodeError as exc:
+        logger.warning("Unparseable batched seeding response: %s", exc)
+        return []
+    if not isinstance(data, list):
+        return []
+    return [
+        {
+            "cell_id": str(entry["cell_id"]),
+            "updated_definition": str(entry["updated_definition"]),
+            "false_assertion": str(entry["false_assertion"]),
+        }
+        for entry in data
+        if isinstance(entry, dict)
+        and {"cell_id", "updated_definition", "false_assertion"} <= entry.keys()
+    ]
+
+
+def _batch_check(cell_ids: Iterable[str]) -> Callable[[str], None]:
+    """Return a cascade check rejecting batched responses that miss any of ``cell_ids``."""
+    expected = set(cell_ids)
+
+    def check(output: str) -> None:
+        missing = expected - {entry["cell_id"] for entry in _parse_agent_batch(output)}
+        if missing:
+            raise ValueError(f"Batched response missed {len(missing)} cells.")
+
+    return check
+
+
 def _parse_agent_json(output: str) -> dict[str, Any]:
     candidate = output.replace("```json", "").replace("```", "").strip()
     data = json.loads(candidate)
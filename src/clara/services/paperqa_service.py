@@ -3,69 +3,234 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from pathlib import Path
 
-from ..agents import PaperQAAgent, build_paperqa_agent
+from ..agents import build_paperqa_agent
 from ..utils import ValidationSettings
-from ..utils.io_utils import read_text, write_text
+from ..utils.async_io import path_exists, run_io, write_text_async
+from ..utils.io_utils import read_text
+from ..utils.metrics import CELLS_COMPLETED, record_cache_lookup
+from ..utils.streaming import MarkdownTableParser
+from ..utils.tracing import trace_span
 from ..utils.validation_models import CellTypeInfo, PaperQAResult
+from .agent_adapters import AsyncAgentRunner, run_agent
+from .assertion_cache import (
+    AssertionVerdict,
+    AssertionVerdictCache,
+    match_verdicts,
+    parse_verdict_table,
+    reference_set_hash,
+    render_verdict_table,
+    split_assertions,
+)
+from .prompt_templates import PAPERQA_ASSERTIONS_TEMPLATE, PAPERQA_TEMPLATE, PromptTemplate
 
 logger = logging.getLogger(__name__)
 
 
 class PaperQAService:
-    """Run PaperQA via the configured agent and cache markdown outputs per cell type."""
+    """Run PaperQA via the configured agent and cache markdown outputs per cell type.
+
+    With ``settings.assertion_verdict_cache`` (or an explicit ``verdict_cache``),
+    definitions are split into atomic assertions locally and only assertions
+    without a cached verdict for the cell's reference set (IDs and packet
+    contents) are sent to PaperQA.
+    """
 
     def __init__(
         self,
         settings: ValidationSettings,
-        agent: PaperQAAgent | None = None,
+        agent: AsyncAgentRunner | None = None,
+        verdict_cache: AssertionVerdictCache | None = None,
     ) -> None:
         self.settings = settings
         self._agent = agent or build_paperqa_agent()
+        if verdict_cache is None and settings.assertion_verdict_cache:
+            verdict_cache = AssertionVerdictCache(settings.paths.assertion_verdicts_file)
+        self.verdict_cache = verdict_cache
 
     async def validate_cells(self, cells: Iterable[CellTypeInfo]) -> list[PaperQAResult]:
         """Run PaperQA for each cell, caching markdown outputs."""
         results: list[PaperQAResult] = []
         for cell in cells:
-            markdown_path = self._markdown_path(cell.cl_id)
-            if markdown_path.exists():
-                markdown = read_text(markdown_path)
-            else:
-                markdown = await self._ask_assertions(cell)
-                write_text(markdown_path, markdown)
-            results.append(PaperQAResult(cell_type=cell, report_markdown=markdown))
+            results.append(await self.validate_cell(cell))
         logger.info("PaperQA processed %s cells", len(results))
         return results
 
+    async def validate_cell(
+        self,
+        cell: CellTypeInfo,
+        *,
+        on_row: Callable[[dict[str, str]], object] | None = None,
+    ) -> PaperQAResult:
+        """Run PaperQA for a single cell, reusing the cached markdown when present.
+
+        ``on_row`` receives each markdown table row of a fresh response, keyed
+        by the table header, as soon as the row's line has streamed in.
+        """
+        markdown_path = self._markdown_path(cell.cl_id)
+        with trace_span("paperqa_cell", "cell", cell_id=cell.cl_id) as span:
+            cache_hit = await path_exists(markdown_path)
+            span.set(cache_hit=cache_hit)
+            record_cache_lookup("paperqa_markdown", cache_hit)
+            if not cache_hit and self.verdict_cache is not None:
+                await self.store_markdown(cell.cl_id, await self._validate_assertions(cell, on_row))
+            elif not cache_hit:
+                await self.store_markdown(cell.cl_id, await self._ask_assertions(cell, on_row))
+        CELLS_COMPLETED.inc(stage="paperqa")
+        # The markdown is read back from the cache file only if a report needs it.
+        return PaperQAResult(cell_type=cell, markdown_path=markdown_path)
+
+    def cached_markdown(self, cell_id: str) -> str | None:
+        """Return the cached PaperQA markdown for ``cell_id``, if any."""
+        path = self._markdown_path(cell_id)
+        return read_text(path) if path.exists() else None
+
+    async def store_markdown(self, cell_id: str, markdown: str) -> None:
+        """Cache PaperQA ``markdown`` for ``cell_id``."""
+        with trace_span("cache.write", "cache", cache="paperqa_markdown"):
+            await write_text_async(self._markdown_path(cell_id), markdown)
+
+    def invalidate(self, cell_id: str) -> None:
+        """Drop the cached PaperQA markdown for ``cell_id`` so it is regenerated."""
+        self._markdown_path(cell_id).unlink(missing_ok=True)
+
     def _markdown_path(self, cell_id: str) -> Path:
         return self.settings.paths.paperqa_markdown_dir / f"{cell_id}.md"
 
-    async def _ask_assertions(self, cell: CellTypeInfo) -> str:
-        prompt = self._build_prompt(cell)
-        return await self._agent.run(prompt)
+    def _references_hash(self, cell: CellTypeInfo) -> str:
+        packet_dir = self.settings.paths.references_dir / cell.cl_id
+        return reference_set_hash(cell.references, packet_dir)
+
+    def pending_prompt(self, cell: CellTypeInfo) -> str | None:
+        """Return the prompt an uncached ``cell`` would send, or None if no call is needed.
+
+        Without a verdict cache this is always the full PaperQA prompt.
+        """
+        if self.verdict_cache is None:
+            return self.build_prompt(cell)
+        references_hash = self._references_hash(cell)
+        missing = [
+            assertion
+            for assertion in split_assertions(cell)
+            if self.verdict_cache.get(assertion, references_hash) is None
+        ]
+        return self.build_assertions_prompt(cell, missing) if missing else None
+
+    @property
+    def prompt_template(self) -> PromptTemplate:
+        """The template of the prompts :meth:`pending_prompt` returns."""
+        return PAPERQA_TEMPLATE if self.verdict_cache is None else PAPERQA_ASSERTIONS_TEMPLATE
+
+    async def store_response(self, cell: CellTypeInfo, response: str) -> None:
+        """Cache a ``response`` to :meth:`pending_prompt` obtained outside this service.
+
+        With a verdict cache, the new verdicts are cached and merged with the
+        cell's cached ones; a response missing an assertion raises ValueError.
+        """
+        if self.verdict_cache is None:
+            await self.store_markdown(cell.cl_id, response)
+        else:
+            markdown = await self._validate_assertions(cell, None, response=response)
+            await self.store_markdown(cell.cl_id, markdown)
+
+    async def _validate_assertions(
+        self,
+        cell: CellTypeInfo,
+        on_row: Callable[[dict[str, str]], object] | None,
+        *,
+        response: str | None = None,
+    ) -> str:
+        """Assemble the cell's table from cached verdicts, asking PaperQA only for new ones.
+
+        A ``response`` already obtained for the missing assertions is used
+        instead of asking PaperQA.
+        """
+        cache = self.verdict_cache
+        if cache is None:
+            raise RuntimeError("Assertion verdict cache not configured.")
+        await run_io(cache.load)
+        references_hash = await run_io(self._references_hash, cell)
+        verdicts: dict[str, AssertionVerdict | None] = {
+            assertion: cache.get(assertion, references_hash) for assertion in split_assertions(cell)
+        }
+        missing = [assertion for assertion, verdict in verdicts.items() if verdict is None]
+        for verdict in verdicts.values():
+            record_cache_lookup("assertion_verdicts", verdict is not None)
+        with trace_span(
+            "assertion_verdicts", "cell", assertions=len(verdicts), missing=len(missing)
+        ):
+            if missing:
+                if response is None:
+                    response = await run_agent(
+                        self._agent,
+                        self.build_assertions_prompt(cell, missing),
+                        stage="paperqa",
+                        cell_id=cell.cl_id,
+                        template=PAPERQA_ASSERTIONS_TEMPLATE,
+                        validate=parse_verdict_table,
+                    )
+                for assertion, verdict in match_verdicts(
+                    missing, parse_verdict_table(response)
+                ).items():
+                    verdicts[assertion] = verdict
+                    cache.put(verdict, references_hash)
+                await run_io(cache.flush)
+        table = [verdict for verdict in verdicts.values() if verdict is not None]
+        if on_row:
+            for verdict in table:
+                on_row(verdict.to_row())
+        logger.info("Validated %s of %s assertions for %s", len(missing), len(table), cell.cl_id)
+        return render_verdict_table(table)
+
+    async def _ask_assertions(
+        self, cell: CellTypeInfo, on_row: Callable[[dict[str, str]], object] | None
+    ) -> str:
+        prompt = self.build_prompt(cell)
+        if on_row is None:
+            return await run_agent(
+                self._agent,
+                prompt,
+                stage="paperqa",
+                cell_id=cell.cl_id,
+                template=PAPERQA_TEMPLATE,
+                validate=parse_verdict_table,
+            )
+        parser = MarkdownTableParser()
+
+        def publish(delta: str) -> None:
+            for row in parser.feed(delta):
+                on_row(row)
+
+        markdown = await run_agent(
+            self._agent,
+            prompt,
+            stage="paperqa",
+            cell_id=cell.cl_id,
+            template=PAPERQA_TEMPLATE,
+            on_text=publish,
+            validate=parse_verdict_table,
+        )
+        for row in parser.close():
+            on_row(row)
+        return markdown
 
     @staticmethod
-    def _build_prompt(cell: CellTypeInfo) -> str:
+    def build_prompt(cell: CellTypeInfo) -> str:
+        """Return the PaperQA prompt for ``cell``."""
         logical_assertions = "\n".join(
             part.strip() for part in cell.logical_axioms.split(".") if part.strip()
         )
-        return (
-            "For the following text, first break down the definition into individual, atomic "
-            "assertions. Each assertion should be a single, verifiable statement. After extracting "
-            "the assertions, create a table with the following columns:\n"
-            "- Assertion: A single, verifiable statement about the cell type.\n"
-            '- Validated: A strict "True" or "False" value. This column should only contain "True" '
-            "if the entire assertion is stated and supported by the provided literature. If the "
-            "literature contradicts the assertion, or is not supported, the value must be False.\n"
-            "- Evidence: A brief summary of the evidence from the literature that supports the "
-            '"Validated" column\'s value.\n'
-            "- References: The sources from the literature that were used for validation.\n\n"
-            f"name: {cell.name}\n"
-            f'def: "{cell.definition}"\n'
-            f"{logical_assertions}"
+        return PAPERQA_TEMPLATE.render(
+            f'name: {cell.name}\ndef: "{cell.definition}"\n{logical_assertions}'
         )
 
+    @staticmethod
+    def build_assertions_prompt(cell: CellTypeInfo, assertions: Iterable[str]) -> str:
+        """Return the PaperQA prompt validating only ``assertions`` about ``cell``."""
+        listed = "\n".join(f'- "{assertion}"' for assertion in assertions)
+        return PAPERQA_ASSERTIONS_TEMPLATE.render(f"name: {cell.name}\nAssertions:\n{listed}")
+
 
 __all__ = ["PaperQAService"]
@@ -0,0 +1,126 @@
+"""Versioned prompt templates with a stable, cache-friendly instruction prefix."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+PROMPT_DATA_SEPARATOR = "\n\n"
+
+
+@dataclass(frozen=True, slots=True)
+class PromptTemplate:
+    """Invariant instructions followed by a per-call data block.
+
+    Every prompt rendered from a template starts with the same bytes, so the
+    system prompt plus ``instructions`` form a prefix shared across cells that
+    provider-side prompt caching can reuse. Bump ``version`` whenever the
+    instructions change; the ``id`` is recorded on traces and usage summaries.
+    """
+
+    name: str
+    version: int
+    instructions: str
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    @property
+    def prefix_digest(self) -> str:
+        """Short hash of the invariant prefix, to spot accidental drift."""
+        return hashlib.sha256(self.instructions.encode()).hexdigest()[:12]
+
+    def render(self, data: str) -> str:
+        """Return the instructions followed by ``data``."""
+        return f"{self.instructions}{PROMPT_DATA_SEPARATOR}{data}"
+
+
+SEED_TEMPLATE = PromptTemplate(
+    name="seed",
+    version=1,
+    instructions=(
+        "Insert a biologically plausible but false assertion into the following cell type "
+        "definition in a natural and convincing way. "
+        "Return only a JSON object with keys updated_definition and false_assertion. "
+        "Do not include any additional text or explanation."
+    ),
+)
+
+SEED_BATCH_TEMPLATE = PromptTemplate(
+    name="seed_batch",
+    version=1,
+    instructions=(
+        "Insert a biologically plausible but false assertion into each of the following cell "
+        "type definitions in a natural and convincing way. "
+        "Return only a JSON array with one object per cell, each with keys cell_id, "
+        "updated_definition and false_assertion, using the cell_id given below. "
+        "Do not include any additional text or explanation."
+    ),
+)
+
+PAPERQA_TEMPLATE = PromptTemplate(
+    name="paperqa",
+    version=1,
+    instructions=(
+        "For the following text, first break down the definition into individual, atomic "
+        "assertions. Each assertion should be a single, verifiable statement. After extracting "
+        "the assertions, create a table with the following columns:\n"
+        "- Assertion: A single, verifiable statement about the cell type.\n"
+        '- Validated: A strict "True" or "False" value. This column should only contain "True" '
+        "if the entire assertion is stated and supported by the provided literature. If the "
+        "literature contradicts the assertion, or is not supported, the value must be False.\n"
+        "- Evidence: A brief summary of the evidence from the literature that supports the "
+        '"Validated" column\'s value.\n'
+        "- References: The sources from the literature that were used for validation."
+    ),
+)
+
+PAPERQA_ASSERTIONS_TEMPLATE = PromptTemplate(
+    name="paperqa_assertions",
+    version=1,
+    instructions=(
+        "For each of the following assertions about a cell type, check it against the provided "
+        "literature. Create a table with one row per assertion, in the given order, with the "
+        "following columns:\n"
+        "- Assertion: The assertion exactly as given.\n"
+        '- Validated: A strict "True" or "False" value. This column should only contain "True" '
+        "if the entire assertion is stated and supported by the provided literature. If the "
+        "literature contradicts the assertion, or is not supported, the value must be False.\n"
+        "- Evidence: A brief summary of the evidence from the literature that supports the "
+        '"Validated" column\'s value.\n'
+        "- References: The sources from the literature that were used for validation."
+    ),
+)
+
+CONVERT_TEMPLATE = PromptTemplate(
+    name="convert",
+    version=1,
+    instructions=(
+        "From the following input, extract only the markdown table and convert it into a JSON "
+        "array of objects. Each object should have the keys assertion, validated (True/False), "
+        "summary_text, and references. Ignore all non-table text and output only the JSON."
+    ),
+)
+
+PROMPT_TEMPLATES = {
+    template.name: template
+    for template in (
+        SEED_TEMPLATE,
+        SEED_BATCH_TEMPLATE,
+        PAPERQA_TEMPLATE,
+        PAPERQA_ASSERTIONS_TEMPLATE,
+        CONVERT_TEMPLATE,
+    )
+}
+
+
+__all__ = [
+    "CONVERT_TEMPLATE",
+    "PAPERQA_ASSERTIONS_TEMPLATE",
+    "PAPERQA_TEMPLATE",
+    "PROMPT_TEMPLATES",
+    "PromptTemplate",
+    "SEED_BATCH_TEMPLATE",
+    "SEED_TEMPLATE",
+]
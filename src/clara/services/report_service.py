@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
+import contextlib
 import csv
+import functools
+import io
 import json
 import logging
-from collections.abc import Iterable
+import os
+from collections.abc import Callable, Iterable, Mapping
 from pathlib import Path
+from typing import Any, BinaryIO
 
 from ..utils import ValidationSettings
-from ..utils.io_utils import read_json, write_json
-from ..utils.validation_models import PaperQAResult
-from .agent_adapters import AsyncAgentRunner
+from ..utils.async_io import path_exists, read_json_async, run_io, write_json_async
+from ..utils.metrics import CELLS_COMPLETED, record_cache_lookup
+from ..utils.streaming import JsonArrayStreamParser
+from ..utils.tracing import trace_span
+from ..utils.validation_models import CellTypeInfo, PaperQAResult
+from .agent_adapters import AsyncAgentRunner, run_agent
+from .assertion_cache import parse_verdict_table
+from .prompt_templates import CONVERT_TEMPLATE
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +35,9 @@ COLUMN_NAMES = [
     "Curator Notes",
     "Agent Notes",
 ]
+# Columns repeated on every row of a cell; stored dictionary-encoded in columnar exports.
+DICTIONARY_COLUMNS = ("Cell ID", "Name", "References")
+COLUMNAR_FORMATS = ("parquet", "arrow")
 
 
 class ReportBuilder:
@@ -35,43 +48,321 @@ class ReportBuilder:
         self.cell_agent = cell_agent
 
     async def build_report(self, results: Iterable[PaperQAResult]) -> Path:
-        """Generate the curator TSV report from PaperQA markdown outputs."""
+        """Generate the curator TSV report from PaperQA markdown outputs.
+
+        Rows are appended to the partial report and flushed as soon as each
+        cell's table is ready (with ``stream_responses``, as soon as each row
+        has streamed in), so curators can start reviewing mid-run and a
+        crash keeps finished rows. The complete report, sorted by cell ID, is
+        then published atomically. Only one cell's rows are held in memory at
+        a time; the snapshot is assembled from byte ranges of the partial file.
+        """
+        partial_path = self.settings.paths.partial_report_file
+        report_path = self.settings.paths.report_file
+        with await run_io(_ProgressiveTsvWriter, partial_path) as writer:
+            for result in results:
+                cell_id = result.cell_type.cl_id
+                if self.settings.stream_responses:
+                    # Each row is appended as soon as its object has streamed in.
+                    on_row = functools.partial(writer.write_row, cell_id)
+                    await self.build_rows(result, on_row=on_row)
+                else:
+                    rows = await self.build_rows(result)
+                    await run_io(writer.write_rows, cell_id, rows)
+            with trace_span("report.snapshot", "io", cells=writer.cell_count):
+                await run_io(self._publish, writer, report_path)
+        await run_io(partial_path.unlink)
+        logger.info("Report generated at %s", report_path)
+        return report_path
+
+    def _publish(self, writer: _ProgressiveTsvWriter, report_path: Path) -> None:
+        writer.snapshot(report_path)
+        export_format = self.settings.report_columnar_format
+        if export_format:
+            export_report_columnar(report_path, export_format)
+
+    def update_report(
+        self,
+        rows_by_cell: Mapping[str, list[dict[str, str]]],
+        removed: Iterable[str] = (),
+    ) -> Path:
+        """Replace the rows of selected cells in the existing report, keeping all others.
+
+        Curator columns are carried over for assertions whose text is unchanged.
+        Cells not yet in the report are appended; ``removed`` cells are dropped.
+        """
+        report_path = self.settings.paths.report_file
+        existing = _read_tsv(report_path) if report_path.exists() else []
+        dropped = set(removed)
+        curated = {
+            (row["Cell ID"], row["Assertion"]): row
+            for row in existing
+            if row["Cell ID"] in rows_by_cell
+        }
         rows: list[dict[str, str]] = []
-        for result in results:
-            table = await self._load_or_convert_table(result)
-            for entry in table:
-                rows.append(
-                    {
-                        "Cell ID": result.cell_type.cl_id,
-                        "Name": result.cell_type.name,
-                        "Assertion": entry.get("assertion", ""),
-                        "Agent Validation": str(entry.get("validated", "")),
-                        "Curator Validation": "",
-                        "References": result.cell_type.references,
-                        "Curator Notes": "",
-                        "Agent Notes": entry.get("summary_text", ""),
-                    }
-                )
-        report_path = self.settings.paths.output_dir / "cell_type_validation_report.tsv"
+        pending = dict(rows_by_cell)
+        for row in existing:
+            cell_id = row["Cell ID"]
+            if cell_id in dropped:
+                continue
+            if cell_id not in rows_by_cell:
+                rows.append(row)
+            elif cell_id in pending:
+                rows.extend(_carry_curation(pending.pop(cell_id), curated))
+        for new_rows in pending.values():
+            rows.extend(_carry_curation(new_rows, curated))
         _write_tsv(report_path, rows)
-        logger.info("Report generated at %s", report_path)
+        logger.info("Report updated at %s for %s cells", report_path, len(rows_by_cell))
         return report_path
 
-    async def _load_or_convert_table(self, result: PaperQAResult) -> list[dict]:
-        cache_path = self.settings.paths.paperqa_json_dir / f"{result.cell_type.cl_id}.json"
-        if cache_path.exists():
-            return read_json(cache_path)
-        prompt = (
-            "From the following input, extract only the markdown table and convert it into a JSON "
-            "array of objects. Each object should have the keys assertion, validated (True/False), "
-            "summary_text, and references. Ignore all non-table text and output only the JSON. "
-            f"Report:\n{result.report_markdown}\n"
+    def invalidate(self, cell_id: str) -> None:
+        """Drop the cached JSON table for ``cell_id`` so it is converted again."""
+        self._table_path(cell_id).unlink(missing_ok=True)
+
+    async def build_rows(
+        self,
+        result: PaperQAResult,
+        *,
+        on_row: Callable[[dict[str, str]], object] | None = None,
+    ) -> list[dict[str, str]]:
+        """Return the report rows for one cell, converting its PaperQA table if needed.
+
+        ``on_row`` receives each row as soon as it is known; during a fresh
+        conversion that is when the row's JSON object has streamed in, before
+        the response is complete.
+        """
+        cell = result.cell_type
+        emitted = 0
+
+        def on_entry(entry: dict) -> None:
+            nonlocal emitted
+            emitted += 1
+            if on_row:
+                on_row(_report_row(cell, entry))
+
+        with trace_span("report_cell", "cell", cell_id=cell.cl_id) as span:
+            table = await self._load_or_convert_table(result, on_entry if on_row else None)
+            span.set(assertions=len(table))
+        CELLS_COMPLETED.inc(stage="convert")
+        rows = [_report_row(cell, entry) for entry in table]
+        if on_row:
+            for row in rows[emitted:]:
+                on_row(row)
+        return rows
+
+    async def _load_or_convert_table(
+        self, result: PaperQAResult, on_entry: Callable[[dict], object] | None = None
+    ) -> list[dict]:
+        cell_id = result.cell_type.cl_id
+        cache_path = self._table_path(cell_id)
+        cache_hit = await path_exists(cache_path)
+        record_cache_lookup("paperqa_json", cache_hit)
+        if cache_hit:
+            with trace_span("cache.read", "cache", cache="paperqa_json", cache_hit=True):
+                return await read_json_async(cache_path)
+        markdown = await run_io(lambda: result.report_markdown)
+        if self.settings.assertion_verdict_cache:
+            # Tables assembled from cached verdicts are strict and convert without a call.
+            with contextlib.suppress(ValueError):
+                table = [verdict.to_entry() for verdict in parse_verdict_table(markdown)]
+                await self._write_table(cell_id, table)
+                return table
+        prompt = self.build_conversion_prompt(markdown)
+        if on_entry is None and not self.settings.stream_responses:
+            response = await run_agent(
+                self.cell_agent,
+                prompt,
+                stage="convert",
+                cell_id=cell_id,
+                template=CONVERT_TEMPLATE,
+                validate=_check_assertion_verdicts,
+            )
+            return await self.store_table(cell_id, response)
+        # Streamed: objects are parsed as they complete and prose aborts the call early.
+        parser = JsonArrayStreamParser()
+        entries: list[dict] = []
+
+        def collect(delta: str) -> None:
+            for entry in parser.feed(delta):
+                entries.append(entry)
+                if on_entry:
+                    on_entry(entry)
+
+        await run_agent(
+            self.cell_agent,
+            prompt,
+            stage="convert",
+            cell_id=cell_id,
+            template=CONVERT_TEMPLATE,
+            on_text=collect,
+            validate=_check_assertion_verdicts,
         )
-        response = await self.cell_agent.run(prompt)
-        data = _parse_json_array(response)
-        write_json(cache_path, data)
+        parser.close()
+        await self._write_table(cell_id, entries)
+        return entries
+
+    async def store_table(self, cell_id: str, response: str) -> list[dict]:
+        """Parse a conversion ``response`` and cache the table for ``cell_id``."""
+        with trace_span("parse.json", "parse", cell_id=cell_id, chars=len(response)):
+            data = _parse_json_array(response)
+        await self._write_table(cell_id, data)
         return data
 
+    async def _write_table(self, cell_id: str, data: list[dict]) -> None:
+        with trace_span("cache.write", "cache", cache="paperqa_json"):
+            await write_json_async(self._table_path(cell_id), data)
+
+    def has_cached_table(self, cell_id: str) -> bool:
+        """Return True when the converted JSON table for ``cell_id`` is cached."""
+        return self._table_path(cell_id).exists()
+
+    @staticmethod
+    def build_conversion_prompt(report_markdown: str) -> str:
+        """Return the prompt converting a PaperQA markdown table to JSON."""
+        return CONVERT_TEMPLATE.render(f"Report:\n{report_markdown}\n")
+
+    def _table_path(self, cell_id: str) -> Path:
+        return self.settings.paths.paperqa_json_dir / f"{cell_id}.json"
+
+
+def export_report_columnar(report_path: Path, export_format: str = "parquet") -> Path:
+    """Convert the TSV report to Parquet or an Arrow IPC stream next to it.
+
+    The TSV is read in blocks, so memory stays bounded regardless of report
+    size. Requires the optional ``pyarrow`` dependency (``clara[columnar]``).
+    """
+    if export_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format '{export_format}'.")
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]
+        import pyarrow.csv as pa_csv  # type: ignore[import-untyped]
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("Columnar export requires pyarrow; install clara[columnar].") from exc
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    column_types = {
+        name: dictionary if name in DICTIONARY_COLUMNS else pa.string() for name in COLUMN_NAMES
+    }
+    reader = pa_csv.open_csv(
+        report_path,
+        parse_options=pa_csv.ParseOptions(delimiter="\t", newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=False),
+    )
+    if export_format == "parquet":
+        import pyarrow.parquet as pa_parquet  # type: ignore[import-untyped]
+
+        destination = report_path.with_suffix(".parquet")
+        writer: Any = pa_parquet.ParquetWriter(destination, reader.schema)
+    else:
+        import pyarrow.ipc as pa_ipc  # type: ignore[import-untyped]
+
+        # The stream format allows each batch to carry its own dictionary; the
+        # IPC file format would require one dictionary for the whole report.
+        destination = report_path.with_suffix(".arrows")
+        writer = pa_ipc.new_stream(destination, reader.schema)
+    with writer:
+        for batch in reader:
+            writer.write_batch(batch)
+    logger.info("Columnar report exported to %s", destination)
+    return destination
+
+
+class _ProgressiveTsvWriter:
+    """Append per-cell report rows to a TSV file, flushing after every cell.
+
+    Each cell's byte range is remembered so that a sorted snapshot can be
+    copied out of the partial file without re-parsing or buffering rows.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = path.open("w+b")
+        self._spans: list[tuple[str, int, int]] = []
+        self._header_length = self._append(_encode_rows([], header=True))
+
+    def __enter__(self) -> _ProgressiveTsvWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._handle.close()
+
+    def write_rows(self, cell_id: str, rows: list[dict[str, str]]) -> None:
+        if not rows:
+            return
+        offset = self._handle.tell()
+        self._spans.append((cell_id, offset, self._append(_encode_rows(rows))))
+
+    def write_row(self, cell_id: str, row: dict[str, str]) -> None:
+        """Append one row, extending the span of ``cell_id`` if it was written last."""
+        offset = self._handle.tell()
+        length = self._append(_encode_rows([row]))
+        if self._spans and self._spans[-1][0] == cell_id:
+            _, start, written = self._spans[-1]
+            self._spans[-1] = (cell_id, start, written + length)
+        else:
+            self._spans.append((cell_id, offset, length))
+
+    @property
+    def cell_count(self) -> int:
+        return len(self._spans)
+
+    def snapshot(self, destination: Path) -> None:
+        """Atomically write the rows sorted by cell ID to ``destination``."""
+        tmp_path = destination.with_name(f"{destination.name}.tmp")
+        with tmp_path.open("wb") as target:
+            self._copy(target, 0, self._header_length)
+            for _, offset, length in sorted(self._spans, key=lambda span: span[0]):
+                self._copy(target, offset, length)
+        self._handle.seek(0, os.SEEK_END)
+        os.replace(tmp_path, destination)
+
+    def _append(self, data: bytes) -> int:
+        self._handle.write(data)
+        self._handle.flush()
+        return len(data)
+
+    def _copy(self, target: BinaryIO, offset: int, length: int) -> None:
+        self._handle.seek(offset)
+        target.write(self._handle.read(length))
+
+
+def _encode_rows(rows: Iterable[dict[str, str]], *, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMN_NAMES, delimiter="\t")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _report_row(cell: CellTypeInfo, entry: Mapping[str, object]) -> dict[str, str]:
+    return {
+        "Cell ID": cell.cl_id,
+        "Name": cell.name,
+        "Assertion": str(entry.get("assertion", "")),
+        "Agent Validation": str(entry.get("validated", "")),
+        "Curator Validation": "",
+        "References": cell.references,
+        "Curator Notes": "",
+        "Agent Notes": str(entry.get("summary_text", "")),
+    }
+
+
+def _carry_curation(
+    rows: list[dict[str, str]], curated: Mapping[tuple[str, str], dict[str, str]]
+) -> list[dict[str, str]]:
+    for row in rows:
+        previous = curated.get((row["Cell ID"], row["Assertion"]))
+        if previous:
+            row["Curator Validation"] = previous.get("Curator Validation", "")
+            row["Curator Notes"] = previous.get("Curator Notes", "")
+    return rows
+
+
+def _read_tsv(path: Path) -> list[dict[str, str]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle, delimiter="\t"))
+
 
 def _parse_json_array(output: str) -> list[dict]:
     candidate = output.replace("```json", "").replace("```", "").strip()
@@ -81,13 +372,28 @@ def _parse_json_array(output: str) -> list[dict]:
     return data
 
 
+def _check_assertion_verdicts(output: str) -> None:
+    """Raise ``ValueError`` unless ``output`` is a JSON table giving every assertion a verdict."""
+    entries = _parse_json_array(output)
+    if not entries:
+        raise ValueError("Converted table has no assertions.")
+    for entry in entries:
+        if not isinstance(entry, dict) or not str(entry.get("assertion", "")).strip():
+            raise ValueError("Converted table entry has no assertion.")
+        if str(entry.get("validated", "")).lower() not in {"true", "false"}:
+            raise ValueError(f"Assertion {entry['assertion']!r} has no True/False verdict.")
+
+
 def _write_tsv(path: Path, rows: list[dict[str, str]]) -> None:
+    """Write ``rows`` to a temporary sibling and atomically swap it into place."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as handle:
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8", newline="") as handle:
         writer = csv.DictWriter(handle, fieldnames=COLUMN_NAMES, delimiter="\t")
         writer.writeheader()
         for row in rows:
             writer.writerow(row)
+    os.replace(tmp_path, path)
 
 
-__all__ = ["ReportBuilder"]
+__all__ = ["ReportBuilder", "export_report_columnar"]
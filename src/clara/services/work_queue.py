@@ -0,0 +1,294 @@
+"""SQLite-backed work queue with time-limited leases for per-cell workflow stages."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..utils.io_utils import dumps_json, loads_json
+from ..utils.metrics import QUEUE_RETRIES
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    cell_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (cell_id, stage)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (stage, status, lease_expires);
+CREATE TABLE IF NOT EXISTS publication (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    owner TEXT NOT NULL,
+    published_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class QueueJob:
+    """A leased unit of work: one cell at one workflow stage."""
+
+    cell_id: str
+    stage: str
+    payload: dict[str, Any]
+    lease_owner: str
+    attempts: int
+
+
+class WorkQueue:
+    """Durable job table shared by any number of worker processes.
+
+    Each row tracks one cell at one stage. Workers claim rows with a lease that
+    expires after ``lease_seconds``; rows whose lease has lapsed are treated as
+    pending again, so crashed or removed workers never strand work.
+
+    A queue object may be used from several threads (e.g. the async I/O
+    pool); calls on it are serialised.
+    """
+
+    def __init__(self, path: Path, *, max_attempts: int = 3, timeout: float = 30.0) -> None:
+        self.path = path
+        self.max_attempts = max_attempts
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[sqlite3.Connection]:
+        """Hold the database write lock, serialising critical sections across workers."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, stage: str, items: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        """Insert pending jobs for ``stage``; existing rows for a cell are left untouched."""
+        now = time.time()
+        inserted = 0
+        with self.exclusive() as conn:
+            for cell_id, payload in items:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (cell_id, stage, status, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (cell_id, stage, STATUS_PENDING, dumps_json(payload).decode(), now),
+                )
+                inserted += cursor.rowcount
+            if inserted:
+                # New work means the published report is out of date.
+                conn.execute("DELETE FROM publication")
+        return inserted
+
+    def claim(self, stages: Iterable[str], owner: str, lease_seconds: float) -> QueueJob | None:
+        """Lease the next available job from ``stages``, reclaiming expired leases."""
+        stage_list = list(stages)
+        if not stage_list:
+            return None
+        placeholders = ",".join("?" for _ in stage_list)
+        now = time.time()
+        with self.exclusive() as conn:
+            row = conn.execute(
+                "SELECT cell_id, stage, payload, attempts FROM jobs "
+                f"WHERE stage IN ({placeholders}) AND "
+                "(status = ? OR (status = ? AND lease_expires < ?)) "
+                "ORDER BY updated_at LIMIT 1",
+                (*stage_list, STATUS_PENDING, STATUS_LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            cell_id, stage, payload, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE cell_id = ? AND stage = ?",
+                (STATUS_LEASED, owner, now + lease_seconds, now, cell_id, stage),
+            )
+        return QueueJob(
+            cell_id=cell_id,
+            stage=stage,
+            payload=loads_json(payload),
+            lease_owner=owner,
+            attempts=attempts + 1,
+        )
+
+    def renew(self, job: QueueJob, lease_seconds: float) -> bool:
+        """Extend the lease on ``job``; returns False if another worker now owns it."""
+        now = time.time()
+        with self.exclusive() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE cell_id = ? AND stage = ? AND status = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job.cell_id, job.stage, STATUS_LEASED, job.lease_owner),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job: QueueJob) -> bool:
+        """Return ``job`` to the queue unattempted, e.g. when its worker stops before running it.
+
+        Returns False when another worker has reclaimed the job.
+        """
+        with self.exclusive() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE cell_id = ? AND stage = ? AND status = ? AND lease_owner = ?",
+                (
+                    STATUS_PENDING,
+                    time.time(),
+                    job.cell_id,
+                    job.stage,
+                    STATUS_LEASED,
+                    job.lease_owner,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def complete(
+        self,
+        job: QueueJob,
+        next_stages: Iterable[str] = (),
+        payload: dict[str, Any] | None = None,
+    ) -> bool:
+        """Mark ``job`` done and enqueue the cell for each downstream stage.
+
+        Returns False, changing nothing, when ``job``'s lease lapsed and another
+        worker has reclaimed it.
+        """
+        now = time.time()
+        next_payload = dumps_json(payload if payload is not None else job.payload).decode()
+        with self.exclusive() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                "error = NULL, updated_at = ? "
+                "WHERE cell_id = ? AND stage = ? AND status = ? AND lease_owner = ?",
+                (STATUS_DONE, now, job.cell_id, job.stage, STATUS_LEASED, job.lease_owner),
+            )
+            if cursor.rowcount != 1:
+                logger.warning("Discarding result for %s/%s: lease lost", job.cell_id, job.stage)
+                return False
+            for stage in next_stages:
+                conn.execute(
+                    "INSERT OR IGNORE INTO jobs (cell_id, stage, status, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job.cell_id, stage, STATUS_PENDING, next_payload, now),
+                )
+        return True
+
+    def fail(self, job: QueueJob, error: str) -> bool:
+        """Release ``job`` for retry, or mark it failed once attempts are exhausted.
+
+        Like :meth:`complete`, returns False without touching a job whose lease
+        another worker now holds.
+        """
+        status = STATUS_FAILED if job.attempts >= self.max_attempts else STATUS_PENDING
+        with self.exclusive() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                "error = ?, updated_at = ? "
+                "WHERE cell_id = ? AND stage = ? AND status = ? AND lease_owner = ?",
+                (
+                    status,
+                    error,
+                    time.time(),
+                    job.cell_id,
+                    job.stage,
+                    STATUS_LEASED,
+                    job.lease_owner,
+                ),
+            )
+        if cursor.rowcount != 1:
+            logger.warning("Ignoring failure of %s/%s: lease lost", job.cell_id, job.stage)
+            return False
+        if status == STATUS_PENDING:
+            QUEUE_RETRIES.inc(stage=job.stage)
+        logger.warning(
+            "Job %s/%s failed (attempt %s, now %s): %s",
+            job.cell_id,
+            job.stage,
+            job.attempts,
+            status,
+            error,
+        )
+        return True
+
+    def claim_publication(self, owner: str) -> bool:
+        """Return True for exactly one caller once the queue has drained.
+
+        The winner publishes the report; the claim is cleared when new jobs are
+        enqueued.
+        """
+        with self.exclusive() as conn:
+            if self._has_open_jobs(conn):
+                return False
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO publication (id, owner, published_at) VALUES (1, ?, ?)",
+                (owner, time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, dict[str, int]]:
+        """Return job counts grouped by stage and status."""
+        summary: dict[str, dict[str, int]] = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status"
+            ).fetchall()
+        for stage, status, count in rows:
+            summary.setdefault(stage, {})[status] = count
+        return summary
+
+    def has_open_jobs(self) -> bool:
+        """Return True while any job is pending or leased."""
+        with self._lock:
+            return self._has_open_jobs(self._conn)
+
+    def completed_payloads(self, stage: str) -> list[dict[str, Any]]:
+        """Return the payloads of every completed job for ``stage``, ordered by cell ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM jobs WHERE stage = ? AND status = ? ORDER BY cell_id",
+                (stage, STATUS_DONE),
+            ).fetchall()
+        return [loads_json(payload) for (payload,) in rows]
+
+    @staticmethod
+    def _has_open_jobs(conn: sqlite3.Connection) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1",
+            (STATUS_PENDING, STATUS_LEASED),
+        ).fetchone()
+        return row is not None
+
+
+__all__ = ["QueueJob", "WorkQueue"]
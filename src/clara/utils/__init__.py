@@ -11,6 +11,8 @@ from .cl_validation_config import (
     load_validation_settings,
 )
 from .io_utils import read_json, read_text, write_json, write_text
+from .tracing import Tracer, trace_span
+from .usage import PriceTable, UsageLedger
 from .validation_models import CellTypeInfo, PaperQAResult, ValidationState
 
 
@@ -45,6 +47,10 @@ __all__ = [
     "CellTypeInfo",
     "PaperQAResult",
     "ValidationState",
+    "Tracer",
+    "PriceTable",
+    "UsageLedger",
+    "trace_span",
     "read_json",
     "write_json",
     "read_text",
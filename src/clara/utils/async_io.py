@@ -0,0 +1,96 @@
+"""Run blocking disk I/O off the event loop on a bounded thread pool."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from .io_utils import read_json, read_text, write_json, write_text
+from .profiling import profile_offloaded
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+DEFAULT_IO_WORKERS = 8
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """Return the shared I/O pool, sized by ``CLARA_IO_WORKERS`` (default 8)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.environ.get("CLARA_IO_WORKERS", DEFAULT_IO_WORKERS))
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="clara-io"
+            )
+        return _executor
+
+
+def shutdown_io_executor() -> None:
+    """Wait for pending I/O and release the pool; a new one is created on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_io(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run ``func`` on the I/O pool and await its result.
+
+    The caller's context variables (active tracer, usage ledger) are carried
+    into the worker thread, so spans and usage recorded there stay attributed.
+    Inside a CPU-profiled graph node the call is profiled into that node.
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    call = partial(context.run, profile_offloaded(func), *args, **kwargs)
+    return await loop.run_in_executor(io_executor(), call)
+
+
+async def path_exists(path: Path) -> bool:
+    """``Path.exists`` without blocking the loop on slow or network filesystems."""
+    return await run_io(path.exists)
+
+
+async def read_json_async(path: Path, into: Callable[[Any], T] | None = None) -> Any:
+    """Async :func:`~clara.utils.io_utils.read_json`."""
+    return await run_io(read_json, path, into)
+
+
+async def write_json_async(path: Path, payload: Any, *, pretty: bool = False) -> None:
+    """Async :func:`~clara.utils.io_utils.write_json`."""
+    await run_io(write_json, path, payload, pretty=pretty)
+
+
+async def read_text_async(path: Path) -> str:
+    """Async :func:`~clara.utils.io_utils.read_text`."""
+    return await run_io(read_text, path)
+
+
+async def write_text_async(path: Path, content: str) -> None:
+    """Async :func:`~clara.utils.io_utils.write_text`."""
+    await run_io(write_text, path, content)
+
+
+__all__ = [
+    "DEFAULT_IO_WORKERS",
+    "io_executor",
+    "path_exists",
+    "read_json_async",
+    "read_text_async",
+    "run_io",
+    "shutdown_io_executor",
+    "write_json_async",
+    "write_text_async",
+]
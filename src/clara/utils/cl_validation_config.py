@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 DEFAULT_CELL_DATA_DIR = "/Users/hk9/workspaces/workspace1/agentic-pipeline-testdata/data"
@@ -17,6 +17,8 @@ DEFAULT_TEST_TERMS = (
     "CL_4033084",
 )
 DEFAULT_FALSE_ASSERTION_PROBABILITY = 0.6
+# Stages whose agent calls can be routed through a model cascade.
+MODEL_CASCADE_STAGES = ("seed", "paperqa", "convert")
 
 
 def _env_bool(env: Mapping[str, str], key: str, default: bool) -> bool:
@@ -61,6 +63,68 @@ class ValidationPaths:
     paperqa_markdown_dir: Path
     paperqa_json_dir: Path
 
+    @classmethod
+    def from_cell_data_dir(cls, cell_data_dir: Path) -> ValidationPaths:
+        """Build the standard layout under ``cell_data_dir``.
+
+        The dataset is ``cells_data.json``, or ``cells_data.jsonl`` when only
+        the JSON Lines file exists.
+        """
+        dataset_file = cell_data_dir / "cells_data.json"
+        jsonl_dataset_file = dataset_file.with_suffix(".jsonl")
+        if not dataset_file.exists() and jsonl_dataset_file.exists():
+            dataset_file = jsonl_dataset_file
+        output_dir = cell_data_dir / "output"
+        return cls(
+            cell_data_dir=cell_data_dir,
+            dataset_file=dataset_file,
+            references_dir=cell_data_dir / "reference",
+            output_dir=output_dir,
+            false_definitions_file=output_dir / "cells_false_data.json",
+            paperqa_markdown_dir=output_dir,
+            paperqa_json_dir=output_dir / "pqa_jsons",
+        )
+
+    @property
+    def report_file(self) -> Path:
+        """Curator-facing TSV report produced by the final workflow stage."""
+        return self.output_dir / "cell_type_validation_report.tsv"
+
+    @property
+    def partial_report_file(self) -> Path:
+        """Report rows appended while a run is in progress, before the final snapshot."""
+        return self.output_dir / "cell_type_validation_report.partial.tsv"
+
+    @property
+    def work_queue_file(self) -> Path:
+        """SQLite database backing the multi-worker job queue."""
+        return self.output_dir / "work_queue.sqlite3"
+
+    @property
+    def usage_summary_file(self) -> Path:
+        """Run-level token usage and cost summary."""
+        return self.output_dir / "usage_summary.json"
+
+    @property
+    def usage_by_cell_file(self) -> Path:
+        """Per-cell token usage and cost sidecar (JSON lines)."""
+        return self.output_dir / "usage_by_cell.jsonl"
+
+    @property
+    def assertion_verdicts_file(self) -> Path:
+        """Per-assertion PaperQA verdicts (JSON lines) reused across cells and edits."""
+        return self.output_dir / "assertion_verdicts.jsonl"
+
+    @property
+    def batch_dir(self) -> Path:
+        """Batch-job input and output files written in bulk-batch mode."""
+        return self.output_dir / "batches"
+
+    @property
+    def profiles_dir(self) -> Path:
+        """Per-node CPU profiles and allocation reports written in profiling mode."""
+        return self.output_dir / "profiles"
+
     def ensure_directories(self) -> None:
         """Create output and cache directories if they do not already exist."""
         for path in (self.output_dir, self.paperqa_markdown_dir, self.paperqa_json_dir):
@@ -75,27 +139,25 @@ class ValidationSettings:
     is_test_mode: bool
     test_terms: Sequence[str]
     false_assertion_probability: float
+    report_columnar_format: str | None = None
+    price_table_file: Path | None = None
+    token_budget: int | None = None
+    cost_budget_usd: float | None = None
+    false_assertion_batch_size: int = 1
+    batch_poll_seconds: float = 60.0
+    stream_responses: bool = False
+    # Cheaper models tried, in order, before each stage's configured model.
+    model_cascades: Mapping[str, Sequence[str]] = field(default_factory=dict)
+    assertion_verdict_cache: bool = False
+    # Makes each cell's seeding decision a function of this seed and its CL ID.
+    seeding_seed: int | None = None
 
 
 def load_validation_settings(env: Mapping[str, str] | None = None) -> ValidationSettings:
     """Load workflow configuration, falling back to legacy defaults."""
     env = env or os.environ
     cell_data_dir = _as_path(env.get("CLARA_CELL_DATA_DIR"), DEFAULT_CELL_DATA_DIR)
-    dataset_file = cell_data_dir / "cells_data.json"
-    references_dir = cell_data_dir / "reference"
-    output_dir = cell_data_dir / "output"
-    false_definitions_file = output_dir / "cells_false_data.json"
-    pqa_json_dir = output_dir / "pqa_jsons"
-
-    paths = ValidationPaths(
-        cell_data_dir=cell_data_dir,
-        dataset_file=dataset_file,
-        references_dir=references_dir,
-        output_dir=output_dir,
-        false_definitions_file=false_definitions_file,
-        paperqa_markdown_dir=output_dir,
-        paperqa_json_dir=pqa_json_dir,
-    )
+    paths = ValidationPaths.from_cell_data_dir(cell_data_dir)
 
     is_test_mode = _env_bool(env, "CLARA_IS_TEST_MODE", False)
     test_terms = _env_list(env, "CLARA_TEST_TERMS", DEFAULT_TEST_TERMS)
@@ -105,11 +167,31 @@ def load_validation_settings(env: Mapping[str, str] | None = None) -> Validation
         DEFAULT_FALSE_ASSERTION_PROBABILITY,
     )
 
+    price_table = env.get("CLARA_PRICE_TABLE")
+    token_budget = env.get("CLARA_TOKEN_BUDGET")
+    cost_budget = env.get("CLARA_COST_BUDGET_USD")
+    batch_size = env.get("CLARA_FALSE_ASSERTION_BATCH_SIZE")
+    seeding_seed = env.get("CLARA_SEEDING_SEED")
+
     return ValidationSettings(
         paths=paths,
         is_test_mode=is_test_mode,
         test_terms=test_terms,
         false_assertion_probability=probability,
+        report_columnar_format=env.get("CLARA_REPORT_COLUMNAR_FORMAT") or None,
+        price_table_file=_as_path(price_table, price_table) if price_table else None,
+        token_budget=int(token_budget) if token_budget else None,
+        cost_budget_usd=_env_float(env, "CLARA_COST_BUDGET_USD", 0.0) if cost_budget else None,
+        false_assertion_batch_size=max(1, int(batch_size)) if batch_size else 1,
+        batch_poll_seconds=_env_float(env, "CLARA_BATCH_POLL_SECONDS", 60.0),
+        stream_responses=_env_bool(env, "CLARA_STREAM_RESPONSES", False),
+        seeding_seed=int(seeding_seed) if seeding_seed else None,
+        assertion_verdict_cache=_env_bool(env, "CLARA_ASSERTION_VERDICT_CACHE", False),
+        model_cascades={
+            stage: models
+            for stage in MODEL_CASCADE_STAGES
+            if (models := _env_list(env, f"CLARA_{stage.upper()}_MODEL_CASCADE", ()))
+        },
     )
 
 
@@ -3,21 +3,175 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar, overload
 
+logger = logging.getLogger(__name__)
 
-def read_json(path: Path) -> Any:
-    """Load a JSON payload from disk."""
+T = TypeVar("T")
+
+STREAM_CHUNK_SIZE = 1 << 16
+JSON_BACKENDS = ("orjson", "stdlib")
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class JsonCodec:
+    """Standard-library JSON encoding; the fallback when no fast backend is installed."""
+
+    name = "stdlib"
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, payload: Any, *, pretty: bool = False) -> bytes:
+        if pretty:
+            text = json.dumps(payload, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        return text.encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON encoding backed by ``orjson`` (install it to enable)."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, payload: Any, *, pretty: bool = False) -> bytes:
+        option = self._orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= self._orjson.OPT_INDENT_2
+        return self._orjson.dumps(payload, option=option)
+
+
+_codec: JsonCodec | None = None
+
+
+def json_codec() -> JsonCodec:
+    """Return the active codec, choosing it on first use.
+
+    ``CLARA_JSON_BACKEND`` selects ``orjson`` or ``stdlib`` explicitly;
+    otherwise orjson is used when it is installed.
+    """
+    global _codec
+    if _codec is None:
+        _codec = set_json_codec(os.environ.get("CLARA_JSON_BACKEND"))
+    return _codec
+
+
+def set_json_codec(name: str | None = None) -> JsonCodec:
+    """Select the JSON backend by name; ``None`` or ``"auto"`` prefers orjson."""
+    global _codec
+    if name not in (None, "", "auto", *JSON_BACKENDS):
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {JSON_BACKENDS}.")
+    if name == "stdlib":
+        _codec = JsonCodec()
+        return _codec
+    try:
+        _codec = OrjsonCodec()
+    except ImportError:
+        if name == "orjson":
+            raise
+        _codec = JsonCodec()
+    logger.debug("Using %s JSON backend", _codec.name)
+    return _codec
+
+
+@overload
+def loads_json(data: bytes | str, into: None = None) -> Any: ...
+
+
+@overload
+def loads_json(data: bytes | str, into: Callable[[Any], T]) -> T: ...
+
+
+def loads_json(data: bytes | str, into: Callable[[Any], T] | None = None) -> Any:
+    """Decode JSON, optionally passing the result straight to ``into`` (e.g. a model factory)."""
+    payload = json_codec().loads(data)
+    return into(payload) if into else payload
+
+
+def dumps_json(payload: Any, *, pretty: bool = False) -> bytes:
+    """Encode ``payload`` as UTF-8 JSON; compact unless ``pretty`` is set."""
+    return json_codec().dumps(payload, pretty=pretty)
+
+
+@overload
+def read_json(path: Path, into: None = None) -> Any: ...
+
+
+@overload
+def read_json(path: Path, into: Callable[[Any], T]) -> T: ...
+
+
+def read_json(path: Path, into: Callable[[Any], T] | None = None) -> Any:
+    """Load a JSON payload from disk, optionally decoding it ``into`` a model."""
+    return loads_json(path.read_bytes(), into)
+
+
+def iter_json_object(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple[str, Any]]:
+    """Yield the ``(key, value)`` pairs of a top-level JSON object without loading it whole.
+
+    The file is read in ``chunk_size`` pieces and each member is decoded as
+    soon as it is complete, so memory stays bounded by the largest single
+    value rather than the whole document. Incremental decoding relies on the
+    stdlib decoder, so this path does not use the fast backend.
+    """
     with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        reader = _ChunkReader(handle, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expected a string key", reader.buffer, reader.pos)
+            reader.expect(":")
+            yield key, reader.decode()
+            separator = reader.next_char()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expected ',' or '}'", reader.buffer, reader.pos)
+
+
+@overload
+def iter_jsonl(path: Path, into: None = None) -> Iterator[Any]: ...
+
 
+@overload
+def iter_jsonl(path: Path, into: Callable[[Any], T]) -> Iterator[T]: ...
 
-def write_json(path: Path, payload: Any) -> None:
-    """Persist a JSON payload to disk."""
+
+def iter_jsonl(path: Path, into: Callable[[Any], T] | None = None) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line of a JSON Lines file."""
+    codec = json_codec()
+    with path.open("rb") as handle:
+        for line in handle:
+            if line.strip():
+                payload = codec.loads(line)
+                yield into(payload) if into else payload
+
+
+def write_json(path: Path, payload: Any, *, pretty: bool = False) -> None:
+    """Persist a JSON payload to disk.
+
+    Output is compact by default, which suits machine-only caches; pass
+    ``pretty=True`` for files people are expected to read.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+    path.write_bytes(dumps_json(payload, pretty=pretty))
 
 
 def read_text(path: Path) -> str:
@@ -33,4 +187,71 @@ def write_text(path: Path, content: str) -> None:
         handle.write(content)
 
 
-__all__ = ["read_json", "write_json", "read_text", "write_text"]
+class _ChunkReader:
+    """Rolling text buffer that decodes JSON values across chunk boundaries."""
+
+    def __init__(self, handle: Any, chunk_size: int) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of data", self.buffer, self.pos)
+
+    def next_char(self) -> str:
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, char: str) -> None:
+        if self.next_char() != char:
+            raise json.JSONDecodeError(f"Expected {char!r}", self.buffer, self.pos - 1)
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+__all__ = [
+    "JSON_BACKENDS",
+    "JsonCodec",
+    "OrjsonCodec",
+    "dumps_json",
+    "iter_json_object",
+    "iter_jsonl",
+    "json_codec",
+    "loads_json",
+    "read_json",
+    "set_json_codec",
+    "write_json",
+    "read_text",
+    "write_text",
+]
@@ -0,0 +1,319 @@
+"""Process-wide operational metrics with Prometheus text exposition."""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+LabelValues = tuple[str, ...]
+DEFAULT_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = lock
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _format_labels(self, values: LabelValues, extra: dict[str, str] | None = None) -> str:
+        pairs = list(zip(self.label_names, values, strict=True)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return "{" + body + "}"
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Yield the metric's exposition lines, one per label set."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{self._format_labels(key)} {_number(value)}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def replace(self, values: dict[LabelValues, float]) -> None:
+        """Swap in a complete set of labelled values (used by collectors)."""
+        with self._lock:
+            self._values = dict(values)
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations, e.g. request latency in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterable[str]:
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                labels = self._format_labels(key, {"le": le})
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._format_labels(key)} {_number(self._sums[key])}"
+            yield f"{self.name}_count{self._format_labels(key)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that refresh gauges at exposition time."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels, self._lock))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels, self._lock))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, self._lock, buckets=buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before each exposition, e.g. to sample queue depths."""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception:  # pragma: no cover - a broken collector must not stop exposition
+                logger.exception("Metrics collector failed")
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            with self._lock:
+                lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """Atomically write the exposition to ``path`` (node_exporter textfile format)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _register(self, metric: Any) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} already registered as {existing.kind}.")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+CELLS_COMPLETED = REGISTRY.counter(
+    "clara_cells_completed_total", "Cells that finished a workflow stage.", ["stage"]
+)
+AGENT_CALLS_IN_FLIGHT = REGISTRY.gauge(
+    "clara_agent_calls_in_flight", "Agent calls currently awaiting a response.", ["stage"]
+)
+AGENT_CALL_SECONDS = REGISTRY.histogram(
+    "clara_agent_call_seconds", "Agent call latency in seconds.", ["stage", "model"]
+)
+AGENT_CALL_ERRORS = REGISTRY.counter(
+    "clara_agent_call_errors_total", "Agent calls that raised an error.", ["stage"]
+)
+AGENT_INPUT_TOKENS = REGISTRY.counter(
+    "clara_agent_input_tokens_total",
+    "Agent input tokens by stage, split into provider prompt-cache hits and misses.",
+    ["stage", "cache"],
+)
+AGENT_STREAM_ABORTS = REGISTRY.counter(
+    "clara_agent_stream_aborts_total",
+    "Streamed agent responses abandoned early as malformed.",
+    ["stage"],
+)
+MODEL_ROUTING = REGISTRY.counter(
+    "clara_model_routing_total",
+    "Model-cascade tier outcomes (accepted or escalated) by stage and model.",
+    ["stage", "model", "outcome"],
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "clara_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"]
+)
+QUEUE_RETRIES = REGISTRY.counter(
+    "clara_queue_retries_total", "Queue jobs released for another attempt.", ["stage"]
+)
+QUEUE_JOBS = REGISTRY.gauge(
+    "clara_queue_jobs", "Work-queue jobs by stage and status.", ["stage", "status"]
+)
+NODE_SECONDS = REGISTRY.gauge(
+    "clara_node_seconds", "Duration of the most recent run of each graph node.", ["node"]
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one cache lookup as a hit or a miss."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class MetricsTextfileWriter:
+    """Periodically rewrite a Prometheus text file from a background thread."""
+
+    def __init__(
+        self, path: Path, *, interval: float = 15.0, registry: MetricsRegistry = REGISTRY
+    ) -> None:
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> MetricsTextfileWriter:
+        self._thread = threading.Thread(target=self._loop, name="clara-metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop refreshing and write a final snapshot."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.registry.write_textfile(self.path)
+
+    def __enter__(self) -> MetricsTextfileWriter:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.registry.write_textfile(self.path)
+            except OSError:  # pragma: no cover - keep the run alive on transient disk errors
+                logger.exception("Failed to write metrics to %s", self.path)
+            self._stop.wait(self.interval)
+
+
+def start_metrics_server(
+    host: str = "127.0.0.1", port: int = 9464, registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` on a daemon thread; call ``shutdown()`` to stop."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return None
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="clara-metrics-http", daemon=True).start()
+    return server
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "MetricsTextfileWriter",
+    "REGISTRY",
+    "record_cache_lookup",
+    "start_metrics_server",
+]
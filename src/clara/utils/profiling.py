@@ -0,0 +1,186 @@
+"""Per-node CPU and memory profiling for workflow graph runs."""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .io_utils import write_json
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class _OffloadedProfiles:
+    """cProfile runs of the calls a profiled node hands to the I/O thread pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.profiles: list[cProfile.Profile] = []
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler, which then sees every thread.
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self.profiles.append(profiler)
+
+
+_offloaded: contextvars.ContextVar[_OffloadedProfiles | None] = contextvars.ContextVar(
+    "clara_offloaded_profiles", default=None
+)
+
+
+def profile_offloaded(func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``func`` so that, run on another thread, it is profiled into the current node.
+
+    Outside a CPU-profiled node ``func`` is returned unchanged.
+    """
+    profiles = _offloaded.get()
+    return func if profiles is None else partial(profiles.call, func)
+
+
+@dataclass
+class NodeProfile:
+    """Headline numbers for one profiled node; details live in the written files."""
+
+    node: str
+    wall_seconds: float
+    cpu_seconds: float | None = None
+    peak_memory_bytes: int | None = None
+    net_allocated_bytes: int | None = None
+    cpu_profile: str | None = None
+    allocation_report: str | None = None
+
+
+class NodeProfiler:
+    """Wrap graph nodes in ``cProfile`` and ``tracemalloc`` and write reports per node.
+
+    For each node ``<node>.prof`` (pstats, viewable with snakeviz or
+    ``python -m pstats``), ``<node>.cpu.txt`` (top functions by cumulative
+    time) and ``<node>.alloc.txt`` (top allocation sites still alive when the
+    node finished) are written to ``output_dir``, plus ``summary.json``.
+
+    Work the node runs through :func:`~clara.utils.async_io.run_io` is
+    profiled on its pool thread and merged into the node's CPU profile.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        *,
+        cpu: bool = True,
+        memory: bool = True,
+        top: int = 30,
+    ) -> None:
+        self.output_dir = output_dir
+        self.cpu = cpu
+        self.memory = memory
+        self.top = top
+        self.profiles: list[NodeProfile] = []
+
+    @contextmanager
+    def profile_node(self, node_id: str) -> Iterator[NodeProfile]:
+        """Profile the enclosed block as graph node ``node_id``."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        record = NodeProfile(node=node_id, wall_seconds=0.0)
+        started_tracing = False
+        before: tracemalloc.Snapshot | None = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+        profiler = cProfile.Profile() if self.cpu else None
+        offloaded = _OffloadedProfiles() if self.cpu else None
+        token = _offloaded.set(offloaded)
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            _offloaded.reset(token)
+            record.wall_seconds = time.perf_counter() - started
+            record.cpu_seconds = time.process_time() - cpu_started
+            if profiler and offloaded:
+                record.cpu_profile = self._write_cpu_profile(node_id, profiler, offloaded.profiles)
+            if before is not None:
+                after = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+                record.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+                record.allocation_report, record.net_allocated_bytes = self._write_allocations(
+                    node_id, before, after
+                )
+                if started_tracing:
+                    tracemalloc.stop()
+            self.profiles.append(record)
+
+    def write_summary(self) -> Path:
+        """Write ``summary.json`` listing every profiled node."""
+        path = self.output_dir / "summary.json"
+        write_json(path, {"nodes": [asdict(record) for record in self.profiles]}, pretty=True)
+        logger.info("Profiles for %s nodes written to %s", len(self.profiles), self.output_dir)
+        return path
+
+    def _write_cpu_profile(
+        self, node_id: str, profiler: cProfile.Profile, offloaded: list[cProfile.Profile]
+    ) -> str:
+        stats_path = self.output_dir / f"{node_id}.prof"
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        for thread_profile in offloaded:
+            stats.add(thread_profile)
+        stats.dump_stats(stats_path)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        (self.output_dir / f"{node_id}.cpu.txt").write_text(buffer.getvalue(), encoding="utf-8")
+        return stats_path.name
+
+    def _write_allocations(
+        self, node_id: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+    ) -> tuple[str, int]:
+        differences = after.compare_to(before, "lineno")
+        net = sum(stat.size_diff for stat in differences)
+        lines = [f"Net allocated: {net} bytes", ""]
+        for stat in differences[: self.top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size_diff:+12d} B {stat.count_diff:+8d} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        path = self.output_dir / f"{node_id}.alloc.txt"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path.name, net
+
+
+__all__ = ["NodeProfile", "NodeProfiler", "profile_offloaded"]
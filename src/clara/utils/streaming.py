@@ -0,0 +1,213 @@
+"""Incremental parsers for streamed agent responses.
+
+Each parser is fed text deltas as they arrive and returns whatever became
+complete. JSON parsers raise :class:`MalformedResponseError` as soon as the
+response can no longer be valid, so the stream can be abandoned before the
+rest of a doomed response is generated (and billed).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+_FENCE = "```"
+
+
+class MalformedResponseError(ValueError):
+    """Raised when a streamed response is clearly not in the requested format."""
+
+
+class MarkdownTableParser:
+    """Parse markdown table rows out of a response as its lines complete.
+
+    The first table row is taken as the header; later rows are returned as
+    dicts keyed by the header cells. Text outside the table and the
+    ``| --- |`` separator row are skipped.
+    """
+
+    def __init__(self) -> None:
+        self.header: list[str] | None = None
+        self._pending = ""
+
+    def feed(self, text: str) -> list[dict[str, str]]:
+        """Add ``text`` and return the rows whose line is now complete."""
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> list[dict[str, str]]:
+        """Parse the final line, which may lack a trailing newline."""
+        pending, self._pending = self._pending, ""
+        return self._parse_lines([pending])
+
+    def _parse_lines(self, lines: list[str]) -> list[dict[str, str]]:
+        rows: list[dict[str, str]] = []
+        for line in lines:
+            cells = _split_table_row(line)
+            if cells is None or all(set(cell) <= set("-: ") for cell in cells):
+                continue
+            if self.header is None:
+                self.header = cells
+                continue
+            padded = cells + [""] * (len(self.header) - len(cells))
+            rows.append(dict(zip(self.header, padded, strict=False)))
+        return rows
+
+
+class _JsonStream:
+    """Shared prefix handling: skip whitespace and a code fence, then demand ``opening``."""
+
+    opening = "{"
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+
+    def _start(self) -> bool:
+        """Consume the prefix; return False while more text is needed to decide."""
+        if self._started:
+            return True
+        stripped = self._buffer.lstrip()
+        if _FENCE.startswith(stripped) and len(stripped) < len(_FENCE):
+            return False
+        if stripped.startswith(_FENCE):
+            newline = stripped.find("\n")
+            if newline < 0:
+                return False
+            stripped = stripped[newline + 1 :].lstrip()
+        if not stripped:
+            return False
+        if stripped[0] != self.opening:
+            raise MalformedResponseError(
+                f"Expected JSON starting with '{self.opening}', got {stripped[:40]!r}."
+            )
+        self._buffer = stripped
+        self._pos = 1
+        self._started = True
+        return True
+
+
+class JsonObjectStreamGuard(_JsonStream):
+    """Abort a streamed response that does not start with a JSON object."""
+
+    def feed(self, text: str) -> None:
+        self._buffer += text
+        if not self._started:
+            self._start()
+
+
+class JsonArrayStreamParser(_JsonStream):
+    """Yield the objects of a streamed JSON array as each one completes.
+
+    Anything other than objects separated by commas inside the array, such
+    as leading prose or a bare value, raises :class:`MalformedResponseError`.
+    """
+
+    opening = "["
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.done = False
+        self._expect_separator = False
+        self._need_object = False
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """Add ``text`` and return the objects completed by it."""
+        self._buffer += text
+        if self.done or not self._start():
+            return []
+        objects: list[dict[str, Any]] = []
+        while (item := self._next_object()) is not None:
+            objects.append(item)
+        return objects
+
+    def close(self) -> None:
+        """Raise unless the array was closed."""
+        if not self.done:
+            raise MalformedResponseError("Response ended before the JSON array was closed.")
+
+    def _next_object(self) -> dict[str, Any] | None:
+        buffer = self._buffer
+        pos = _skip_whitespace(buffer, self._pos)
+        if pos >= len(buffer):
+            return None
+        if buffer[pos] == "]" and not self._need_object:
+            self.done = True
+            return None
+        if self._expect_separator:
+            if buffer[pos] != ",":
+                raise MalformedResponseError(
+                    f"Expected ',' or ']' in JSON array, got {buffer[pos]!r}."
+                )
+            self._expect_separator = False
+            self._need_object = True
+            self._pos = pos + 1
+            pos = _skip_whitespace(buffer, self._pos)
+            if pos >= len(buffer):
+                return None
+        if buffer[pos] != "{":
+            raise MalformedResponseError(
+                f"Expected a JSON object in the array, got {buffer[pos]!r}."
+            )
+        end = _object_end(buffer, pos)
+        if end is None:
+            self._pos = pos
+            return None
+        try:
+            item = json.loads(buffer[pos:end])
+        except json.JSONDecodeError as exc:
+            raise MalformedResponseError(f"Invalid JSON object in array: {exc}") from exc
+        # Drop consumed text so long responses are not rescanned from the start.
+        self._buffer = buffer[end:]
+        self._pos = 0
+        self._expect_separator = True
+        self._need_object = False
+        return item
+
+
+def _split_table_row(line: str) -> list[str] | None:
+    stripped = line.strip()
+    if not stripped.startswith("|") or len(stripped) < 2:
+        return None
+    return [cell.strip() for cell in stripped.strip("|").split("|")]
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _object_end(text: str, start: int) -> int | None:
+    """Return the index just past the object starting at ``start``, or None if incomplete."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return None
+
+
+__all__ = [
+    "JsonArrayStreamParser",
+    "JsonObjectStreamGuard",
+    "MalformedResponseError",
+    "MarkdownTableParser",
+]
@@ -0,0 +1,168 @@
+"""Lightweight span tracing with Chrome trace (``chrome://tracing``/Perfetto) export."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation with attributes, nested under the span active when it started."""
+
+    name: str
+    category: str
+    span_id: int
+    parent_id: int | None
+    track: str
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_seconds(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e9
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes discovered while the span is running (cache hit, sizes, ...)."""
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is disabled, so call sites need no branching."""
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_current_tracer: ContextVar[Tracer | None] = ContextVar("clara_tracer", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("clara_span", default=None)
+
+
+class Tracer:
+    """Collect finished spans for one run.
+
+    Spans nest through context variables, so concurrent asyncio tasks each
+    keep their own parent chain; every task is rendered as its own track.
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator[Tracer]:
+        """Make this tracer the target of :func:`trace_span` within the block."""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def span(self, name: str, category: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block as a child of the current span."""
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            category=category,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent else None,
+            track=_current_track(),
+            start_ns=time.perf_counter_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set(error=type(exc).__name__)
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return span counts and total seconds per category."""
+        totals: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            bucket = totals.setdefault(span.category, {"count": 0, "seconds": 0.0})
+            bucket["count"] += 1
+            bucket["seconds"] += span.duration_seconds
+        return totals
+
+    def export_chrome_trace(self, path: Path) -> Path:
+        """Write spans as Chrome trace events, viewable in Perfetto or ``chrome://tracing``."""
+        pid = os.getpid()
+        tracks: dict[str, int] = {}
+        events: list[dict[str, Any]] = []
+        for span in sorted(self.spans, key=lambda item: item.start_ns):
+            tid = tracks.setdefault(span.track, len(tracks) + 1)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start_ns - self._origin_ns) / 1000,
+                    "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {
+                        **span.attributes,
+                        "span_id": span.span_id,
+                        "parent_id": span.parent_id,
+                    },
+                }
+            )
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}}
+            for track, tid in tracks.items()
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle, default=str)
+        return path
+
+
+def current_tracer() -> Tracer | None:
+    """Return the tracer active in this context, if any."""
+    return _current_tracer.get()
+
+
+def trace_span(
+    name: str, category: str = "workflow", **attributes: Any
+) -> AbstractContextManager[Span | _NullSpan]:
+    """Open a span on the active tracer, or a no-op context when tracing is off."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return nullcontext(_NULL_SPAN)
+    return tracer.span(name, category, **attributes)
+
+
+def _current_track() -> str:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return task.get_name()
+    return threading.current_thread().name
+
+
+__all__ = ["Span", "Tracer", "current_tracer", "trace_span"]
@@ -0,0 +1,429 @@
+"""Token usage capture, per-cell/stage/model attribution and cost estimates."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .io_utils import dumps_json, read_json, write_json
+
+# Attribute names used by pydantic-ai ``Usage`` objects across releases.
+_USAGE_FIELDS = {
+    "input_tokens": ("input_tokens", "request_tokens"),
+    "output_tokens": ("output_tokens", "response_tokens"),
+    "cache_read_tokens": ("cache_read_tokens",),
+    "requests": ("requests",),
+}
+
+# USD per million tokens. Estimates only; override with CLARA_PRICE_TABLE.
+DEFAULT_PRICE_TABLE: dict[str, dict[str, float]] = {
+    "gpt-4.1": {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+}
+
+UNKNOWN_MODEL = "unknown"
+# Usage sent through a provider batch API is recorded under "<model>@batch" and,
+# unless the price table lists that name, priced at this fraction of live rates.
+BATCH_MODEL_SUFFIX = "@batch"
+BATCH_PRICE_FACTOR = 0.5
+CHARS_PER_TOKEN = 4
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised before an agent call once the run's token or cost budget is spent."""
+
+
+@dataclass
+class UsageBudget:
+    """Hard limits on total tokens (input + output) and estimated cost for one run."""
+
+    max_tokens: int | None = None
+    max_cost_usd: float | None = None
+
+    def __bool__(self) -> bool:
+        return self.max_tokens is not None or self.max_cost_usd is not None
+
+
+def usage_from_result(result: Any) -> dict[str, int]:
+    """Return the token usage reported by an agent run result as plain integers.
+
+    Missing or unreported counters are omitted so callers can tell "zero" from
+    "unknown".
+    """
+    usage = getattr(result, "usage", None)
+    if callable(usage):
+        usage = usage()
+    if usage is None:
+        return {}
+    counters: dict[str, int] = {}
+    for name, candidates in _USAGE_FIELDS.items():
+        for candidate in candidates:
+            value = getattr(usage, candidate, None)
+            if isinstance(value, int):
+                counters[name] = value
+                break
+    details = getattr(usage, "details", None)
+    if "cache_read_tokens" not in counters and isinstance(details, Mapping):
+        cached = details.get("cached_tokens")
+        if isinstance(cached, int):
+            counters["cache_read_tokens"] = cached
+    return counters
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    """Token counters for one group of agent calls."""
+
+    calls: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    calls_without_usage: int = 0
+
+    def add(self, usage: Mapping[str, int]) -> None:
+        self.calls += 1
+        if not usage:
+            self.calls_without_usage += 1
+            return
+        self.requests += usage.get("requests", 1)
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.cache_read_tokens += usage.get("cache_read_tokens", 0)
+
+    @property
+    def cached_input_ratio(self) -> float:
+        """Fraction of input tokens the provider served from its prompt cache."""
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def merge(self, other: UsageTotals) -> None:
+        # Explicit adds: this runs several times per agent call, and asdict() is slow.
+        self.calls += other.calls
+        self.requests += other.requests
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.calls_without_usage += other.calls_without_usage
+
+
+@dataclass
+class RoutingTotals:
+    """Model-cascade outcomes for one stage.
+
+    ``accepted`` and ``escalated`` count calls per model. ``savings_usd``
+    estimates what accepted cheaper-tier calls saved over sending the same
+    tokens to the stage's final model, net of escalated calls' wasted cost.
+    """
+
+    accepted: dict[str, int] = field(default_factory=dict)
+    escalated: dict[str, int] = field(default_factory=dict)
+    savings_usd: float = 0.0
+
+
+class PriceTable:
+    """Per-million-token prices keyed by model name, with or without a provider prefix."""
+
+    def __init__(self, prices: Mapping[str, Mapping[str, float]] | None = None) -> None:
+        self.prices = {name: dict(entry) for name, entry in (prices or DEFAULT_PRICE_TABLE).items()}
+
+    @classmethod
+    def load(cls, path: Path | None) -> PriceTable:
+        """Read a JSON price table (``{"model": {"input": .., "output": .., ...}}``)."""
+        if path is None:
+            return cls()
+        return cls(read_json(path))
+
+    def lookup(self, model: str) -> Mapping[str, float] | None:
+        return self.prices.get(model) or self.prices.get(model.split(":", 1)[-1])
+
+    def cost(self, model: str, totals: UsageTotals) -> float | None:
+        """Estimated USD cost of ``totals`` for ``model``; ``None`` if the model is unpriced."""
+        factor = 1.0
+        price = self.lookup(model)
+        if price is None and model.endswith(BATCH_MODEL_SUFFIX):
+            price = self.lookup(model.removesuffix(BATCH_MODEL_SUFFIX))
+            factor = BATCH_PRICE_FACTOR
+        if price is None:
+            return None
+        cached = min(totals.cache_read_tokens, totals.input_tokens)
+        cached_price = price.get("cached_input", price.get("input", 0.0))
+        return (
+            (
+                (totals.input_tokens - cached) * price.get("input", 0.0)
+                + cached * cached_price
+                + totals.output_tokens * price.get("output", 0.0)
+            )
+            * factor
+            / 1_000_000
+        )
+
+
+_current_ledger: ContextVar[UsageLedger | None] = ContextVar("clara_usage_ledger", default=None)
+
+
+class UsageLedger:
+    """Aggregate agent usage by ``(cell, stage, model)`` for one run."""
+
+    def __init__(self, prices: PriceTable | None = None, budget: UsageBudget | None = None) -> None:
+        self.prices = prices or PriceTable()
+        self.budget = budget or UsageBudget()
+        self.entries: dict[tuple[str, str, str], UsageTotals] = {}
+        self.total = UsageTotals()
+        self.cost_usd = 0.0
+        self.templates: dict[str, set[str]] = {}
+        self.routing: dict[str, RoutingTotals] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator[UsageLedger]:
+        """Route :func:`record_usage` calls within the block to this ledger."""
+        token = _current_ledger.set(self)
+        try:
+            yield self
+        finally:
+            _current_ledger.reset(token)
+
+    def record(
+        self,
+        *,
+        cell_id: str,
+        stage: str,
+        model: str | None,
+        usage: Mapping[str, int],
+        template: str | None = None,
+    ) -> None:
+        if template:
+            self.templates.setdefault(stage, set()).add(template)
+        key = (cell_id, stage, model or UNKNOWN_MODEL)
+        totals = self.entries.get(key)
+        if totals is None:
+            totals = self.entries[key] = UsageTotals()
+        totals.add(usage)
+        call = UsageTotals()
+        call.add(usage)
+        self.total.merge(call)
+        self.cost_usd += self.prices.cost(key[2], call) or 0.0
+
+    def record_route(
+        self,
+        *,
+        stage: str,
+        model: str | None,
+        final_model: str | None,
+        usage: Mapping[str, int],
+        accepted: bool,
+    ) -> None:
+        """Count one cascade tier's outcome and update the stage's estimated savings."""
+        routing = self.routing.setdefault(stage, RoutingTotals())
+        name = model or UNKNOWN_MODEL
+        counts = routing.accepted if accepted else routing.escalated
+        counts[name] = counts.get(name, 0) + 1
+        if name == (final_model or UNKNOWN_MODEL):
+            return
+        call = UsageTotals()
+        call.add(usage)
+        spent = self.prices.cost(name, call) or 0.0
+        if not accepted:
+            routing.savings_usd -= spent
+            return
+        baseline = self.prices.cost(final_model or UNKNOWN_MODEL, call)
+        if baseline is not None:
+            routing.savings_usd += baseline - spent
+
+    def check_budget(self) -> None:
+        """Raise :class:`BudgetExceededError` if the budget has been used up."""
+        budget = self.budget
+        tokens = self.total.input_tokens + self.total.output_tokens
+        if budget.max_tokens is not None and tokens >= budget.max_tokens:
+            raise BudgetExceededError(
+                f"Token budget exhausted: {tokens} of {budget.max_tokens} tokens used."
+            )
+        if budget.max_cost_usd is not None and self.cost_usd >= budget.max_cost_usd:
+            raise BudgetExceededError(
+                f"Cost budget exhausted: ${self.cost_usd:.4f} of ${budget.max_cost_usd:.4f} used."
+            )
+
+    def summary(self, *, top_cells: int = 20) -> dict[str, Any]:
+        """Return run totals, breakdowns by stage and model, and the most expensive cells.
+
+        Each stage also reports the share of its input tokens served from the
+        provider's prompt cache and the prompt template versions it used.
+        Stages routed through a model cascade report its outcomes under
+        ``routing``.
+        """
+        total = UsageTotals()
+        by_stage: dict[str, UsageTotals] = {}
+        by_model: dict[str, UsageTotals] = {}
+        for (_, stage, model), totals in self.entries.items():
+            total.merge(totals)
+            by_stage.setdefault(stage, UsageTotals()).merge(totals)
+            by_model.setdefault(model, UsageTotals()).merge(totals)
+        model_costs = {model: self.prices.cost(model, totals) for model, totals in by_model.items()}
+        cells = sorted(self.per_cell(), key=lambda cell: cell["cost_usd"], reverse=True)
+        return {
+            "totals": asdict(total),
+            "cost_usd": sum(cost for cost in model_costs.values() if cost is not None),
+            "unpriced_models": sorted(model for model, cost in model_costs.items() if cost is None),
+            "cached_input_ratio": total.cached_input_ratio,
+            "by_stage": {
+                stage: {
+                    **asdict(totals),
+                    "cost_usd": self._cost_for(stage=stage),
+                    "cached_input_ratio": totals.cached_input_ratio,
+                    "prompt_templates": sorted(self.templates.get(stage, ())),
+                }
+                for stage, totals in sorted(by_stage.items())
+            },
+            "by_model": {
+                model: {**asdict(totals), "cost_usd": model_costs[model]}
+                for model, totals in sorted(by_model.items())
+            },
+            "routing": {stage: asdict(totals) for stage, totals in sorted(self.routing.items())},
+            "routing_savings_usd": sum(totals.savings_usd for totals in self.routing.values()),
+            "top_cells": cells[:top_cells],
+        }
+
+    def per_cell(self) -> list[dict[str, Any]]:
+        """Return one record per cell with its totals, cost and per-stage breakdown.
+
+        Each stage lists one entry per model, so a cascaded stage keeps both
+        the cheap tier's and the final tier's usage.
+        """
+        grouped: dict[str, dict[str, Any]] = {}
+        for (cell_id, stage, model), totals in self.entries.items():
+            record = grouped.setdefault(
+                cell_id,
+                {"cell_id": cell_id, "totals": UsageTotals(), "cost_usd": 0.0, "stages": {}},
+            )
+            record["totals"].merge(totals)
+            cost = self.prices.cost(model, totals) or 0.0
+            record["cost_usd"] += cost
+            record["stages"].setdefault(stage, []).append(
+                {**asdict(totals), "model": model, "cost_usd": cost}
+            )
+        return [
+            {**record, "totals": asdict(record["totals"])} for _, record in sorted(grouped.items())
+        ]
+
+    def write(self, summary_path: Path, per_cell_path: Path) -> None:
+        """Write the run summary JSON and the per-cell JSON-lines sidecar."""
+        write_json(summary_path, self.summary(), pretty=True)
+        per_cell_path.parent.mkdir(parents=True, exist_ok=True)
+        with per_cell_path.open("wb") as handle:
+            for record in self.per_cell():
+                handle.write(dumps_json(record) + b"\n")
+
+    def _cost_for(self, *, stage: str) -> float:
+        return sum(
+            self.prices.cost(model, totals) or 0.0
+            for (_, entry_stage, model), totals in self.entries.items()
+            if entry_stage == stage
+        )
+
+
+def batch_model(model: str) -> str:
+    """Return the ledger name for ``model`` when called through a provider batch API."""
+    return f"{model}{BATCH_MODEL_SUFFIX}"
+
+
+def check_budget() -> None:
+    """Refuse to start another agent call once the active ledger's budget is spent."""
+    ledger = _current_ledger.get()
+    if ledger is not None and ledger.budget:
+        ledger.check_budget()
+
+
+def estimate_tokens(text: str, model: str | None = None) -> int:
+    """Count tokens locally with ``tiktoken`` when installed, else estimate from length."""
+    encoding = _encoding_for(model.split(":", 1)[-1] if model else None)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def token_counter_name() -> str:
+    """Describe how :func:`estimate_tokens` counts (``tiktoken`` or a character heuristic)."""
+    return "tiktoken" if _encoding_for(None) is not None else f"chars/{CHARS_PER_TOKEN}"
+
+
+@lru_cache(maxsize=16)
+def _encoding_for(model: str | None) -> Any:
+    try:
+        import tiktoken  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("o200k_base")
+    except (KeyError, ValueError):
+        return tiktoken.get_encoding("o200k_base")
+
+
+def split_usage(usage: Mapping[str, int], parts: int) -> list[dict[str, int]]:
+    """Divide one call's usage between ``parts`` cells; remainders go to the first."""
+    if parts <= 1:
+        return [dict(usage)]
+    shares: list[dict[str, int]] = [{} for _ in range(parts)]
+    for key, value in usage.items():
+        base, remainder = divmod(int(value), parts)
+        for index, share in enumerate(shares):
+            share[key] = base + (remainder if index == 0 else 0)
+    return shares
+
+
+def record_route(
+    *,
+    stage: str,
+    model: str | None,
+    final_model: str | None,
+    usage: Mapping[str, int],
+    accepted: bool,
+) -> None:
+    """Report one model-cascade tier's outcome to the active ledger, if any."""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.record_route(
+            stage=stage, model=model, final_model=final_model, usage=usage, accepted=accepted
+        )
+
+
+def record_usage(
+    *,
+    cell_id: str,
+    stage: str,
+    model: str | None,
+    usage: Mapping[str, int],
+    template: str | None = None,
+) -> None:
+    """Attribute one agent call to the active ledger, if any."""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.record(cell_id=cell_id, stage=stage, model=model, usage=usage, template=template)
+
+
+__all__ = [
+    "BATCH_MODEL_SUFFIX",
+    "BATCH_PRICE_FACTOR",
+    "BudgetExceededError",
+    "DEFAULT_PRICE_TABLE",
+    "PriceTable",
+    "RoutingTotals",
+    "UsageLedger",
+    "UsageBudget",
+    "UsageTotals",
+    "batch_model",
+    "check_budget",
+    "estimate_tokens",
+    "record_route",
+    "record_usage",
+    "split_usage",
+    "token_counter_name",
+    "usage_from_result",
+]
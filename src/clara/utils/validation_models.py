@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass, field
+import sys
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field, replace
+from pathlib import Path
 from typing import Any
 
+from .io_utils import read_text
 
-@dataclass
+
+@dataclass(slots=True)
 class CellTypeInfo:
-    """Representation of a curated CL entry and its reference packet metadata."""
+    """Representation of a curated CL entry and its reference packet metadata.
+
+    ``source`` and ``references`` repeat across many entries, so they are
+    interned when parsed from a payload.
+    """
 
     cl_id: str
     name: str
@@ -27,9 +35,9 @@ class CellTypeInfo:
             name=str(payload["name"]),
             definition=str(payload["definition"]),
             logical_axioms=str(payload.get("relations", "")),
-            source=str(payload.get("source", "")),
+            source=sys.intern(str(payload.get("source", ""))),
             has_all_references=bool(payload.get("has_all_references", False)),
-            references=str(payload.get("references", "")),
+            references=sys.intern(str(payload.get("references", ""))),
         )
 
     def to_payload(self) -> dict[str, Any]:
@@ -45,20 +53,55 @@ class CellTypeInfo:
         }
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class PaperQAResult:
-    """Cached PaperQA output per cell type."""
-
-    cell_type: CellTypeInfo
-    report_markdown: str
+    """Cached PaperQA output per cell type.
 
+    The markdown is normally held by reference to its cache file
+    (``markdown_path``) and read only when needed; ``markdown`` holds it
+    inline for results that have no cache artifact. The ``report_markdown``
+    keyword is still accepted as an alias for ``markdown``.
+    """
 
-@dataclass
+    cell_type: CellTypeInfo
+    markdown: str | None
+    markdown_path: Path | None
+
+    def __init__(
+        self,
+        cell_type: CellTypeInfo,
+        markdown: str | None = None,
+        markdown_path: Path | None = None,
+        *,
+        report_markdown: str | None = None,
+    ) -> None:
+        if markdown is not None and report_markdown is not None:
+            raise TypeError("Pass either markdown or report_markdown, not both.")
+        self.cell_type = cell_type
+        self.markdown = markdown if report_markdown is None else report_markdown
+        self.markdown_path = markdown_path
+
+    @property
+    def report_markdown(self) -> str:
+        """The PaperQA markdown, read from the cache file when held by reference."""
+        if self.markdown is not None:
+            return self.markdown
+        if self.markdown_path is None:
+            raise ValueError(f"No PaperQA markdown for {self.cell_type.cl_id}.")
+        return read_text(self.markdown_path)
+
+
+@dataclass(slots=True)
 class ValidationState:
-    """Mutable state shared between workflow steps."""
+    """Mutable state shared between workflow steps.
+
+    Seeded definitions are stored as deltas: ``definition_overrides`` maps a
+    CL ID to its mutated definition, and :meth:`updated_definitions` rebuilds
+    the mutated cells on demand instead of keeping full copies.
+    """
 
     cl_definitions: list[CellTypeInfo] = field(default_factory=list)
-    cl_updated_definitions: list[CellTypeInfo] = field(default_factory=list)
+    definition_overrides: dict[str, str] = field(default_factory=dict)
     paperqa_results: list[PaperQAResult] = field(default_factory=list)
     is_test_mode: bool = False
 
@@ -67,11 +110,27 @@ class ValidationState:
         self.cl_definitions.extend(entries)
 
     def extend_updated_definitions(self, entries: Iterable[CellTypeInfo]) -> None:
-        """Add mutated definitions that will be sent through PaperQA."""
-        self.cl_updated_definitions.extend(entries)
+        """Record mutated definitions that will be sent through PaperQA.
+
+        Only definitions that differ from the curated entry are kept.
+        """
+        originals = {cell.cl_id: cell.definition for cell in self.cl_definitions}
+        for entry in entries:
+            if entry.cl_id not in originals:
+                raise ValueError(f"{entry.cl_id} is not among the loaded definitions.")
+            if entry.definition != originals[entry.cl_id]:
+                self.definition_overrides[entry.cl_id] = entry.definition
+            else:
+                self.definition_overrides.pop(entry.cl_id, None)
+
+    def updated_definitions(self) -> Iterator[CellTypeInfo]:
+        """Yield curated definitions with any seeded mutation applied."""
+        for cell in self.cl_definitions:
+            override = self.definition_overrides.get(cell.cl_id)
+            yield cell if override is None else replace(cell, definition=override)
 
     def append_paperqa_result(self, result: PaperQAResult) -> None:
-        """Cache a PaperQA markdown report."""
+        """Record a PaperQA result (its markdown stays in the cache file)."""
         self.paperqa_results.append(result)
 
 
@@ -5,13 +5,15 @@ from __future__ import annotations
 from collections.abc import Iterable
 from typing import Any
 
-from jsonschema import ValidationError, validate  # type: ignore[import-untyped]
-
 from ..schemas import load_schema
 
+# jsonschema is imported on first use: it is slow to import and only needed here.
+
 
 def validate_workflow_output(payload: dict[str, Any]) -> None:
     """Validate a workflow output payload against the canonical JSON schema."""
+    from jsonschema import validate  # type: ignore[import-untyped]
+
     schema = load_schema("workflow_output.schema.json")
     validate(instance=payload, schema=schema)
 
@@ -20,6 +22,8 @@ def ensure_services_registered(service_names: Iterable[str], available: Iterable
     """Ensure every service used in a workflow is registered in the services layer."""
     missing: list[str] = sorted(set(service_names) - set(available))
     if missing:
+        from jsonschema import ValidationError
+
         raise ValidationError(f"Unregistered services referenced: {missing}")
 
 
@@ -2,12 +2,60 @@ from __future__ import annotations
 
 import asyncio
 import json
+import pstats
+import shutil
 from pathlib import Path
 
 import pytest
 
-from clara.graphs import run_cl_validation_workflow
-from clara.utils import ValidationPaths, ValidationSettings
+from clara.benchmarks import (
+    BenchmarkScenario,
+    LatencyProfile,
+    SyntheticDatasetConfig,
+    generate_synthetic_dataset,
+    run_benchmark_suite,
+)
+from clara.benchmarks.fakes import (
+    FakeAgentError,
+    FakeCellAgent,
+    FakePaperQAAgent,
+    canned_response,
+)
+from clara.graphs import (
+    AffectedCells,
+    ClValidationGraphDependencies,
+    CurationWatcher,
+    QueueWorker,
+    ValidationDaemon,
+    build_cl_validation_graph,
+    cl_validation_queue,
+    enqueue_cl_validation,
+    format_plan,
+    plan_cl_validation,
+    run_cl_validation_graph,
+    run_cl_validation_workflow,
+    submit_validation_job,
+)
+from clara.services import (
+    PROMPT_TEMPLATES,
+    CassetteMissError,
+    CellDatasetLoader,
+    LazyAgent,
+    LocalBatchClient,
+    WorkQueue,
+    cassette_agents,
+)
+from clara.utils import Tracer, ValidationPaths, ValidationSettings, load_validation_settings
+from clara.utils.io_utils import write_json
+from clara.utils.metrics import (
+    AGENT_CALL_SECONDS,
+    AGENT_CALLS_IN_FLIGHT,
+    AGENT_INPUT_TOKENS,
+    CACHE_REQUESTS,
+    CELLS_COMPLETED,
+)
+from clara.utils.usage import BudgetExceededError
+from clara.utils.validation_models import CellTypeInfo
 
 
 class StubCellAgent:
@@ -43,6 +91,19 @@ class StubPaperQAAgent:
         raise AssertionError(f"Unexpected PaperQA prompt: {prompt}")
 
 
+class MeteredAgent:
+    """Wrap a stub agent and report fixed token usage for a named model."""
+
+    def __init__(self, agent: StubCellAgent | StubPaperQAAgent, model_name: str) -> None:
+        self._agent = agent
+        self.model_name = model_name
+        self.last_usage: dict[str, int] = {}
+
+    async def run(self, prompt: str) -> str:
+        self.last_usage = {"input_tokens": 1_000, "output_tokens": 100, "cache_read_tokens": 400}
+        return await self._agent.run(prompt)
+
+
 @pytest.fixture
 def validation_settings(tmp_path: Path) -> ValidationSettings:
     cell_data_dir = tmp_path / "data"
@@ -95,4 +156,640 @@ def test_workflow_generates_report(validation_settings: ValidationSettings) -> N
     assert "Test assertion" in content
 
 
+def test_workflow_streams_definitions_into_the_graph_state(
+    validation_settings: ValidationSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Definitions must be streamed into the graph state, never listed up front.
+    monkeypatch.delattr(CellDatasetLoader, "load_definitions")
+    report_path = asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+        )
+    )
+    assert "CL_0000001" in report_path.read_text(encoding="utf-8")
+
+
+def test_fully_cached_run_builds_no_agents(validation_settings: ValidationSettings) -> None:
+    asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+        )
+    )
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(), settings=validation_settings
+    )
+    assert isinstance(deps.cell_agent, LazyAgent)
+    assert deps.cell_agent.model_name
+    report_path = asyncio.run(run_cl_validation_graph(deps=deps))
+    assert "Test assertion" in report_path.read_text(encoding="utf-8")
+    assert isinstance(deps.paperqa_agent, LazyAgent)
+    assert not deps.cell_agent.built and not deps.paperqa_agent.built
+
+
+def test_tracer_exports_nested_spans(
+    validation_settings: ValidationSettings, tmp_path: Path
+) -> None:
+    async def run_traced(tracer: Tracer) -> None:
+        with tracer.activate():
+            await run_cl_validation_workflow(
+                validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+            )
+
+    cold, warm = Tracer(), Tracer()
+    asyncio.run(run_traced(cold))
+    asyncio.run(run_traced(warm))
+    assert cold.summary()["llm"]["count"] == 3
+    assert "llm" not in warm.summary()
+
+    spans = {span.span_id: span for span in cold.spans}
+    paperqa_call = next(span for span in cold.spans if span.name == "llm.paperqa")
+    cell_span = spans[paperqa_call.parent_id]
+    assert cell_span.attributes == {"cell_id": "CL_0000001", "cache_hit": False}
+    assert spans[cell_span.parent_id].name == "run_paperqa"
+    assert paperqa_call.attributes["prompt_chars"] > 0
+
+    trace = json.loads(cold.export_chrome_trace(tmp_path / "trace.json").read_text())
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(complete) == len(cold.spans)
+    assert {event["cat"] for event in complete} >= {"node", "cell", "llm", "cache", "parse"}
+
+
+def test_usage_is_attributed_per_cell_stage_and_model(
+    validation_settings: ValidationSettings, tmp_path: Path
+) -> None:
+    prices = tmp_path / "prices.json"
+    prices.write_text(json.dumps({"gpt-test": {"input": 1.0, "cached_input": 0.5, "output": 2.0}}))
+    validation_settings.price_table_file = prices
+    asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings,
+            cell_agent=MeteredAgent(StubCellAgent(), "openai:gpt-test"),
+            paperqa_agent=MeteredAgent(StubPaperQAAgent(), "other:unpriced"),
+        )
+    )
+    paths = validation_settings.paths
+    summary = json.loads(paths.usage_summary_file.read_text(encoding="utf-8"))
+    assert summary["totals"]["calls"] == 3
+    assert summary["totals"]["input_tokens"] == 3_000
+    assert set(summary["by_stage"]) == {"seed", "paperqa", "convert"}
+    assert summary["unpriced_models"] == ["other:unpriced"]
+    assert summary["cached_input_ratio"] == pytest.approx(0.4)
+    assert summary["by_stage"]["seed"]["prompt_templates"] == ["seed@v1"]
+    assert summary["by_stage"]["convert"]["cache_read_tokens"] == 400
+    assert AGENT_INPUT_TOKENS.value(stage="paperqa", cache="hit") >= 400
+    # Per call: 600 uncached + 400 cached input and 100 output tokens.
+    per_call = (600 * 1.0 + 400 * 0.5 + 100 * 2.0) / 1_000_000
+    assert summary["cost_usd"] == pytest.approx(2 * per_call)
+
+    (cell,) = [json.loads(line) for line in paths.usage_by_cell_file.read_text().splitlines()]
+    assert cell["cell_id"] == "CL_0000001"
+    assert [entry["model"] for entry in cell["stages"]["convert"]] == ["openai:gpt-test"]
+    assert cell["cost_usd"] == pytest.approx(2 * per_call)
+
+
+def test_workflow_updates_live_metrics(validation_settings: ValidationSettings) -> None:
+    before = {stage: CELLS_COMPLETED.value(stage=stage) for stage in ("seed", "paperqa", "convert")}
+    misses = CACHE_REQUESTS.value(cache="paperqa_markdown", result="miss")
+    calls = AGENT_CALL_SECONDS.count(stage="paperqa", model="unknown")
+    for _ in range(2):
+        asyncio.run(
+            run_cl_validation_workflow(
+                validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+            )
+        )
+    for stage, count in before.items():
+        assert CELLS_COMPLETED.value(stage=stage) == count + 2
+    assert CACHE_REQUESTS.value(cache="paperqa_markdown", result="miss") == misses + 1
+    assert AGENT_CALL_SECONDS.count(stage="paperqa", model="unknown") == calls + 1
+    assert AGENT_CALLS_IN_FLIGHT.value(stage="paperqa") == 0
+
+
+def test_profile_mode_writes_per_node_reports(validation_settings: ValidationSettings) -> None:
+    asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings,
+            cell_agent=StubCellAgent(),
+            paperqa_agent=StubPaperQAAgent(),
+            profile=True,
+        )
+    )
+    profiles_dir = validation_settings.paths.profiles_dir
+    summary = json.loads((profiles_dir / "summary.json").read_text(encoding="utf-8"))
+    nodes = [record["node"] for record in summary["nodes"]]
+    assert nodes == ["load_definitions", "seed_false_assertions", "run_paperqa", "generate_report"]
+    for record in summary["nodes"]:
+        assert record["peak_memory_bytes"] > 0
+        assert (profiles_dir / record["cpu_profile"]).exists()
+        assert (profiles_dir / f"{record['node']}.cpu.txt").read_text().strip()
+        assert "Net allocated" in (profiles_dir / record["allocation_report"]).read_text()
+
+
+def test_node_profiles_include_work_offloaded_to_io_threads(
+    validation_settings: ValidationSettings,
+) -> None:
+    asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings,
+            cell_agent=StubCellAgent(),
+            paperqa_agent=StubPaperQAAgent(),
+            profile=True,
+        )
+    )
+    profiles_dir = validation_settings.paths.profiles_dir
+    stats = pstats.Stats(str(profiles_dir / "load_definitions.prof"))
+    functions = {name for _, _, name in stats.stats}
+    assert "iter_definitions" in functions
+    report = pstats.Stats(str(profiles_dir / "generate_report.prof"))
+    assert "snapshot" in {name for _, _, name in report.stats}
+
+
+def test_plan_counts_uncached_calls_and_budget_stops_run(
+    validation_settings: ValidationSettings,
+) -> None:
+    def make_deps() -> ClValidationGraphDependencies:
+        return ClValidationGraphDependencies(
+            graph=build_cl_validation_graph(),
+            settings=validation_settings,
+            cell_agent=MeteredAgent(StubCellAgent(), "openai:gpt-4.1"),
+            paperqa_agent=MeteredAgent(StubPaperQAAgent(), "openai:gpt-4.1"),
+        )
+
+    cold = plan_cl_validation(make_deps(), concurrency=2)
+    assert [(stage.stage, stage.calls) for stage in cold.stages] == [
+        ("seed", 1),
+        ("paperqa", 1),
+        ("convert", 1),
+    ]
+    assert all(stage.input_tokens > 0 for stage in cold.stages)
+    assert cold.cost_usd > 0
+    assert "Total: 3 calls" in format_plan(cold)
+
+    # Each metered call reports 1,100 tokens, so the second call exceeds the budget.
+    validation_settings.token_budget = 1_000
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(run_cl_validation_graph(deps=make_deps()))
+    partial = plan_cl_validation(make_deps())
+    assert [stage.cached for stage in partial.stages] == [1, 0, 0]
+
+    validation_settings.token_budget = None
+    asyncio.run(run_cl_validation_graph(deps=make_deps()))
+    warm = plan_cl_validation(make_deps())
+    assert warm.calls == 0
+    assert warm.tokens == 0
+
+
+def test_cassette_replay_reproduces_recorded_run(
+    validation_settings: ValidationSettings, tmp_path: Path
+) -> None:
+    cassette_path = tmp_path / "run.cassette.jsonl"
+    cell_agent, paperqa_agent, cassette = cassette_agents(
+        cassette_path,
+        mode="record",
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+    report_path = asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=cell_agent, paperqa_agent=paperqa_agent
+        )
+    )
+    cassette.close()
+    recorded = report_path.read_text(encoding="utf-8")
+    assert len(cassette_path.read_text(encoding="utf-8").splitlines()) == 4  # header + 3 calls
+
+    shutil.rmtree(validation_settings.paths.output_dir)
+    cell_agent, paperqa_agent, cassette = cassette_agents(cassette_path, mode="replay")
+    replayed = asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=cell_agent, paperqa_agent=paperqa_agent
+        )
+    )
+    assert replayed.read_text(encoding="utf-8") == recorded
+    with pytest.raises(CassetteMissError):
+        asyncio.run(paperqa_agent.run("an unrecorded prompt"))
+
+
+def test_cassette_replay_reseeds_the_recorded_cells(tmp_path: Path) -> None:
+    generate_synthetic_dataset(tmp_path, SyntheticDatasetConfig(cells=12, seed=4))
+    env = {"CLARA_CELL_DATA_DIR": str(tmp_path), "CLARA_FALSE_ASSERTION_PROBABILITY": "0.5"}
+    cassette_path = tmp_path / "run.cassette.jsonl"
+    settings = load_validation_settings(env)
+    cell_agent, paperqa_agent, cassette = cassette_agents(
+        cassette_path,
+        mode="record",
+        cell_agent=FakeCellAgent(),
+        paperqa_agent=FakePaperQAAgent(),
+        settings=settings,
+    )
+    recorded = asyncio.run(
+        run_cl_validation_workflow(settings, cell_agent=cell_agent, paperqa_agent=paperqa_agent)
+    ).read_text(encoding="utf-8")
+    cassette.close()
+    seeded = len(json.loads(settings.paths.false_definitions_file.read_text(encoding="utf-8")))
+    assert 0 < seeded < 12
+
+    shutil.rmtree(settings.paths.output_dir)
+    settings = load_validation_settings(env)
+    cell_agent, paperqa_agent, _ = cassette_agents(cassette_path, mode="replay", settings=settings)
+    replayed = asyncio.run(
+        run_cl_validation_workflow(settings, cell_agent=cell_agent, paperqa_agent=paperqa_agent)
+    )
+    assert replayed.read_text(encoding="utf-8") == recorded
+
+
+def test_bulk_batch_mode_fills_caches_before_report(
+    validation_settings: ValidationSettings,
+) -> None:
+    class UnexpectedAgent:
+        model_name = "openai:gpt-4.1"
+
+        async def run(self, prompt: str) -> str:
+            raise AssertionError("PaperQA should be served from the batch results.")
+
+    validation_settings.batch_poll_seconds = 0
+    batch_agents = {
+        "paperqa": MeteredAgent(StubPaperQAAgent(), "openai:gpt-4.1"),
+        "convert": MeteredAgent(StubCellAgent(), "openai:gpt-4.1"),
+    }
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=UnexpectedAgent(),
+        batch_client=LocalBatchClient(validation_settings.paths.batch_dir / "local", batch_agents),
+    )
+    report_path = asyncio.run(run_cl_validation_graph(deps=deps))
+    assert "Test assertion" in report_path.read_text(encoding="utf-8")
+
+    batch_dir = validation_settings.paths.batch_dir
+    (request,) = [json.loads(line) for line in (batch_dir / "paperqa.input.jsonl").open()]
+    assert request["custom_id"] == "paperqa:CL_0000001"
+    assert request["body"]["model"] == "gpt-4.1"
+    assert request["body"]["messages"][0]["role"] == "system"
+    assert (batch_dir / "convert.output.jsonl").exists()
+    summary = json.loads(validation_settings.paths.usage_summary_file.read_text())
+    assert summary["by_stage"]["paperqa"]["input_tokens"] == 1_000
+    assert summary["by_stage"]["convert"]["calls"] == 1
+
+
+def test_bulk_batch_mode_uses_the_verdict_cache_and_the_budget(
+    validation_settings: ValidationSettings,
+) -> None:
+    class CannedAgent:
+        async def run(self, prompt: str) -> str:
+            return canned_response(prompt)
+
+    class NoLiveCalls:
+        model_name = "openai:gpt-4.1"
+
+        async def run(self, prompt: str) -> str:
+            raise AssertionError("Every cell should be served from the batch or the caches.")
+
+    validation_settings.batch_poll_seconds = 0
+    validation_settings.assertion_verdict_cache = True
+    paths = validation_settings.paths
+    batch_agents = {
+        "paperqa": MeteredAgent(CannedAgent(), "openai:gpt-4.1"),
+        "convert": MeteredAgent(CannedAgent(), "openai:gpt-4.1"),
+    }
+
+    def run(cell_agent: object) -> Path:
+        deps = ClValidationGraphDependencies(
+            graph=build_cl_validation_graph(),
+            settings=validation_settings,
+            cell_agent=cell_agent,
+            paperqa_agent=NoLiveCalls(),
+            batch_client=LocalBatchClient(paths.batch_dir / "local", batch_agents),
+        )
+        return asyncio.run(run_cl_validation_graph(deps=deps))
+
+    run(StubCellAgent())
+    (request,) = [json.loads(line) for line in (paths.batch_dir / "paperqa.input.jsonl").open()]
+    prompt = request["body"]["messages"][1]["content"]
+    assert prompt.startswith(PROMPT_TEMPLATES["paperqa_assertions"].instructions)
+    # Tables assembled from verdicts convert locally, without a batch.
+    assert not (paths.batch_dir / "convert.input.jsonl").exists()
+    summary = json.loads(paths.usage_summary_file.read_text())
+    assert summary["by_model"]["openai:gpt-4.1@batch"]["cost_usd"] == pytest.approx(0.0011)
+    assert summary["by_stage"]["paperqa"]["prompt_templates"] == ["paperqa_assertions@v1"]
+
+    # Every verdict is cached, so losing the markdown does not resubmit the cell.
+    (paths.paperqa_markdown_dir / "CL_0000001.md").unlink()
+    (paths.batch_dir / "paperqa.input.jsonl").unlink()
+    run(StubCellAgent())
+    assert not (paths.batch_dir / "paperqa.input.jsonl").exists()
+
+    # A budget spent by seeding stops the run before the batch is submitted.
+    validation_settings.token_budget = 1_000
+    (paths.paperqa_markdown_dir / "CL_0000001.md").unlink()
+    paths.assertion_verdicts_file.unlink()
+    paths.false_definitions_file.unlink()
+    with pytest.raises(BudgetExceededError):
+        run(MeteredAgent(StubCellAgent(), "openai:gpt-4.1"))
+    assert not (paths.batch_dir / "paperqa.input.jsonl").exists()
+
+
+def test_queue_workers_drain_all_stages(
+    validation_settings: ValidationSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    publish = cl_validation_queue.publish_queue_report
+    publishers: list[str] = []
+
+    async def counting_publish(
+        deps: ClValidationGraphDependencies, queue: WorkQueue
+    ) -> Path | None:
+        publishers.append("worker")
+        return await publish(deps, queue)
+
+    monkeypatch.setattr(cl_validation_queue, "publish_queue_report", counting_publish)
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+    queue = WorkQueue(validation_settings.paths.work_queue_file)
+    assert enqueue_cl_validation(deps, queue) == 1
+
+    async def run_workers() -> list[int]:
+        workers = [
+            QueueWorker(deps, queue, worker_id=f"w{index}", poll_interval=0.01)
+            for index in range(2)
+        ]
+        return await asyncio.gather(*(worker.run() for worker in workers))
+
+    processed = asyncio.run(run_workers())
+    assert sum(processed) == 3
+    assert publishers == ["worker"]
+    assert queue.counts() == {
+        "seed_false_assertions": {"done": 1},
+        "run_paperqa": {"done": 1},
+        "generate_report": {"done": 1},
+    }
+    assert deps.report_path is not None
+    assert "Test assertion" in deps.report_path.read_text(encoding="utf-8")
+    queue.close()
+
+
+def test_queue_workers_and_daemon_stop_once_the_budget_is_spent(
+    validation_settings: ValidationSettings,
+) -> None:
+    # Each metered call reports 1,100 tokens, so the second call exceeds the budget.
+    validation_settings.token_budget = 1_000
+
+    def make_deps() -> ClValidationGraphDependencies:
+        return ClValidationGraphDependencies(
+            graph=build_cl_validation_graph(),
+            settings=validation_settings,
+            cell_agent=MeteredAgent(StubCellAgent(), "openai:gpt-4.1"),
+            paperqa_agent=MeteredAgent(StubPaperQAAgent(), "openai:gpt-4.1"),
+        )
+
+    queue = WorkQueue(validation_settings.paths.work_queue_file)
+    deps = make_deps()
+    enqueue_cl_validation(deps, queue)
+    worker = QueueWorker(deps, queue, worker_id="w0", poll_interval=0.01)
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(worker.run())
+    # The job in hand goes back to the queue without using up an attempt.
+    assert queue.counts() == {"seed_false_assertions": {"done": 1}, "run_paperqa": {"pending": 1}}
+    assert queue.claim(["run_paperqa"], "w1", lease_seconds=60).attempts == 1
+    queue.close()
+    usage_file = validation_settings.paths.usage_summary_file
+    worker_usage = json.loads(usage_file.with_name(f"{usage_file.stem}.w0.json").read_text())
+    assert worker_usage["by_stage"]["seed"]["calls"] == 1
+
+    async def submit() -> list[dict]:
+        server = await ValidationDaemon(make_deps()).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [event async for event in submit_validation_job(["CL_0000001"], port=port)]
+
+    (event,) = asyncio.run(submit())
+    assert event["event"] == "error"
+    assert "BudgetExceededError" in event["error"]
+
+
+def test_queue_worker_stops_a_job_whose_lease_was_lost(
+    validation_settings: ValidationSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+    queue = WorkQueue(validation_settings.paths.work_queue_file)
+    enqueue_cl_validation(deps, queue)
+    stopped = asyncio.Event()
+
+    async def hang(*_: object) -> CellTypeInfo:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            stopped.set()
+        raise AssertionError("unreachable")
+
+    monkeypatch.setitem(
+        cl_validation_queue._CELL_HANDLERS, "cl.validation.seed_false_assertions", hang
+    )
+    worker = QueueWorker(deps, queue, worker_id="slow", lease_seconds=0.06)
+
+    async def lose_lease() -> bool:
+        running = asyncio.create_task(worker.run_once())
+        await asyncio.sleep(0.01)
+        with queue.exclusive() as conn:
+            conn.execute("UPDATE jobs SET lease_expires = 0")
+        assert queue.claim(["seed_false_assertions"], "thief", lease_seconds=60) is not None
+        handled = await asyncio.wait_for(running, timeout=1)
+        assert stopped.is_set()
+        return handled
+
+    assert asyncio.run(lose_lease()) is True
+    assert queue.counts() == {"seed_false_assertions": {"leased": 1}}
+    queue.close()
+
+
+def test_daemon_streams_results_per_cell(validation_settings: ValidationSettings) -> None:
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+
+    async def serve_and_submit() -> list[dict]:
+        server = await ValidationDaemon(deps).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            events = [
+                event
+                async for event in submit_validation_job(["CL_0000001", "CL_missing"], port=port)
+            ]
+            # A second job reuses the warm dataset index and false-assertion records.
+            events += [
+                event
+                async for event in submit_validation_job(
+                    ["CL_0000001"], port=port, stream_rows=True
+                )
+            ]
+        return events
+
+    events = asyncio.run(serve_and_submit())
+    kinds = [event["event"] for event in events]
+    assert kinds[:3] == ["error", "cell", "done"]
+    assert events[1]["rows"][0]["Assertion"] == "Test assertion"
+    assert events[2]["cells"] == 1
+    rows = events[1]["rows"]
+    assert kinds[3:] == ["row"] * len(rows) + ["cell", "done"]
+    assert [event["row"] for event in events[3 : 3 + len(rows)]] == rows
+
+
+def test_daemon_reloads_false_assertions_changed_on_disk(
+    validation_settings: ValidationSettings,
+) -> None:
+    daemon = ValidationDaemon(
+        ClValidationGraphDependencies(
+            graph=build_cl_validation_graph(),
+            settings=validation_settings,
+            cell_agent=StubCellAgent(),
+            paperqa_agent=StubPaperQAAgent(),
+        )
+    )
+    first = daemon._load_false_cache()
+    assert daemon._load_false_cache() is first
+    # Another process (a queue worker, a graph run) adds a record.
+    record = {"cell_id": "CL_0000001", "false_assertion": "f", "updated_definition": "seeded"}
+    write_json(validation_settings.paths.false_definitions_file, [*first, record])
+    assert daemon._load_false_cache()[-1] == record
+
+
+def test_watcher_revalidates_only_changed_terms(validation_settings: ValidationSettings) -> None:
+    report_path = asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+        )
+    )
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+    watcher = CurationWatcher(deps)
+    watcher.prime()
+    assert not watcher.affected_cells(watcher.detect())
+
+    paths = validation_settings.paths
+    (paths.references_dir / "CL_0000001" / "PMID_2.txt").write_text("new", encoding="utf-8")
+    payload = json.loads(paths.dataset_file.read_text(encoding="utf-8"))
+    payload["CL_0000002"] = dict(payload["CL_0000001"], cell_id="CL_0000002", name="Other Cell")
+    paths.dataset_file.write_text(json.dumps(payload), encoding="utf-8")
+    validation_settings.test_terms = ("CL_0000001", "CL_0000002")
+
+    affected = watcher.affected_cells(watcher.detect())
+    assert affected.definitions == {"CL_0000002"}
+    assert affected.references == {"CL_0000001"}
+    assert not (paths.paperqa_json_dir / "CL_0000002.json").exists()
+
+    assert asyncio.run(watcher.apply(affected)) == {"CL_0000001", "CL_0000002"}
+    lines = report_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[0] for line in lines[1:]] == ["CL_0000001", "CL_0000002"]
+
+
+def test_watcher_retries_a_batch_whose_revalidation_failed(
+    validation_settings: ValidationSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    asyncio.run(
+        run_cl_validation_workflow(
+            validation_settings, cell_agent=StubCellAgent(), paperqa_agent=StubPaperQAAgent()
+        )
+    )
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=StubPaperQAAgent(),
+    )
+    watcher = CurationWatcher(deps, poll_interval=0.01, debounce_seconds=0.02)
+    apply = watcher.apply
+    attempts: list[set[str]] = []
+    stop = asyncio.Event()
+
+    async def flaky_apply(affected: AffectedCells) -> set[str]:
+        attempts.append(set(affected.definitions))
+        if len(attempts) == 1:
+            raise RuntimeError("agent unavailable")
+        stop.set()
+        return await apply(affected)
+
+    monkeypatch.setattr(watcher, "apply", flaky_apply)
+    paths = validation_settings.paths
+    validation_settings.test_terms = ("CL_0000001", "CL_0000002")
+
+    async def watch() -> None:
+        running = asyncio.create_task(watcher.run(stop))
+        await asyncio.sleep(0.05)
+        payload = json.loads(paths.dataset_file.read_text(encoding="utf-8"))
+        payload["CL_0000002"] = dict(payload["CL_0000001"], cell_id="CL_0000002")
+        paths.dataset_file.write_text(json.dumps(payload), encoding="utf-8")
+        await asyncio.wait_for(running, timeout=5)
+
+    asyncio.run(watch())
+    assert attempts == [{"CL_0000002"}, {"CL_0000002"}]
+    assert "CL_0000002\t" in paths.report_file.read_text(encoding="utf-8")
+
+
+def test_watcher_rejudges_cached_verdicts_after_a_reference_edit(
+    validation_settings: ValidationSettings,
+) -> None:
+    validation_settings.assertion_verdict_cache = True
+    packet = validation_settings.paths.references_dir / "CL_0000001"
+    (packet / "PMID_1.txt").write_text("original abstract", encoding="utf-8")
+    paperqa_agent = FakePaperQAAgent()
+    deps = ClValidationGraphDependencies(
+        graph=build_cl_validation_graph(),
+        settings=validation_settings,
+        cell_agent=StubCellAgent(),
+        paperqa_agent=paperqa_agent,
+    )
+    asyncio.run(run_cl_validation_graph(deps=deps))
+    assert paperqa_agent.calls == 1
+
+    watcher = CurationWatcher(deps)
+    watcher.prime()
+    (packet / "PMID_1.txt").write_text("retracted abstract", encoding="utf-8")
+    affected = watcher.affected_cells(watcher.detect())
+    assert affected.references == {"CL_0000001"}
+
+    # Verdicts judged against the old text must not be reused.
+    assert asyncio.run(watcher.apply(affected)) == {"CL_0000001"}
+    assert paperqa_agent.calls == 2
+
+
+def test_fake_agent_errors_surface_after_the_retry_cap() -> None:
+    with pytest.raises(ValueError):
+        FakeCellAgent(error_rate=1.0)
+    agent = FakeCellAgent(error_rate=0.999, max_retries=1)
+    with pytest.raises(FakeAgentError):
+        asyncio.run(agent.run("prompt"))
+    assert (agent.calls, agent.errors, agent.failures) == (1, 2, 1)
+
+
+def test_benchmark_suite_reports_per_stage_metrics(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    template = BenchmarkScenario(
+        cells=0, cell_latency=LatencyProfile(mean_ms=0.1), error_rate=0.2, response_rows=3
+    )
+    report = run_benchmark_suite(output, sizes=[8], template=template)
+    assert json.loads(output.read_text(encoding="utf-8"))["scenarios"] == report["scenarios"]
+    cold, warm = report["scenarios"]
+    assert 0 < cold["loaded_cells"] <= 8
+    assert cold["calls"]["paperqa_agent"] == cold["loaded_cells"]
+    assert warm["calls"]["paperqa_agent"] == 0
+    assert warm["calls"]["cell_agent"] < cold["calls"]["cell_agent"]
+    assert set(cold["stages"]) == {node.id for node in build_cl_validation_graph().nodes}
+    assert cold["peak_memory_bytes"] > 0
+
+
 pytestmark = pytest.mark.unit
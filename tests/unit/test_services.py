@@ -1,10 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import re
+import urllib.error
+import urllib.request
+from collections.abc import AsyncGenerator
+from dataclasses import replace
+from pathlib import Path
 
 import pytest
 
-from clara.services.agent_adapters import CellAgentAdapter
+from clara.benchmarks import Fault, MockLLMServer
+from clara.benchmarks.fakes import canned_response
+from clara.benchmarks.startup import measure_startup
+from clara.services.agent_adapters import CellAgentAdapter, ModelCascade
+from clara.services.false_assertion_service import FalseAssertionService
+from clara.services.paperqa_service import PaperQAService
+from clara.services.prompt_templates import PROMPT_TEMPLATES
+from clara.services.report_service import ReportBuilder, export_report_columnar
+from clara.services.work_queue import WorkQueue
+from clara.utils import CellTypeInfo, PaperQAResult, load_validation_settings
+from clara.utils.streaming import (
+    JsonArrayStreamParser,
+    MalformedResponseError,
+    MarkdownTableParser,
+)
+from clara.utils.usage import UsageLedger
 
 pytestmark = pytest.mark.unit
 
@@ -24,3 +46,470 @@ def test_cell_agent_adapter_uses_injected_agent(monkeypatch) -> None:
     result = asyncio.run(adapter.run("ping"))
     assert result == "ok"
     assert dummy.prompts == ["ping"]
+
+
+def test_work_queue_reclaims_expired_leases(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite3", max_attempts=2)
+    queue.enqueue("stage", [("CL_1", {"cell_id": "CL_1"})])
+
+    first = queue.claim(["stage"], "a", lease_seconds=-1)
+    assert first is not None and first.attempts == 1
+    second = queue.claim(["stage"], "b", lease_seconds=60)
+    assert second is not None and second.lease_owner == "b"
+    assert queue.renew(first, 60) is False
+    assert queue.claim(["stage"], "c", lease_seconds=60) is None
+    # The expired owner can no longer settle the job it lost.
+    assert queue.complete(first, ["next"]) is False
+    assert queue.fail(first, "late") is False
+    assert queue.counts() == {"stage": {"leased": 1}}
+
+    assert queue.fail(second, "boom") is True
+    assert queue.counts() == {"stage": {"failed": 1}}
+    assert queue.complete(first, ["next"]) is False
+    assert queue.counts() == {"stage": {"failed": 1}}
+    assert queue.has_open_jobs() is False
+    queue.close()
+
+
+def test_work_queue_grants_publication_once_per_drain(tmp_path: Path) -> None:
+    queue = WorkQueue(tmp_path / "queue.sqlite3")
+    queue.enqueue("stage", [("CL_1", {"cell_id": "CL_1"})])
+    assert queue.claim_publication("a") is False
+
+    job = queue.claim(["stage"], "a", lease_seconds=60)
+    assert job is not None and queue.complete(job, [])
+    assert queue.claim_publication("a") is True
+    assert queue.claim_publication("b") is False
+    # New work invalidates the published report.
+    queue.enqueue("stage", [("CL_2", {"cell_id": "CL_2"})])
+    job = queue.claim(["stage"], "b", lease_seconds=60)
+    assert job is not None and queue.complete(job, [])
+    assert queue.claim_publication("b") is True
+    queue.close()
+
+
+def _cell(cell_id: str) -> CellTypeInfo:
+    return CellTypeInfo(
+        cl_id=cell_id,
+        name=f"name {cell_id}",
+        definition="definition",
+        logical_axioms="",
+        source="test",
+        has_all_references=True,
+        references="PMID:1",
+    )
+
+
+def test_batched_seeding_reissues_only_missing_cells(tmp_path: Path) -> None:
+    class BatchAgent:
+        model_name = "batch-model"
+
+        def __init__(self) -> None:
+            self.requested: list[list[str]] = []
+            self.last_usage: dict[str, int] = {}
+
+        async def run(self, prompt: str) -> str:
+            cell_ids = re.findall(r'cell_id: "([^"]*)"', prompt)
+            self.requested.append(cell_ids)
+            self.last_usage = {"input_tokens": 301, "output_tokens": 30}
+            # The first response drops one cell and mangles another; both must be re-issued.
+            answered = cell_ids[2:] if len(self.requested) == 1 else cell_ids
+            entries = [
+                {"cell_id": cid, "updated_definition": f"false {cid}", "false_assertion": "f"}
+                for cid in answered
+            ]
+            if len(self.requested) == 1:
+                entries.append({"cell_id": cell_ids[1], "updated_definition": "no assertion"})
+            return json.dumps(entries)
+
+    settings = load_validation_settings(
+        {
+            "CLARA_CELL_DATA_DIR": str(tmp_path),
+            "CLARA_FALSE_ASSERTION_PROBABILITY": "1.0",
+            "CLARA_FALSE_ASSERTION_BATCH_SIZE": "4",
+        }
+    )
+    settings.paths.ensure_directories()
+    agent = BatchAgent()
+    service = FalseAssertionService(settings, agent)
+    cells = [_cell(f"CL_{index}") for index in range(6)]
+    ledger = UsageLedger()
+    with ledger.activate():
+        seeded = asyncio.run(service.seed_definitions(cells))
+
+    assert agent.requested == [
+        ["CL_0", "CL_1", "CL_2", "CL_3"],
+        ["CL_0", "CL_1"],
+        ["CL_4", "CL_5"],
+    ]
+    assert [cell.definition for cell in seeded] == [f"false CL_{index}" for index in range(6)]
+    assert ledger.total.input_tokens == 3 * 301
+    assert ledger.entries[("CL_0", "seed", "batch-model")].input_tokens == 76 + 151
+    assert len(service.load_cache()) == 6
+
+
+def test_batched_seeding_falls_back_to_single_cells_for_stragglers(tmp_path: Path) -> None:
+    class OmittingAgent:
+        model_name = "batch-model"
+
+        def __init__(self, fail_batches: bool) -> None:
+            self.fail_batches = fail_batches
+            self.requested: list[list[str]] = []
+
+        async def run(self, prompt: str) -> str:
+            cell_ids = re.findall(r'cell_id: "([^"]*)"', prompt)
+            if not cell_ids:
+                # A per-cell prompt names the cell as "name CL_x".
+                (cell_id,) = re.findall(r'Cell Type: "name ([^"]*)"', prompt)
+                self.requested.append([cell_id])
+                record = {"updated_definition": f"false {cell_id}", "false_assertion": "f"}
+                return json.dumps(record)
+            self.requested.append(cell_ids)
+            if self.fail_batches:
+                raise RuntimeError("provider error")
+            # The model never answers for CL_1 in a batch.
+            return json.dumps(
+                [
+                    {"cell_id": cid, "updated_definition": f"false {cid}", "false_assertion": "f"}
+                    for cid in cell_ids
+                    if cid != "CL_1"
+                ]
+            )
+
+    settings = load_validation_settings(
+        {
+            "CLARA_CELL_DATA_DIR": str(tmp_path),
+            "CLARA_FALSE_ASSERTION_PROBABILITY": "1.0",
+            "CLARA_FALSE_ASSERTION_BATCH_SIZE": "3",
+        }
+    )
+    settings.paths.ensure_directories()
+    cells = [_cell(f"CL_{index}") for index in range(3)]
+
+    agent = OmittingAgent(fail_batches=False)
+    seeded = asyncio.run(FalseAssertionService(settings, agent).seed_definitions(cells))
+    assert agent.requested == [["CL_0", "CL_1", "CL_2"], ["CL_1"], ["CL_1"]]
+    assert [cell.definition for cell in seeded] == [f"false CL_{index}" for index in range(3)]
+
+    # A batch that errors out does not abort the stage either.
+    settings.paths.false_definitions_file.unlink()
+    agent = OmittingAgent(fail_batches=True)
+    seeded = asyncio.run(FalseAssertionService(settings, agent).seed_definitions(cells))
+    assert agent.requested[-3:] == [["CL_0"], ["CL_1"], ["CL_2"]]
+    assert [cell.definition for cell in seeded] == [f"false CL_{index}" for index in range(3)]
+
+
+def test_prompts_share_a_stable_instruction_prefix() -> None:
+    first, second = _cell("CL_1"), _cell("CL_2")
+    builders = {
+        "seed": FalseAssertionService.build_prompt,
+        "seed_batch": lambda cell: FalseAssertionService.build_batch_prompt([cell]),
+        "paperqa": PaperQAService.build_prompt,
+        "convert": lambda cell: ReportBuilder.build_conversion_prompt(f"| {cell.cl_id} |"),
+    }
+    for name, build in builders.items():
+        template = PROMPT_TEMPLATES[name]
+        prompts = build(first), build(second)
+        assert all(prompt.startswith(template.instructions + "\n\n") for prompt in prompts)
+        assert prompts[0] != prompts[1]
+
+
+def test_report_rows_are_flushed_progressively_and_snapshot_sorted(tmp_path: Path) -> None:
+    settings = load_validation_settings({"CLARA_CELL_DATA_DIR": str(tmp_path)})
+    settings.paths.ensure_directories()
+
+    class TableAgent:
+        async def run(self, prompt: str) -> str:
+            if "CL_FAIL" in prompt:
+                raise RuntimeError("conversion failed")
+            return '[{"assertion": "A", "validated": true, "summary_text": "S"}]'
+
+    builder = ReportBuilder(settings, TableAgent())
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            builder.build_report(
+                [
+                    PaperQAResult(_cell("CL_2"), "table CL_2"),
+                    PaperQAResult(_cell("CL_FAIL"), "table CL_FAIL"),
+                ]
+            )
+        )
+    partial = settings.paths.partial_report_file.read_text(encoding="utf-8")
+    assert "CL_2\t" in partial
+    assert not settings.paths.report_file.exists()
+
+    report_path = asyncio.run(
+        builder.build_report(
+            [PaperQAResult(_cell("CL_2"), "table"), PaperQAResult(_cell("CL_1"), "table")]
+        )
+    )
+    lines = report_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[0] for line in lines[1:]] == ["CL_1", "CL_2"]
+    assert not settings.paths.partial_report_file.exists()
+
+
+def test_streamed_report_rows_reach_the_partial_report_mid_response(tmp_path: Path) -> None:
+    settings = load_validation_settings(
+        {"CLARA_CELL_DATA_DIR": str(tmp_path), "CLARA_STREAM_RESPONSES": "true"}
+    )
+    settings.paths.ensure_directories()
+    partial_path = settings.paths.partial_report_file
+    mid_stream: list[str] = []
+
+    class StreamingTableAgent:
+        async def run(self, prompt: str) -> str:
+            raise AssertionError("Conversion should stream.")
+
+        async def run_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+            yield '[{"assertion": "A", "validated": true, "summary_text": "S"},'
+            mid_stream.append(partial_path.read_text(encoding="utf-8"))
+            yield ' {"assertion": "B", "validated": false, "summary_text": "T"}]'
+
+    builder = ReportBuilder(settings, StreamingTableAgent())
+    report_path = asyncio.run(builder.build_report([PaperQAResult(_cell("CL_1"), "table")]))
+    assert "CL_1\tname CL_1\tA\t" in mid_stream[0]
+    assert "\tB\t" not in mid_stream[0]
+    lines = report_path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[2] for line in lines[1:]] == ["A", "B"]
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_columnar_export_dictionary_encodes_repeated_columns(
+    tmp_path: Path, export_format: str
+) -> None:
+    pa = pytest.importorskip("pyarrow")
+    settings = load_validation_settings({"CLARA_CELL_DATA_DIR": str(tmp_path)})
+    settings.paths.ensure_directories()
+
+    class TableAgent:
+        async def run(self, prompt: str) -> str:
+            return '[{"assertion": "A\\tB", "validated": true}, {"assertion": "C"}]'
+
+    builder = ReportBuilder(settings, TableAgent())
+    report_path = asyncio.run(builder.build_report([PaperQAResult(_cell("CL_1"), "table")]))
+    destination = export_report_columnar(report_path, export_format)
+    if export_format == "parquet":
+        table = pytest.importorskip("pyarrow.parquet").read_table(destination)
+    else:
+        table = pytest.importorskip("pyarrow.ipc").open_stream(destination).read_all()
+    assert table.num_rows == 2
+    assert table.column("Assertion").to_pylist() == ["A\tB", "C"]
+    assert pa.types.is_dictionary(table.schema.field("References").type)
+
+
+def test_stream_parsers_emit_complete_items_and_reject_prose() -> None:
+    text = '```json\n[{"assertion": "a ] } \\" b", "validated": true},\n {"x": [1, {"y": 2}]}]\n```'
+    for size in (1, 3, 1024):
+        parser, items = JsonArrayStreamParser(), []
+        for start in range(0, len(text), size):
+            items.extend(parser.feed(text[start : start + size]))
+        parser.close()
+        assert items == [{"assertion": 'a ] } " b', "validated": True}, {"x": [1, {"y": 2}]}]
+    for malformed in ("Sure, here is the table", '[{"a": 1} {"b": 2}]', '[{"a": 1},]', "[1]"):
+        with pytest.raises(MalformedResponseError):
+            JsonArrayStreamParser().feed(malformed)
+
+    markdown = MarkdownTableParser()
+    rows = markdown.feed("Intro.\n| Assertion | Validated |\n| --- | --- |\n| A | Tr")
+    assert rows == []
+    assert markdown.feed("ue |\n| B") == [{"Assertion": "A", "Validated": "True"}]
+    assert markdown.close() == [{"Assertion": "B", "Validated": ""}]
+
+
+def test_streamed_conversion_emits_rows_early_and_aborts_prose(tmp_path: Path) -> None:
+    settings = load_validation_settings(
+        {"CLARA_CELL_DATA_DIR": str(tmp_path), "CLARA_STREAM_RESPONSES": "true"}
+    )
+    settings.paths.ensure_directories()
+
+    class StreamingAgent:
+        def __init__(self, chunks: list[str]) -> None:
+            self.chunks = chunks
+            self.sent = 0
+            self.closed = False
+
+        async def run(self, prompt: str) -> str:
+            raise AssertionError("Streaming path expected.")
+
+        async def run_stream(self, prompt: str):
+            try:
+                for chunk in self.chunks:
+                    self.sent += 1
+                    yield chunk
+            finally:
+                self.closed = True
+
+    table = StreamingAgent(['[{"assertion": "A", "validated": true}', ', {"assertion": "B"', "}]"])
+    seen: list[tuple[str, int]] = []
+    builder = ReportBuilder(settings, table)
+    result = PaperQAResult(_cell("CL_1"), "| table |")
+    rows = asyncio.run(
+        builder.build_rows(result, on_row=lambda row: seen.append((row["Assertion"], table.sent)))
+    )
+    assert seen == [("A", 1), ("B", 3)]
+    assert [row["Assertion"] for row in rows] == ["A", "B"]
+    assert builder.has_cached_table("CL_1")
+
+    prose = StreamingAgent(["I could not find", " a table in this report.", "[]"])
+    with pytest.raises(MalformedResponseError):
+        asyncio.run(ReportBuilder(settings, prose).build_rows(PaperQAResult(_cell("CL_2"), "x")))
+    assert (prose.sent, prose.closed) == (1, True)
+    assert not builder.has_cached_table("CL_2")
+
+
+def test_model_cascade_escalates_only_rejected_outputs(tmp_path: Path) -> None:
+    class TierAgent:
+        def __init__(self, model_name: str, responses: dict[str, str]) -> None:
+            self.model_name = model_name
+            self.responses = responses
+            self.prompts: list[str] = []
+            self.last_usage: dict[str, int] = {}
+
+        async def run(self, prompt: str) -> str:
+            self.prompts.append(prompt)
+            self.last_usage = {"input_tokens": 1000, "output_tokens": 100}
+            return next(text for key, text in self.responses.items() if key in prompt)
+
+    settings = load_validation_settings({"CLARA_CELL_DATA_DIR": str(tmp_path)})
+    settings.paths.ensure_directories()
+    valid = '[{"assertion": "A", "validated": "False"}]'
+    cheap = TierAgent(
+        "openai:gpt-4.1-mini",
+        {"good": valid, "vague": '[{"assertion": "A", "validated": "unclear"}]'},
+    )
+    strong = TierAgent("openai:gpt-4.1", {"Report": valid})
+    builder = ReportBuilder(settings, ModelCascade([cheap, strong]))
+    seen: list[str] = []
+    ledger = UsageLedger()
+    with ledger.activate():
+        good = PaperQAResult(_cell("CL_1"), "| good |")
+        asyncio.run(builder.build_rows(good, on_row=lambda row: seen.append(row["Assertion"])))
+        rows = asyncio.run(builder.build_rows(PaperQAResult(_cell("CL_2"), "| vague |")))
+        table = "| Assertion | Validated |\n| A | True |"
+        paperqa = PaperQAService(
+            settings,
+            agent=ModelCascade(
+                [
+                    TierAgent("openai:gpt-4.1-mini", {"name:": "No literature was found."}),
+                    TierAgent("openai:gpt-4.1", {"name:": table}),
+                ]
+            ),
+        )
+        asyncio.run(paperqa.validate_cell(_cell("CL_3")))
+
+    assert seen == ["A"]
+    assert rows[0]["Agent Validation"] == "False"
+    assert (len(cheap.prompts), len(strong.prompts)) == (2, 1)
+    summary = ledger.summary()
+    convert = summary["routing"]["convert"]
+    assert convert["accepted"] == {"openai:gpt-4.1-mini": 1, "openai:gpt-4.1": 1}
+    assert convert["escalated"] == {"openai:gpt-4.1-mini": 1}
+    # Saved 0.0028 - 0.00056 on the accepted cheap call, then wasted 0.00056 escalating.
+    assert convert["savings_usd"] == pytest.approx(0.00168)
+    assert summary["routing"]["paperqa"]["escalated"] == {"openai:gpt-4.1-mini": 1}
+    assert summary["by_model"]["openai:gpt-4.1-mini"]["calls"] == 3
+    # The escalated cell keeps the usage of both tiers.
+    escalated = next(cell for cell in ledger.per_cell() if cell["cell_id"] == "CL_2")
+    assert sorted(entry["model"] for entry in escalated["stages"]["convert"]) == [
+        "openai:gpt-4.1",
+        "openai:gpt-4.1-mini",
+    ]
+
+
+def test_assertion_verdict_cache_sends_only_new_assertions(tmp_path: Path) -> None:
+    class ListingAgent:
+        def __init__(self) -> None:
+            self.asked: list[list[str]] = []
+
+        async def run(self, prompt: str) -> str:
+            self.asked.append(re.findall(r'^- "(.*)"$', prompt, re.MULTILINE))
+            return canned_response(prompt)
+
+    class NoConversion:
+        async def run(self, prompt: str) -> str:
+            raise AssertionError("Assembled tables should convert locally.")
+
+    settings = load_validation_settings(
+        {"CLARA_CELL_DATA_DIR": str(tmp_path), "CLARA_ASSERTION_VERDICT_CACHE": "true"}
+    )
+    settings.paths.ensure_directories()
+    agent = ListingAgent()
+    service = PaperQAService(settings, agent=agent)
+    first = replace(
+        _cell("CL_1"),
+        definition="A glial cell. Lines the ventricles; has cilia.",
+        logical_axioms="is a ependymal cell. part of brain",
+    )
+    second = replace(
+        _cell("CL_2"),
+        definition="A tanycyte.  lines  the ventricles",
+        logical_axioms="Is a ependymal cell",
+    )
+    asyncio.run(service.validate_cells([first, second]))
+    first_assertions = ["A glial cell", "Lines the ventricles", "has cilia"]
+    assert agent.asked == [
+        [*first_assertions, "is a ependymal cell", "part of brain"],
+        ["A tanycyte"],
+    ]
+
+    # A curator edits one sentence: only that sentence is sent again, in a fresh process.
+    service = PaperQAService(settings, agent=agent)
+    edited = replace(first, definition="A glial cell. Lines the third ventricle; has cilia.")
+    service.invalidate("CL_1")
+    result = asyncio.run(service.validate_cell(edited))
+    assert agent.asked[-1] == ["Lines the third ventricle"]
+    rows = asyncio.run(ReportBuilder(settings, NoConversion()).build_rows(result))
+    assert [row["Assertion"] for row in rows] == [
+        "A glial cell",
+        "Lines the third ventricle",
+        "has cilia",
+        "is a ependymal cell",
+        "part of brain",
+    ]
+    assert rows[1]["Agent Validation"] == "True"
+    assert rows[3]["Agent Notes"] == "Evidence summary 3."
+
+    # Verdicts are only reused against the same reference set.
+    other_refs = replace(second, cl_id="CL_3", references="PMID:2")
+    assert service.pending_prompt(other_refs) is not None
+    assert service.pending_prompt(replace(second, references=" PMID:1 ,PMID:1")) is None
+
+
+def test_startup_imports_defer_heavy_dependencies() -> None:
+    result = measure_startup(repeats=1, budget_ms=60_000)
+    assert result.deferred_loaded == []
+    assert result.within_budget
+
+
+def test_mock_llm_server_serves_canned_responses_with_faults() -> None:
+    def post(base_url: str, prompt: str) -> tuple[int, dict]:
+        request = urllib.request.Request(
+            f"{base_url}/chat/completions",
+            data=json.dumps(
+                {"model": "gpt-test", "messages": [{"role": "user", "content": prompt}]}
+            ).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    faults = [Fault.parse("429:every=3,start=1"), Fault.parse("truncate:every=3,start=2")]
+    with MockLLMServer(faults=faults, response_rows=2) as server:
+        status, payload = post(server.base_url, 'Insert a biologically plausible ... "X"')
+        assert status == 200
+        content = payload["choices"][0]["message"]["content"]
+        assert set(json.loads(content)) == {"updated_definition", "false_assertion"}
+
+        status, payload = post(server.base_url, "For the following text ...")
+        assert status == 429
+
+        status, payload = post(
+            server.base_url, "From the following input, extract only the markdown table"
+        )
+        assert status == 200
+        assert payload["choices"][0]["finish_reason"] == "length"
+    assert server.stats.requests == 3
+    assert server.stats.faults == {"429": 1, "truncate": 1}
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+import urllib.request
+from dataclasses import astuple, fields
 from pathlib import Path
 
 import pytest
@@ -7,8 +12,30 @@ from jsonschema import ValidationError
 
 import clara as clara_module
 from clara import bootstrap
-from clara.utils import chunk_items, load_validation_settings
-from clara.utils.io_utils import read_json, read_text, write_json, write_text
+from clara.benchmarks import SyntheticDatasetConfig, generate_synthetic_dataset
+from clara.benchmarks.loop_lag import benchmark_loop_lag
+from clara.services import CellDatasetLoader
+from clara.utils import (
+    Tracer,
+    ValidationPaths,
+    chunk_items,
+    io_utils,
+    load_validation_settings,
+    trace_span,
+)
+from clara.utils.async_io import read_json_async, run_io, write_json_async
+from clara.utils.io_utils import (
+    iter_json_object,
+    iter_jsonl,
+    read_json,
+    read_text,
+    set_json_codec,
+    write_json,
+    write_text,
+)
+from clara.utils.metrics import MetricsRegistry, MetricsTextfileWriter, start_metrics_server
+from clara.utils.usage import UsageTotals
+from clara.utils.validation_models import CellTypeInfo, PaperQAResult, ValidationState
 from clara.validation import ensure_services_registered, validate_workflow_output
 
 pytestmark = pytest.mark.unit
@@ -68,6 +95,120 @@ def test_io_utils_round_trip(tmp_path: Path) -> None:
     assert read_json(json_path) == {"value": 7}
 
 
+@pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+def test_json_codec_is_compact_by_default_and_decodes_typed(
+    backend: str, monkeypatch, tmp_path: Path
+) -> None:
+    pytest.importorskip("json" if backend == "stdlib" else backend)
+    monkeypatch.setattr(io_utils, "_codec", None)
+    assert set_json_codec(backend).name == backend
+    payload = {"cell_id": "CL_1", "name": "ependymal", "definition": "é", "source": "editor"}
+    compact, pretty = tmp_path / "compact.json", tmp_path / "pretty.json"
+    write_json(compact, payload)
+    write_json(pretty, payload, pretty=True)
+    assert "\n" not in compact.read_text(encoding="utf-8")
+    assert pretty.read_text(encoding="utf-8").startswith('{\n  "cell_id"')
+    assert read_json(pretty) == payload
+    cell = read_json(compact, into=CellTypeInfo.from_payload)
+    assert (cell.cl_id, cell.definition) == ("CL_1", "é")
+    lines = tmp_path / "cells.jsonl"
+    lines.write_bytes(compact.read_bytes() + b"\n\n" + compact.read_bytes() + b"\n")
+    assert len(list(iter_jsonl(lines, into=CellTypeInfo.from_payload))) == 2
+    with pytest.raises(ValueError):
+        set_json_codec("ujson")
+
+
+def test_run_io_offloads_to_pool_and_keeps_context(tmp_path: Path) -> None:
+    tracer = Tracer()
+
+    def traced_write() -> str:
+        with trace_span("cache.write", "cache"):
+            write_json(tmp_path / "cache.json", {"n": 1})
+        return threading.current_thread().name
+
+    async def scenario() -> tuple[str, dict]:
+        with tracer.activate():
+            thread_name = await run_io(traced_write)
+        await write_json_async(tmp_path / "other.json", [1, 2])
+        return thread_name, await read_json_async(tmp_path / "cache.json")
+
+    thread_name, payload = asyncio.run(scenario())
+    assert thread_name.startswith("clara-io")
+    assert payload == {"n": 1}
+    assert [span.name for span in tracer.spans] == ["cache.write"]
+    assert read_json(tmp_path / "other.json") == [1, 2]
+
+    result = benchmark_loop_lag(cells=5, concurrency=2, latency_ms=0.1, cache_cells=5, rounds=1)
+    for scenario_name in ("cache_io_blocking", "cache_io_offloaded", "pipeline"):
+        assert result[scenario_name]["lag_max_ms"] >= result[scenario_name]["lag_p50_ms"] >= 0
+
+
+def test_iter_json_object_streams_across_chunk_boundaries(tmp_path: Path) -> None:
+    payload = {"a": {"n": 12345, "s": 'x\\"y'}, "b": [1.5, None, True], "c": 7}
+    path = tmp_path / "data.json"
+    write_json(path, payload)
+    for chunk_size in (1, 3, 7, 1024):
+        assert dict(iter_json_object(path, chunk_size=chunk_size)) == payload
+    (tmp_path / "empty.json").write_text(" { } ", encoding="utf-8")
+    assert list(iter_json_object(tmp_path / "empty.json")) == []
+    (tmp_path / "bad.json").write_text('{"a": 1 "b": 2}', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_object(tmp_path / "bad.json"))
+
+
+def test_dataset_loader_streams_jsonl_and_stops_after_test_terms(tmp_path: Path) -> None:
+    config = SyntheticDatasetConfig(cells=20, seed=3, complete_reference_fraction=1.0)
+    generate_synthetic_dataset(tmp_path, config)
+    entries = list(read_json(tmp_path / "cells_data.json").values())
+    jsonl_path = tmp_path / "cells_data.jsonl"
+    lines = [json.dumps(entry) for entry in entries]
+    # A corrupt tail proves test mode stops reading once the selected terms are found.
+    jsonl_path.write_text("\n".join([*lines, "{not json"]) + "\n", encoding="utf-8")
+    (tmp_path / "cells_data.json").unlink()
+
+    env = {
+        "CLARA_CELL_DATA_DIR": str(tmp_path),
+        "CLARA_IS_TEST_MODE": "true",
+        "CLARA_TEST_TERMS": f"{entries[4]['cell_id']},{entries[1]['cell_id']}",
+    }
+    settings = load_validation_settings(env)
+    assert settings.paths.dataset_file == jsonl_path
+    # The CLI's --cell-data-dir override resolves the dataset the same way.
+    assert ValidationPaths.from_cell_data_dir(tmp_path).dataset_file == jsonl_path
+    cells = list(CellDatasetLoader(settings).iter_definitions())
+    assert [cell.cl_id for cell in cells] == [entries[1]["cell_id"], entries[4]["cell_id"]]
+
+
+def test_validation_state_keeps_compact_deltas_and_markdown_references(tmp_path: Path) -> None:
+    payloads = [
+        {"cell_id": f"CL_{index}", "name": "n", "definition": "original", "source": "editor"}
+        for index in range(3)
+    ]
+    cells = [CellTypeInfo.from_payload(json.loads(json.dumps(entry))) for entry in payloads]
+    assert cells[0].source is cells[2].source
+    assert not hasattr(cells[0], "__dict__")
+
+    state = ValidationState()
+    state.extend_definitions(cells)
+    mutated = [cells[0], CellTypeInfo.from_payload({**payloads[1], "definition": "seeded"})]
+    state.extend_updated_definitions(mutated)
+    assert state.definition_overrides == {"CL_1": "seeded"}
+    assert [cell.definition for cell in state.updated_definitions()] == [
+        "original",
+        "seeded",
+        "original",
+    ]
+
+    markdown_path = tmp_path / "CL_0.md"
+    write_text(markdown_path, "| table |")
+    result = PaperQAResult(cells[0], markdown_path=markdown_path)
+    assert result.report_markdown == "| table |"
+    with pytest.raises(ValueError):
+        _ = PaperQAResult(cells[1]).report_markdown
+    # The pre-slots constructor keyword still works.
+    assert PaperQAResult(cells[1], report_markdown="inline").report_markdown == "inline"
+
+
 def test_validate_workflow_output_and_service_registry() -> None:
     payload = {
         "status": "completed",
@@ -83,3 +224,60 @@ def test_validate_workflow_output_and_service_registry() -> None:
     ensure_services_registered(["svc1"], ["svc1", "svc2"])
     with pytest.raises(ValidationError):
         ensure_services_registered(["svc1", "missing"], ["svc1"])
+
+
+def test_synthetic_dataset_is_deterministic_and_loadable(tmp_path: Path) -> None:
+    config = SyntheticDatasetConfig(cells=50, seed=7, paper_bytes_median=2_000)
+    first = generate_synthetic_dataset(tmp_path / "a", config)
+    generate_synthetic_dataset(tmp_path / "b", config)
+    dataset = (tmp_path / "a" / "cells_data.json").read_text(encoding="utf-8")
+    assert dataset == (tmp_path / "b" / "cells_data.json").read_text(encoding="utf-8")
+    assert first.unique_pmids < first.reference_files
+
+    settings = load_validation_settings({"CLARA_CELL_DATA_DIR": str(tmp_path / "a")})
+    cells = CellDatasetLoader(settings).load_definitions()
+    assert 0 < len(cells) <= 50
+    packet = settings.paths.references_dir / cells[0].cl_id
+    pmids = {f"PMID_{ref.split(':')[1]}.txt" for ref in cells[0].references.split(",")}
+    assert {path.name for path in packet.iterdir()} == pmids
+
+
+def test_metrics_registry_renders_prometheus_text(tmp_path: Path) -> None:
+    registry = MetricsRegistry()
+    calls = registry.counter("demo_calls_total", "Calls.", ["stage"])
+    latency = registry.histogram("demo_seconds", "Latency.", ["stage"], buckets=(0.5, 1.0))
+    depth = registry.gauge("demo_depth", "Depth.")
+    registry.add_collector(lambda: depth.set(7))
+    calls.inc(stage="seed")
+    calls.inc(2, stage="seed")
+    for value in (0.2, 0.7, 3.0):
+        latency.observe(value, stage='pa"per')
+    with pytest.raises(ValueError):
+        calls.inc(model="x")
+
+    text = registry.render()
+    assert "# TYPE demo_calls_total counter" in text
+    assert 'demo_calls_total{stage="seed"} 3' in text
+    assert 'demo_seconds_bucket{stage="pa\\"per",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="pa\\"per",le="+Inf"} 3' in text
+    assert "demo_depth 7" in text
+
+    metrics_file = tmp_path / "clara.prom"
+    with MetricsTextfileWriter(metrics_file, interval=60, registry=registry):
+        pass
+    assert metrics_file.read_text(encoding="utf-8") == registry.render()
+
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert 'demo_calls_total{stage="seed"} 3' in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_usage_totals_merge_adds_every_counter() -> None:
+    totals = UsageTotals(*range(1, len(fields(UsageTotals)) + 1))
+    totals.merge(UsageTotals(*range(10, 10 + len(fields(UsageTotals)))))
+    assert astuple(totals) == tuple(range(11, 11 + 2 * len(fields(UsageTotals)), 2))